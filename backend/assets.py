@@ -0,0 +1,218 @@
+"""
+Image preprocessing for deck assets.
+
+Images are resampled to the resolution they are actually shown at,
+recompressed and stripped of metadata before being embedded. Results are
+stored content-addressed under decks/<name>/cache/images so the same asset
+at the same placement size is only processed once.
+"""
+from pathlib import Path
+import hashlib
+import io
+import json
+import os
+import shutil
+
+from PIL import Image, ImageOps
+
+from .tracing import count
+
+EMU_PER_INCH = 914400
+TARGET_DPI = 150
+JPEG_QUALITY = 85
+PIPELINE_VERSION = 2
+# Formats PowerPoint embeds natively; anything else is converted
+NATIVE_FORMATS = {"JPEG": ".jpg", "PNG": ".png", "GIF": ".gif"}
+# Metadata dropped when original bytes are kept: EXIF (including GPS), XMP, IPTC, comments, timestamps
+PNG_METADATA_CHUNKS = {b"eXIf", b"tEXt", b"zTXt", b"iTXt", b"tIME"}
+JPEG_KEPT_APP_MARKERS = {0xE0, 0xE2, 0xEE}  # JFIF, ICC profile, Adobe colour transform
+ORIENTATION_TAG = 0x0112
+
+def _cache_dir(deck_path: Path) -> Path:
+    return deck_path / "cache" / "images"
+
+def _load_index(cache_dir: Path) -> dict:
+    try:
+        with open(cache_dir / "index.json", "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_index(cache_dir: Path, index: dict):
+    tmp_path = cache_dir / "index.json.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=4)
+    os.replace(tmp_path, cache_dir / "index.json")
+
+def _has_alpha(img) -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+
+def _target_size(size: tuple, width_emu, height_emu, dpi: int) -> tuple:
+    """Pixel size needed to show the image at the given placement size and DPI (never upscaled)."""
+    w, h = size
+    if width_emu is None and height_emu is None:
+        return size
+    if width_emu is not None and height_emu is not None:
+        scale = min(width_emu / EMU_PER_INCH * dpi / w, height_emu / EMU_PER_INCH * dpi / h)
+    elif height_emu is not None:
+        scale = height_emu / EMU_PER_INCH * dpi / h
+    else:
+        scale = width_emu / EMU_PER_INCH * dpi / w
+    if scale >= 1:
+        return size
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+def _encode(img, source_format: str) -> tuple:
+    """Re-encodes without metadata. Returns (bytes, extension)."""
+    buf = io.BytesIO()
+    if _has_alpha(img) or source_format in ("PNG", "GIF"):
+        # Keep lossless sources (diagrams, logos, transparency) lossless
+        if img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+            img = img.convert("RGBA")
+        img.save(buf, format="PNG", optimize=True)
+        return buf.getvalue(), ".png"
+
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    # An empty comment stops Pillow carrying over the source's COM segment
+    img.save(buf, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True, comment=b"")
+    return buf.getvalue(), ".jpg"
+
+def _strip_jpeg(data: bytes) -> bytes:
+    out, pos = [data[:2]], 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            break
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1  # fill byte
+            continue
+        if marker == 0xDA:
+            # Start of scan: image data up to the end-of-image marker; anything
+            # after it (multi-picture extras with their own EXIF) is dropped
+            eoi = data.find(b"\xff\xd9", pos)
+            return b"".join(out) + (data[pos:eoi + 2] if eoi != -1 else data[pos:])
+        end = pos + 2 + int.from_bytes(data[pos + 2:pos + 4], "big")
+        is_app = 0xE0 <= marker <= 0xEF
+        if not (marker == 0xFE or (is_app and marker not in JPEG_KEPT_APP_MARKERS)
+                or (marker == 0xE2 and not data[pos + 4:pos + 16].startswith(b"ICC_PROFILE"))):
+            out.append(data[pos:end])
+        pos = end
+    out.append(data[pos:])
+    return b"".join(out)
+
+def _strip_png(data: bytes) -> bytes:
+    out, pos = [data[:8]], 8
+    while pos + 8 <= len(data):
+        end = pos + 12 + int.from_bytes(data[pos:pos + 4], "big")
+        if data[pos + 4:pos + 8] not in PNG_METADATA_CHUNKS:
+            out.append(data[pos:end])
+        pos = end
+    return b"".join(out)
+
+def _strip_gif(data: bytes) -> bytes:
+    def sub_blocks_end(pos):
+        while data[pos]:
+            pos += data[pos] + 1
+        return pos + 1
+
+    flags = data[10]
+    pos = 13 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+    out = [data[:pos]]
+    while pos < len(data) and data[pos] != 0x3B:
+        if data[pos] == 0x21:
+            end = sub_blocks_end(pos + 2)
+            # Comments and XMP go; graphic control and NETSCAPE looping stay
+            if not (data[pos + 1] == 0xFE or (data[pos + 1] == 0xFF and data[pos + 3:pos + 11] == b"XMP Data")):
+                out.append(data[pos:end])
+        else:
+            flags = data[pos + 9]
+            end = pos + 10 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+            end = sub_blocks_end(end + 1)
+            out.append(data[pos:end])
+        pos = end
+    out.append(data[pos:])
+    return b"".join(out)
+
+def _strip_metadata(data: bytes, source_format: str) -> bytes:
+    """The image bytes without metadata segments, leaving the encoded pixels untouched."""
+    strip = {"JPEG": _strip_jpeg, "PNG": _strip_png, "GIF": _strip_gif}[source_format]
+    try:
+        return strip(data)
+    except IndexError:
+        # Truncated file: re-encoding would have failed earlier, so keep what decodes
+        return data
+
+def prepare_image(deck_path: Path, image_path: Path, width_emu: int = None, height_emu: int = None,
+                  dpi: int = TARGET_DPI) -> Path:
+    """
+    Returns the path of an image ready to embed for the given placement size.
+    The source is downscaled to dpi at that size, recompressed and stripped
+    of metadata; if that does not make it smaller and its format is already
+    native, the original encoding is kept with its metadata segments (EXIF,
+    GPS, XMP, comments) cut out. Results are cached by content hash.
+    """
+    source = image_path.read_bytes()
+    digest = hashlib.sha256(source)
+    digest.update(f"|{width_emu}|{height_emu}|{dpi}|{JPEG_QUALITY}|{PIPELINE_VERSION}".encode("ascii"))
+    key = digest.hexdigest()
+
+    cache_dir = _cache_dir(deck_path)
+    index = _load_index(cache_dir)
+    entry = index.get(key)
+    if entry and (cache_dir / entry["derived"]).exists():
+        count("image_cache_hits")
+        return cache_dir / entry["derived"]
+    count("images_processed")
+    count("image_source_bytes", len(source))
+
+    with Image.open(io.BytesIO(source)) as original:
+        source_format = original.format
+        # Stripping EXIF also drops its orientation, so rotated sources must be re-encoded upright
+        oriented = original.getexif().get(ORIENTATION_TAG, 1) == 1
+        if getattr(original, "is_animated", False):
+            # Re-encoding would drop the animation
+            size, resized, derived, ext = original.size, False, source, NATIVE_FORMATS.get(source_format, ".gif")
+        else:
+            img = ImageOps.exif_transpose(original)
+            size = _target_size(img.size, width_emu, height_emu, dpi)
+            resized = size != img.size
+            if resized:
+                img = img.resize(size, Image.LANCZOS)
+            derived, ext = _encode(img, source_format)
+
+    keep_source = derived is source or (len(derived) >= len(source) and not resized and oriented)
+    if keep_source and source_format in NATIVE_FORMATS:
+        derived, ext = _strip_metadata(source, source_format), NATIVE_FORMATS[source_format]
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    derived_name = f"{key[:32]}{ext}"
+    tmp_path = cache_dir / f"{derived_name}.tmp"
+    tmp_path.write_bytes(derived)
+    os.replace(tmp_path, cache_dir / derived_name)
+
+    index[key] = {
+        "source": image_path.name,
+        "derived": derived_name,
+        "source_bytes": len(source),
+        "derived_bytes": len(derived),
+        "size": list(size),
+    }
+    _write_index(cache_dir, index)
+    return cache_dir / derived_name
+
+def asset_savings(deck_path: Path) -> dict:
+    """Totals the bytes saved by the derived images cached for a deck."""
+    index = _load_index(_cache_dir(deck_path))
+    source_bytes = sum(e["source_bytes"] for e in index.values())
+    derived_bytes = sum(e["derived_bytes"] for e in index.values())
+    return {
+        "images": len(index),
+        "source_bytes": source_bytes,
+        "derived_bytes": derived_bytes,
+        "bytes_saved": source_bytes - derived_bytes,
+    }
+
+def clear_image_cache(deck_path: Path):
+    """Removes all derived images for a deck."""
+    shutil.rmtree(_cache_dir(deck_path), ignore_errors=True)
@@ -0,0 +1,123 @@
+"""
+Builds and validates many decks in parallel over a process pool.
+
+Command line (from the project root):
+    python -m backend.batch --all --workers 4
+    python -m backend.batch Deck_A Deck_B
+    python -m backend.batch --specs jobs.json
+Results are printed as JSON lines in the order decks finish. Jobs naming
+the same deck run one after another, in the order given.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import argparse
+import json
+import sys
+import time
+
+from . import deck_manager
+from .build_cache import build_deck
+from .validator import VALIDATION_CACHE_FILE, incremental_validate_pptx
+
+def _init_worker(decks_dir: str):
+    # Workers follow the parent's decks directory, even if it was redirected
+    deck_manager.DECKS_DIR = Path(decks_dir)
+
+def _job_deck(job):
+    if isinstance(job, str):
+        return job
+    return job.get("deck_name") if isinstance(job, dict) else None
+
+def run_deck_job(job) -> dict:
+    """
+    Runs one batch job. A job is either a deck name (validate its existing
+    output) or a spec {'deck_name': ..., 'slides': [...], 'purpose': ...}
+    which initializes the deck if needed, builds it, then validates it.
+    """
+    start = time.perf_counter()
+    spec = {"deck_name": job} if isinstance(job, str) else job
+    deck_name = _job_deck(job)
+    result = {"deck_name": deck_name, "ok": False, "build": None, "validation": None, "error": None}
+
+    try:
+        if not deck_name:
+            raise ValueError("Job is missing 'deck_name'.")
+        deck_path = deck_manager.get_deck_path(deck_name)
+
+        if "slides" in spec:
+            if not deck_path.exists():
+                deck_manager.initialize_deck_dir(deck_name, {"purpose": spec.get("purpose", "")})
+            result["build"] = build_deck(deck_name, spec["slides"])
+        elif not deck_path.exists():
+            raise FileNotFoundError(f"Deck '{deck_name}' not found.")
+
+        output_file = deck_path / "output" / f"{deck_name}.pptx"
+        result["validation"] = incremental_validate_pptx(output_file, deck_path / VALIDATION_CACHE_FILE)
+        result["ok"] = result["validation"]["valid"]
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+def group_jobs(jobs: list) -> list:
+    """
+    Groups jobs by deck name, keeping their order. Each group runs in one
+    worker, one job after another, so jobs naming the same deck never race
+    on its files; different decks still run in parallel.
+    """
+    groups = {}
+    for i, job in enumerate(jobs):
+        groups.setdefault(_job_deck(job) or ("", i), []).append(job)
+    return list(groups.values())
+
+def run_deck_jobs(group: list) -> list:
+    """Runs one deck's jobs in order and returns their results."""
+    return [run_deck_job(job) for job in group]
+
+def iter_batch(jobs: list, workers: int = None):
+    """Fans jobs out over a process pool and yields each result as soon as its deck's jobs finish."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(str(deck_manager.DECKS_DIR),)) as pool:
+        futures = {pool.submit(run_deck_jobs, group): group for group in group_jobs(jobs)}
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. BrokenProcessPool); report it against this deck only
+                results = [
+                    {"deck_name": _job_deck(job), "ok": False, "build": None, "validation": None,
+                     "error": f"{type(e).__name__}: {e}", "seconds": None}
+                    for job in futures[future]
+                ]
+            yield from results
+
+def run_batch(jobs: list, workers: int = None) -> list:
+    """Runs a batch and returns the results in completion order."""
+    return list(iter_batch(jobs, workers))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build and validate decks in parallel.")
+    parser.add_argument("decks", nargs="*", help="Existing deck names to validate")
+    parser.add_argument("--all", action="store_true", help="Validate every deck from list_decks()")
+    parser.add_argument("--specs", help="JSON file holding a list of jobs")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    jobs = list(args.decks)
+    if args.all:
+        jobs.extend(deck_manager.list_decks())
+    if args.specs:
+        with open(args.specs, "r") as f:
+            jobs.extend(json.load(f))
+    if not jobs:
+        parser.error("no decks given (use deck names, --all or --specs)")
+
+    failures = 0
+    for result in iter_batch(jobs, args.workers):
+        failures += not result["ok"]
+        print(json.dumps(result), flush=True)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
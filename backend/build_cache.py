@@ -0,0 +1,168 @@
+from pathlib import Path
+import hashlib
+import json
+import os
+
+from .builders import paginate_slide_specs
+from .catalog import set_build_hash
+from .chart_ingest import chart_reductions
+from .deck_manager import get_deck_path
+from .templates import deck_template
+from .tracing import count, span
+from .generator import (
+    _build_slide, _load_presentation, _move_slide, _output_path,
+    _remove_slide, _save_presentation, create_enhanced_deck,
+)
+
+CACHE_FILE = "build_cache.json"
+CACHE_VERSION = 1
+# Spec keys whose values name files in the deck's assets folder
+ASSET_KEYS = ("image",)
+# Patch the existing package only when at most this share of slides changed
+MAX_PATCH_RATIO = 0.5
+
+def template_identity(deck_name: str) -> str:
+    """Identifies the template/layout set the deck's slides are built against."""
+    return deck_template(deck_name).identity
+
+def _asset_refs(value) -> list:
+    refs = []
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in ASSET_KEYS and isinstance(item, str):
+                refs.append(item)
+            else:
+                refs.extend(_asset_refs(item))
+    elif isinstance(value, list):
+        for item in value:
+            refs.extend(_asset_refs(item))
+    return refs
+
+def slide_hash(slide_data: dict, assets_dir: Path) -> str:
+    """Hashes a normalized slide spec together with the bytes of the assets it references."""
+    spec = dict(slide_data)
+    spec.setdefault('layout', 1)
+    digest = hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode("utf-8"))
+    for ref in sorted(set(_asset_refs(spec))):
+        asset = assets_dir / ref
+        digest.update(ref.encode("utf-8"))
+        digest.update(asset.read_bytes() if asset.exists() else b"<missing>")
+    return digest.hexdigest()
+
+def _file_signature(path: Path) -> list:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+def _load_cache(cache_path: Path) -> dict:
+    try:
+        with open(cache_path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get("version") == CACHE_VERSION else {}
+
+def _write_cache(cache_path: Path, cache: dict):
+    tmp_path = cache_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=4)
+    os.replace(tmp_path, cache_path)
+
+def _patch_deck(output_file: Path, slides_content: list, changed: list, old_count: int, assets_dir: Path):
+    """Rebuilds only the changed slides inside the existing package."""
+    prs = _load_presentation(output_file)
+    new_count = len(slides_content)
+
+    for i in range(old_count - 1, new_count - 1, -1):
+        _remove_slide(prs, i)
+
+    for i in changed:
+        _build_slide(prs, slides_content[i], assets_dir=assets_dir)
+        if i < old_count:
+            last = len(prs.slides._sldIdLst) - 1
+            _move_slide(prs, last, i)
+            _remove_slide(prs, i + 1)
+
+    _save_presentation(prs, output_file, snapshot=True)
+
+def refresh_output_signature(deck_name: str, previous_signature: list):
+    """
+    Re-points the build cache at the current output file after a rewrite
+    that did not change slide content (e.g. compaction), provided the cache
+    described the file as it was before that rewrite.
+    """
+    deck_path = get_deck_path(deck_name)
+    cache_path = deck_path / CACHE_FILE
+    cache = _load_cache(cache_path)
+    if cache and cache.get("output_signature") == previous_signature:
+        cache["output_signature"] = _file_signature(_output_path(deck_name))
+        _write_cache(cache_path, cache)
+
+def record_build(deck_name: str, hashes: list, use_cache: bool = True):
+    """Records the slide hashes of the deck's freshly written output in the catalog and build cache."""
+    set_build_hash(deck_name, hashes)
+    if use_cache:
+        _write_cache(get_deck_path(deck_name) / CACHE_FILE, {
+            "version": CACHE_VERSION,
+            "template": template_identity(deck_name),
+            "slides": hashes,
+            "output_signature": _file_signature(_output_path(deck_name)),
+        })
+
+def build_deck(deck_name: str, slides_content: list, use_cache: bool = True) -> dict:
+    """
+    Generates a deck through the content-hash build cache kept next to config.json.
+    Returns the existing output untouched when nothing changed, patches only
+    the changed slides when few did, and rebuilds from scratch otherwise.
+    The result reports the mode used, the slide hit/miss counts and any
+    chart data reductions. An open session for the deck is reloaded from
+    the output, replacing its pending edits.
+    """
+    deck_path = get_deck_path(deck_name)
+    if not deck_path.exists():
+        raise FileNotFoundError(f"Deck folder '{deck_name}' does not exist.")
+
+    assets_dir = deck_path / "assets"
+    cache_path = deck_path / CACHE_FILE
+    output_file = _output_path(deck_name)
+    # Hash the paginated specs so cache entries map one-to-one onto slides
+    slides_content = paginate_slide_specs(slides_content, assets_dir)
+    with span("hash_specs"):
+        hashes = [slide_hash(slide_data, assets_dir) for slide_data in slides_content]
+
+    cache = _load_cache(cache_path) if use_cache else {}
+    usable = (
+        cache.get("template") == template_identity(deck_name)
+        and output_file.exists()
+        and cache.get("output_signature") == _file_signature(output_file)
+    )
+    old_hashes = cache.get("slides", []) if usable else []
+
+    changed = [i for i, h in enumerate(hashes) if i >= len(old_hashes) or old_hashes[i] != h]
+    hits = len(hashes) - len(changed)
+
+    if usable and not changed and len(old_hashes) == len(hashes):
+        mode = "hit"
+    elif usable and hashes and len(changed) <= len(hashes) * MAX_PATCH_RATIO:
+        _patch_deck(output_file, slides_content, changed, len(old_hashes), assets_dir)
+        mode = "patched"
+    else:
+        create_enhanced_deck(deck_name, slides_content)
+        mode = "rebuilt"
+        hits, changed = 0, list(range(len(hashes)))
+
+    count("build_cache_hits", hits)
+    count("build_cache_misses", len(changed))
+    record_build(deck_name, hashes, use_cache)
+    if mode != "rebuilt":
+        # The rebuilt path reloads inside create_enhanced_deck
+        from .session import reload_session
+        reload_session(deck_name)
+
+    return {
+        "output": str(output_file),
+        "mode": mode,
+        "hits": hits,
+        "misses": len(changed),
+        "slide_count": len(hashes),
+        "chart_reductions": chart_reductions(slides_content),
+    }
@@ -0,0 +1,285 @@
+"""
+Bulk builders for tables and chart workbooks.
+
+python-pptx fills tables one cell at a time through proxy objects and writes
+each chart's embedded workbook with XlsxWriter. For large tables and many
+charts that dominates generation time, so these helpers emit the table XML
+in one pass and write simple chart workbooks directly from pre-built parts.
+"""
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+import hashlib
+import io
+import math
+import numbers
+import re
+import zipfile
+
+from pptx.chart.data import CategoryChartData
+from pptx.chart.xlsx import CategoryWorkbookWriter
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.util import lazyproperty
+
+from .chart_ingest import ingest_chart_data
+
+TABLE_STYLE_ID = "{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}" # python-pptx default
+GRAPHIC_DATA_URI_TABLE = "http://schemas.openxmlformats.org/drawingml/2006/table"
+WORKBOOK_CACHE_SIZE = 256
+
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+# Characters XML 1.0 does not allow at all; chart labels and worksheet text drop them
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0B\x0C\x0E-\x1F\uFFFE\uFFFF]")
+
+def _xml_text(value):
+    return _XML_ILLEGAL.sub("", value) if isinstance(value, str) else value
+
+def _run_text(text: str) -> str:
+    text = _CTRL_CHARS.sub(lambda m: "_x%04X_" % ord(m.group(1)), text)
+    return escape(text)
+
+def _paragraphs_xml(text: str) -> str:
+    """Same paragraph/run/line-break structure python-pptx writes for TextFrame.text."""
+    parts = []
+    for line in text.split("\n"):
+        runs = []
+        for idx, segment in enumerate(line.split("\v")):
+            if idx > 0:
+                runs.append("<a:br/>")
+            if segment:
+                runs.append(f"<a:r><a:t>{_run_text(segment)}</a:t></a:r>")
+        parts.append(f"<a:p>{''.join(runs)}</a:p>" if runs else "<a:p/>")
+    return "".join(parts)
+
+def add_table_fast(slide, data: list, x: int, y: int, cx: int, cy: int):
+    """
+    Adds a table holding data (a list of equal-length rows) to slide, built
+    as a single XML string instead of cell-by-cell proxy calls. The result is
+    the same markup add_table() plus cell.text would produce.
+    """
+    rows, cols = len(data), len(data[0])
+    shapes = slide.shapes
+    shape_id = shapes._next_shape_id
+
+    row_height = cy // rows
+    col_width = cx // cols
+    grid = "".join(
+        f'<a:gridCol w="{cx - (cols - 1) * col_width if c == cols - 1 else col_width}"/>'
+        for c in range(cols)
+    )
+
+    body = []
+    for r, row in enumerate(data):
+        height = cy - (rows - 1) * row_height if r == rows - 1 else row_height
+        body.append(f'<a:tr h="{height}">')
+        for value in row:
+            body.append(
+                f"<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>{_paragraphs_xml(str(value))}"
+                "</a:txBody><a:tcPr/></a:tc>"
+            )
+        body.append("</a:tr>")
+
+    xml = (
+        f"<p:graphicFrame {nsdecls('a', 'p', 'r')}>"
+        "<p:nvGraphicFramePr>"
+        f'<p:cNvPr id="{shape_id}" name="Table {shape_id - 1}"/>'
+        '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr>'
+        "<p:nvPr/>"
+        "</p:nvGraphicFramePr>"
+        f'<p:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></p:xfrm>'
+        f'<a:graphic><a:graphicData uri="{GRAPHIC_DATA_URI_TABLE}"><a:tbl>'
+        f'<a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{TABLE_STYLE_ID}</a:tableStyleId></a:tblPr>'
+        f"<a:tblGrid>{grid}</a:tblGrid>"
+        f"{''.join(body)}"
+        "</a:tbl></a:graphicData></a:graphic>"
+        "</p:graphicFrame>"
+    )
+    graphic_frame = parse_xml(xml)
+    shapes._spTree.insert_element_before(graphic_frame, "p:extLst")
+    return graphic_frame
+
+def table_page_count(slide_data: dict) -> int:
+    """Number of slides iter_slide_specs turns a spec into."""
+    data = slide_data.get('table_data')
+    max_rows = slide_data.get('table_max_rows')
+    if not data or not max_rows or len(data) <= max_rows or max_rows < 2:
+        return 1
+    return -(-(len(data) - 1) // (max_rows - 1))
+
+def iter_slide_specs(slides_content, assets_dir=None):
+    """
+    Yields slide specs one at a time, splitting table slides whose
+    'table_max_rows' is smaller than their table into continuation slides.
+    The header row is repeated on every page and continuation titles get a
+    ' (cont.)' suffix. Chart data is ingested (sources read, aggregated,
+    downsampled) against assets_dir. Other slides pass through. Works on
+    any iterable.
+    """
+    for slide_data in slides_content:
+        if 'chart_data' in slide_data:
+            chart_data = ingest_chart_data(slide_data['chart_data'], assets_dir)
+            if chart_data is not slide_data['chart_data']:
+                slide_data = dict(slide_data, chart_data=chart_data)
+        if table_page_count(slide_data) == 1:
+            yield slide_data
+            continue
+
+        data = slide_data['table_data']
+        header, body = data[0], data[1:]
+        per_page = slide_data['table_max_rows'] - 1
+        for page, start in enumerate(range(0, len(body), per_page)):
+            page_spec = dict(slide_data, table_data=[header] + body[start:start + per_page])
+            if page:
+                page_spec['title'] = f"{slide_data.get('title', 'Untitled Slide')} (cont.)"
+            yield page_spec
+
+def paginate_slide_specs(slides_content: list, assets_dir=None) -> list:
+    """List form of iter_slide_specs."""
+    return list(iter_slide_specs(slides_content, assets_dir))
+
+# Static workbook parts shared by every generated chart workbook
+_XLSX_STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+
+_workbook_cache = OrderedDict()
+
+def _cell_xml(ref: str, value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        return f'<c r="{ref}"><v>{repr(float(value)) if isinstance(value, float) else int(value)}</v></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t>{escape(_xml_text(str(value)))}</t></is></c>'
+
+def _is_simple(chart_data) -> bool:
+    """True when the workbook only needs one category level, General formats and finite numbers."""
+    if chart_data.categories.depth != 1 or chart_data.categories.number_format != "General":
+        return False
+    for series in chart_data:
+        if series.number_format != "General":
+            return False
+        for value in series.values:
+            if isinstance(value, float) and not math.isfinite(value):
+                return False
+    return True
+
+class FastCategoryWorkbookWriter(CategoryWorkbookWriter):
+    """
+    Writes the worksheet XML directly into a workbook assembled from shared
+    static parts, and reuses the finished blob when the same data repeats.
+    Anything beyond a flat category chart falls back to XlsxWriter.
+    """
+
+    @property
+    def xlsx_blob(self):
+        chart_data = self._chart_data
+        if not _is_simple(chart_data):
+            return CategoryWorkbookWriter.xlsx_blob.fget(self)
+
+        rows = ['<row r="1">' + "".join(
+            _cell_xml(f"{self._column_reference(2 + i)}1", series.name) for i, series in enumerate(chart_data)
+        ) + "</row>"]
+        value_columns = [series.values for series in chart_data]
+        for i, category in enumerate(chart_data.categories):
+            r = i + 2
+            cells = [_cell_xml(f"A{r}", category.label)]
+            for s, values in enumerate(value_columns):
+                if i < len(values):
+                    cells.append(_cell_xml(f"{self._column_reference(2 + s)}{r}", values[i]))
+            rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+
+        sheet = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            f'<cols><col min="1" max="1" width="10" customWidth="1"/></cols>'
+            f"<sheetData>{''.join(rows)}</sheetData></worksheet>"
+        ).encode("utf-8")
+
+        key = hashlib.sha1(sheet).digest()
+        blob = _workbook_cache.get(key)
+        if blob is None:
+            buf = io.BytesIO()
+            with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+                for name, xml in _XLSX_STATIC_PARTS.items():
+                    zf.writestr(name, xml)
+                zf.writestr("xl/worksheets/sheet1.xml", sheet)
+            blob = buf.getvalue()
+            _workbook_cache[key] = blob
+            if len(_workbook_cache) > WORKBOOK_CACHE_SIZE:
+                _workbook_cache.popitem(last=False)
+        else:
+            _workbook_cache.move_to_end(key)
+        return blob
+
+class FastCategoryChartData(CategoryChartData):
+    """
+    CategoryChartData whose embedded workbook is written by
+    FastCategoryWorkbookWriter. Characters XML cannot hold are dropped from
+    category labels and series names, which would otherwise break both the
+    chart part and the workbook.
+    """
+
+    @property
+    def categories(self):
+        return CategoryChartData.categories.fget(self)
+
+    @categories.setter
+    def categories(self, category_labels):
+        CategoryChartData.categories.fset(self, [_xml_text(label) for label in category_labels])
+
+    def add_series(self, name, values=(), number_format=None):
+        return super().add_series(_xml_text(name), values, number_format)
+
+    @lazyproperty
+    def _workbook_writer(self):
+        return FastCategoryWorkbookWriter(self)
@@ -0,0 +1,232 @@
+"""
+SQLite index of all deck projects, kept in the decks root.
+
+Listing and filtering decks reads this catalog instead of scanning deck
+folders and their config.json files. It is updated when decks are created,
+cloned, deleted or saved, and can be rebuilt from disk at any time:
+    python -m backend.catalog rebuild
+"""
+from datetime import datetime, timezone
+import hashlib
+import json
+import sqlite3
+import sys
+import warnings
+
+from . import deck_manager
+
+CATALOG_FILE = "catalog.sqlite3"
+BUILD_CACHE_FILE = "build_cache.json"
+ORDER_COLUMNS = ("name", "status", "created_at", "updated_at", "slide_count", "output_size")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    name TEXT PRIMARY KEY,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    slide_count INTEGER,
+    output_size INTEGER,
+    metadata TEXT,
+    cloned_from TEXT,
+    build_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS decks_status ON decks (status);
+CREATE INDEX IF NOT EXISTS decks_updated_at ON decks (updated_at);
+"""
+
+def catalog_path():
+    return deck_manager.DECKS_DIR / CATALOG_FILE
+
+def _connect(backfill: bool = True) -> sqlite3.Connection:
+    deck_manager.DECKS_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(catalog_path(), timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        created = not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'decks'").fetchone()
+        conn.executescript(_SCHEMA)
+        if created and backfill:
+            # Whichever call creates the catalog, it starts out listing the decks already on disk
+            with conn:
+                _index_all(conn)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def _read_json(path) -> dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def build_hash(slide_hashes: list) -> str:
+    """Hash identifying the full slide spec list a deck was built from."""
+    return hashlib.sha256("".join(slide_hashes).encode("ascii")).hexdigest()
+
+def _deck_row(deck_name: str, slide_count: int = None) -> dict:
+    """Collects the catalog fields for a deck from its folder."""
+    deck_path = deck_manager.get_deck_path(deck_name)
+    config = _read_json(deck_path / "config.json")
+    slide_hashes = _read_json(deck_path / BUILD_CACHE_FILE).get("slides")
+    output = deck_path / "output" / f"{deck_name}.pptx"
+    row = {
+        "name": deck_name,
+        "status": config.get("status", "unknown"),
+        "created_at": config.get("created_at"),
+        "updated_at": _now(),
+        "slide_count": slide_count,
+        "output_size": None,
+        "metadata": json.dumps(config.get("metadata", {})),
+        "cloned_from": config.get("cloned_from"),
+        "build_hash": build_hash(slide_hashes) if slide_hashes else None,
+    }
+    if output.exists():
+        st = output.stat()
+        row["status"] = "generated"
+        row["output_size"] = st.st_size
+        row["updated_at"] = datetime.fromtimestamp(st.st_mtime, timezone.utc).isoformat(timespec="seconds")
+        if slide_count is None:
+            row["slide_count"] = _count_slides(output)
+    return row
+
+def _count_slides(output) -> int:
+    from .opc import slide_part_names
+    import zipfile
+    try:
+        with zipfile.ZipFile(output) as zf:
+            return len(slide_part_names(zf))
+    except (OSError, zipfile.BadZipFile, KeyError):
+        return None
+
+def _upsert(conn: sqlite3.Connection, row: dict):
+    conn.execute(
+        """
+        INSERT INTO decks (name, status, created_at, updated_at, slide_count, output_size, metadata,
+                           cloned_from, build_hash)
+        VALUES (:name, :status, :created_at, :updated_at, :slide_count, :output_size, :metadata,
+                :cloned_from, :build_hash)
+        ON CONFLICT(name) DO UPDATE SET
+            status=excluded.status, created_at=excluded.created_at, updated_at=excluded.updated_at,
+            slide_count=excluded.slide_count, output_size=excluded.output_size,
+            metadata=excluded.metadata, cloned_from=excluded.cloned_from,
+            build_hash=COALESCE(excluded.build_hash, decks.build_hash)
+        """,
+        row,
+    )
+
+def _safely(fn, *args):
+    # The catalog is an index: a failed update must not fail the deck operation itself
+    try:
+        fn(*args)
+    except sqlite3.Error as e:
+        warnings.warn(f"Deck catalog not updated ({e}); run 'python -m backend.catalog rebuild'.")
+
+def sync_deck(deck_name: str, slide_count: int = None):
+    """Records a deck's current state in the catalog."""
+    def update():
+        conn = _connect()
+        try:
+            with conn:
+                _upsert(conn, _deck_row(deck_name, slide_count))
+        finally:
+            conn.close()
+    _safely(update)
+
+def set_build_hash(deck_name: str, slide_hashes: list):
+    """Stores the hash of the slide specs a deck was last built from."""
+    def update():
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("UPDATE decks SET build_hash = ? WHERE name = ?", (build_hash(slide_hashes), deck_name))
+        finally:
+            conn.close()
+    _safely(update)
+
+def remove_deck(deck_name: str):
+    """Drops a deck from the catalog."""
+    def update():
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM decks WHERE name = ?", (deck_name,))
+        finally:
+            conn.close()
+    _safely(update)
+
+def _index_all(conn: sqlite3.Connection) -> int:
+    names = []
+    if deck_manager.DECKS_DIR.exists():
+        names = sorted(d.name for d in deck_manager.DECKS_DIR.iterdir() if d.is_dir())
+    for name in names:
+        _upsert(conn, _deck_row(name))
+    return len(names)
+
+def rebuild_catalog() -> int:
+    """Re-indexes every deck folder on disk and drops entries whose folder is gone."""
+    conn = _connect(backfill=False)
+    try:
+        with conn:
+            conn.execute("DELETE FROM decks")
+            return _index_all(conn)
+    finally:
+        conn.close()
+
+def ensure_catalog():
+    """Builds the catalog from disk the first time it is needed."""
+    _connect().close()
+
+def query_decks(status: str = None, name_contains: str = None, limit: int = 100, offset: int = 0,
+                order_by: str = "name", descending: bool = False) -> dict:
+    """Returns one page of catalog entries matching the filters, plus the total match count."""
+    if order_by not in ORDER_COLUMNS:
+        raise ValueError(f"order_by must be one of {', '.join(ORDER_COLUMNS)}")
+
+    clauses, params = [], []
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if name_contains:
+        clauses.append("name LIKE ? ESCAPE '\\'")
+        escaped = name_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    conn = _connect()
+    try:
+        total = conn.execute(f"SELECT COUNT(*) FROM decks {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT * FROM decks {where} ORDER BY {order_by} {'DESC' if descending else 'ASC'} "
+            "LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+    finally:
+        conn.close()
+
+    decks = []
+    for row in rows:
+        entry = dict(row)
+        entry["metadata"] = json.loads(entry["metadata"] or "{}")
+        decks.append(entry)
+    return {"total": total, "limit": limit, "offset": offset, "decks": decks}
+
+def deck_names() -> list:
+    """All deck names in the catalog."""
+    conn = _connect()
+    try:
+        return [row[0] for row in conn.execute("SELECT name FROM decks ORDER BY name")]
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["rebuild"]:
+        print(f"Catalog rebuilt: {rebuild_catalog()} decks indexed at {catalog_path()}")
+    else:
+        print("Usage: python -m backend.catalog rebuild")
+        sys.exit(1)
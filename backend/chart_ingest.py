@@ -0,0 +1,325 @@
+"""
+Chart data ingestion for large series.
+
+A slide's 'chart_data' may read its values from a CSV, .npy or .npz file
+in the deck's assets folder ('source'), and series may be NumPy arrays
+when specs are built in Python. Before the chart is built the data can be
+grouped by category ('aggregate'), cut to the largest categories plus an
+"Other" bucket ('top_n'), and is downsampled with Largest-Triangle-Three-
+Buckets to at most 'max_points' categories (MAX_CHART_POINTS by default)
+so the chart XML and its embedded workbook stay small. The normalized
+chart_data carries a 'reduction' report of what was applied.
+
+Series are downsampled together: one LTTB pass picks the categories whose
+points form the largest triangles summed over all series (each scaled to
+its own range), so every series keeps the same categories and the budget
+holds however many series there are.
+
+NumPy is optional and only imported when a chart needs ingesting: with it,
+aggregation and downsampling are vectorized; without it the same results
+come from plain Python (.npy and .npz sources need NumPy).
+"""
+from pathlib import Path
+import csv
+import functools
+import math
+
+from .tracing import count, span
+
+MAX_CHART_POINTS = 1000
+AGGREGATES = ("sum", "mean", "min", "max", "count")
+SOURCE_EXTENSIONS = (".csv", ".npy", ".npz")
+DEFAULT_OTHER_LABEL = "Other"
+# Spec keys only ingestion reads; they are dropped from the normalized chart_data
+INGEST_KEYS = ("source", "category_column", "value_columns", "aggregate", "top_n", "other_label")
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """The numpy module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _number(text):
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+def _column_index(header: list, name: str, source: str) -> int:
+    try:
+        return header.index(name)
+    except ValueError:
+        raise ValueError(f"Column '{name}' not found in '{source}' (columns: {', '.join(header)})") from None
+
+def _read_csv(path: Path, chart_data: dict) -> tuple:
+    """(categories, [(series name, values)]) from a CSV with a header row."""
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        rows = csv.reader(f)
+        header = next(rows, None)
+        if not header:
+            raise ValueError(f"CSV '{path.name}' is empty.")
+        category_column = chart_data.get('category_column')
+        cat_idx = _column_index(header, category_column, path.name) if category_column else 0
+        names = chart_data.get('value_columns') or [h for i, h in enumerate(header) if i != cat_idx]
+        indices = [_column_index(header, name, path.name) for name in names]
+
+        categories, columns = [], [[] for _ in names]
+        for row in rows:
+            if not row:
+                continue
+            categories.append(row[cat_idx] if cat_idx < len(row) else "")
+            for column, i in zip(columns, indices):
+                column.append(_number(row[i]) if i < len(row) else None)
+    return categories, list(zip(names, columns))
+
+def _read_numpy(path: Path, chart_data: dict) -> tuple:
+    """(categories, [(series name, values)]) from an .npz of named arrays or an .npy of columns."""
+    np = _numpy()
+    if np is None:
+        raise ImportError(f"Reading '{path.name}' needs NumPy, which is not installed.")
+    if path.suffix == ".npz":
+        with np.load(path, allow_pickle=False) as data:
+            series = [(name, data[name]) for name in data.files if name != "categories"]
+            categories = data["categories"].tolist() if "categories" in data.files else chart_data.get('categories')
+    else:
+        array = np.load(path, allow_pickle=False)
+        if array.ndim == 1:
+            array = array[:, None]
+        names = chart_data.get('value_columns') or [f"Series {i + 1}" for i in range(array.shape[1])]
+        series = [(name, array[:, i]) for i, name in enumerate(names)]
+        categories = chart_data.get('categories')
+    if categories is None:
+        categories = list(range(1, len(series[0][1]) + 1)) if series else []
+    return categories, series
+
+def _load(chart_data: dict, assets_dir: Path) -> tuple:
+    source = chart_data.get('source')
+    if source is None:
+        categories = chart_data.get('categories', [])
+        return categories, list(chart_data.get('series', {}).items())
+    if assets_dir is None:
+        raise ValueError(f"Chart source '{source}' needs the deck's assets folder.")
+    path = assets_dir / source
+    if path.suffix.lower() not in SOURCE_EXTENSIONS:
+        raise ValueError(f"Unsupported chart source '{source}' (expected {', '.join(SOURCE_EXTENSIONS)}).")
+    if not path.exists():
+        raise FileNotFoundError(f"Chart source '{source}' not found in {assets_dir}")
+    with span("chart_read", source=path.suffix):
+        return (_read_csv if path.suffix.lower() == ".csv" else _read_numpy)(path, chart_data)
+
+# Vectorized steps. Columns are float arrays with NaN for missing values.
+
+def _aggregate_np(codes: list, groups: int, columns: list, how: str) -> list:
+    np = _numpy()
+    codes = np.asarray(codes, dtype=np.intp)
+    result = []
+    for column in columns:
+        valid = ~np.isnan(column)
+        counts = np.bincount(codes[valid], minlength=groups)
+        if how == "count":
+            result.append(counts.astype(float))
+            continue
+        if how in ("sum", "mean"):
+            sums = np.bincount(codes[valid], weights=column[valid], minlength=groups)
+            values = sums if how == "sum" else sums / np.maximum(counts, 1)
+        else:
+            values = np.full(groups, np.inf if how == "min" else -np.inf)
+            (np.minimum if how == "min" else np.maximum).at(values, codes[valid], column[valid])
+        result.append(np.where(counts > 0, values, np.nan))
+    return result
+
+def _combine_np(values, how: str) -> float:
+    np = _numpy()
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return math.nan
+    if how == "mean":
+        return float(values.mean())
+    if how in ("min", "max"):
+        return float(values.min() if how == "min" else values.max())
+    return float(values.sum())
+
+def _top_n_np(columns: list, top_n: int, how: str) -> tuple:
+    np = _numpy()
+    totals = np.nansum(np.vstack(columns), axis=0)
+    order = np.argsort(-totals, kind="stable")
+    keep, rest = order[:top_n], order[top_n:]
+    return keep.tolist(), [np.append(column[keep], _combine_np(column[rest], how)) for column in columns]
+
+def _lttb_np(columns: list, threshold: int) -> list:
+    np = _numpy()
+    n = len(columns[0])
+    if threshold >= n:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1][:threshold]
+    y = np.vstack([np.nan_to_num(column) for column in columns])
+    ranges = y.max(axis=1) - y.min(axis=1)
+    y = y / np.where(ranges > 0, ranges, 1.0)[:, None]
+    x = np.arange(n, dtype=float)
+    edges = 1 + np.arange(threshold - 1) * (n - 2) // (threshold - 2)
+    selected, a = [0], 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[hi:next_hi].mean(), y[:, hi:next_hi].mean(axis=1)
+        ya = y[:, a][:, None]
+        area = np.abs((x[a] - avg_x) * (y[:, lo:hi] - ya) - (x[a] - x[lo:hi]) * (avg_y[:, None] - ya)).sum(axis=0)
+        a = lo + int(np.argmax(area))
+        selected.append(a)
+    selected.append(n - 1)
+    return selected
+
+# Plain Python equivalents. Columns are lists with None for missing values.
+
+def _aggregate_py(codes: list, groups: int, columns: list, how: str) -> list:
+    result = []
+    for column in columns:
+        buckets = [[] for _ in range(groups)]
+        for code, value in zip(codes, column):
+            if value is not None:
+                buckets[code].append(value)
+        result.append([_combine_py(bucket, how) if bucket else None for bucket in buckets])
+    return result
+
+def _combine_py(values: list, how: str):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    if how == "count":
+        return float(len(values))
+    if how == "mean":
+        return sum(values) / len(values)
+    if how in ("min", "max"):
+        return min(values) if how == "min" else max(values)
+    return float(sum(values))
+
+def _top_n_py(columns: list, top_n: int, how: str) -> tuple:
+    totals = [sum(v for v in values if v is not None) for values in zip(*columns)]
+    order = sorted(range(len(totals)), key=lambda i: -totals[i])
+    keep, rest = order[:top_n], order[top_n:]
+    # An "Other" bucket of counts adds the counts up
+    how = "sum" if how == "count" else how
+    return keep, [[column[i] for i in keep] + [_combine_py([column[i] for i in rest], how)] for column in columns]
+
+def _lttb_py(columns: list, threshold: int) -> list:
+    n = len(columns[0])
+    if threshold >= n:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1][:threshold]
+    ys = []
+    for column in columns:
+        y = [0.0 if v is None else v for v in column]
+        scale = (max(y) - min(y)) or 1.0
+        ys.append([v / scale for v in y])
+    edges = [1 + i * (n - 2) // (threshold - 2) for i in range(threshold - 1)]
+    selected, a = [0], 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = (hi + next_hi - 1) / 2
+        avg_ys = [sum(y[hi:next_hi]) / (next_hi - hi) for y in ys]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = sum(abs((a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a]))
+                       for y, avg_y in zip(ys, avg_ys))
+            if area > best_area:
+                best, best_area = j, area
+        a = best
+        selected.append(a)
+    selected.append(n - 1)
+    return selected
+
+def _needs_ingest(chart_data: dict, max_points: int) -> bool:
+    if any(key in chart_data for key in INGEST_KEYS):
+        return True
+    categories = chart_data.get('categories', [])
+    series = chart_data.get('series', {})
+    if not isinstance(categories, list) or any(not isinstance(v, list) for v in series.values()):
+        return True
+    return bool(max_points) and len(categories) > max_points
+
+def ingest_chart_data(chart_data: dict, assets_dir: Path = None) -> dict:
+    """
+    Returns chart_data ready for the chart builder: its source file read,
+    then aggregated, cut to the top N and downsampled as the spec asks,
+    with plain lists for categories and series and, when any of that
+    applied, a 'reduction' report.
+    Specs that need none of this (including already normalized ones) are
+    returned unchanged.
+    """
+    max_points = chart_data.get('max_points', MAX_CHART_POINTS)
+    if not _needs_ingest(chart_data, max_points):
+        return chart_data
+
+    categories, series = _load(chart_data, assets_dir)
+    categories = categories.tolist() if hasattr(categories, "tolist") else list(categories)
+    names = [name for name, _ in series]
+    np = _numpy()
+    vectorized = np is not None
+    if vectorized:
+        columns = [np.asarray(values, dtype=float) for _, values in series]
+        columns = [np.where(np.isfinite(column), column, np.nan) for column in columns]
+    else:
+        columns = [[_number(v) for v in values] for _, values in series]
+    for name, column in zip(names, columns):
+        if len(column) != len(categories):
+            raise ValueError(f"Series '{name}' has {len(column)} values for {len(categories)} categories.")
+
+    steps = []
+    categories_in = len(categories)
+    with span("chart_ingest", points=categories_in * len(columns)):
+        how = chart_data.get('aggregate')
+        if how is not None:
+            if how not in AGGREGATES:
+                raise ValueError(f"Unknown aggregate '{how}' (expected one of {', '.join(AGGREGATES)}).")
+            groups = {}
+            codes = [groups.setdefault(category, len(groups)) for category in categories]
+            columns = (_aggregate_np if vectorized else _aggregate_py)(codes, len(groups), columns, how)
+            categories = list(groups)
+            steps.append(f"aggregate:{how}")
+
+        top_n = chart_data.get('top_n')
+        if top_n and columns and len(categories) > top_n:
+            keep, columns = (_top_n_np if vectorized else _top_n_py)(columns, top_n, how or "sum")
+            categories = [categories[i] for i in keep] + [chart_data.get('other_label', DEFAULT_OTHER_LABEL)]
+            steps.append(f"top_n:{top_n}")
+
+        if max_points and columns and len(categories) > max_points:
+            indices = (_lttb_np if vectorized else _lttb_py)(columns, max_points)
+            categories = [categories[i] for i in indices]
+            columns = [column[indices] if vectorized else [column[i] for i in indices] for column in columns]
+            steps.append(f"lttb:{max_points}")
+
+    if vectorized:
+        columns = [[None if math.isnan(v) else v for v in column.tolist()] for column in columns]
+    points_in, points_out = categories_in * len(columns), len(categories) * len(columns)
+    count("chart_points_in", points_in)
+    count("chart_points_out", points_out)
+
+    normalized = {k: v for k, v in chart_data.items() if k not in INGEST_KEYS}
+    normalized['categories'] = categories
+    normalized['series'] = dict(zip(names, columns))
+    if steps:
+        normalized['reduction'] = {
+            "categories_in": categories_in,
+            "categories_out": len(categories),
+            "points_in": points_in,
+            "points_out": points_out,
+            "steps": steps,
+            "engine": "numpy" if vectorized else "python",
+        }
+    return normalized
+
+def chart_reductions(slides_content: list) -> list:
+    """The reduction reports of the ingested charts in a list of slide specs, with their slide index."""
+    return [
+        dict(spec['chart_data']['reduction'], slide=i)
+        for i, spec in enumerate(slides_content)
+        if isinstance(spec.get('chart_data'), dict) and 'reduction' in spec['chart_data']
+    ]
@@ -0,0 +1,131 @@
+"""
+Package compaction for saved decks.
+
+Rewrites a PPTX keeping only the parts reachable from the package root,
+drops presentation relationships to slides that are no longer in the slide
+list, and points duplicate media blobs at a single stored copy.
+"""
+from pathlib import Path
+import hashlib
+import os
+import posixpath
+import zipfile
+
+from lxml import etree
+
+from .build_cache import _file_signature, refresh_output_signature
+from .catalog import sync_deck
+from .deck_manager import get_deck_path
+from .opc import NS, RT_SLIDE, main_part_name, qn, read_rels, rels_name
+
+CONTENT_TYPES = "[Content_Types].xml"
+MEDIA_PREFIXES = ("ppt/media/",)
+
+def _part_names(zf: zipfile.ZipFile) -> set:
+    return {
+        name for name in zf.namelist()
+        if name != CONTENT_TYPES and "/_rels/" not in f"/{name}" and not name.endswith("/")
+    }
+
+def _reachable_parts(zf: zipfile.ZipFile, presentation: str, live_slide_rids: set) -> set:
+    """Walks relationships from the package root, skipping slides missing from the slide list."""
+    seen = set()
+    pending = [""]
+    while pending:
+        source = pending.pop()
+        for rId, (reltype, target, external) in read_rels(zf, source).items():
+            if external or target in seen or target not in zf.NameToInfo:
+                continue
+            if source == presentation and reltype == RT_SLIDE and rId not in live_slide_rids:
+                continue
+            seen.add(target)
+            pending.append(target)
+    return seen
+
+def _rewrite_rels(blob: bytes, source: str, drop_rids: set, retarget: dict) -> bytes:
+    """Removes dropped relationships and points duplicate media at their canonical part."""
+    root = etree.fromstring(blob)
+    changed = False
+    for rel in list(root.iterfind("rel:Relationship", NS)):
+        if rel.get("Id") in drop_rids:
+            root.remove(rel)
+            changed = True
+        elif rel.get("TargetMode") != "External":
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(source), rel.get("Target")))
+            if target in retarget:
+                rel.set("Target", posixpath.relpath(retarget[target], posixpath.dirname(source) or "."))
+                changed = True
+    if not changed:
+        return blob
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+def _rewrite_content_types(blob: bytes, kept: set) -> bytes:
+    root = etree.fromstring(blob)
+    for override in list(root.iterfind("ct:Override", NS)):
+        if override.get("PartName").lstrip("/") not in kept:
+            root.remove(override)
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+def compact_pptx(file_path: Path) -> dict:
+    """Compacts a PPTX in place and returns before/after sizes and part counts."""
+    size_before = file_path.stat().st_size
+    tmp_path = file_path.with_suffix(".compact.tmp")
+
+    with zipfile.ZipFile(file_path) as zf:
+        all_parts = _part_names(zf)
+        presentation = main_part_name(zf)
+        pres_root = etree.fromstring(zf.read(presentation))
+        live_slide_rids = {s.get(qn("r:id")) for s in pres_root.iterfind("p:sldIdLst/p:sldId", NS)}
+        dead_slide_rids = {
+            rId for rId, (reltype, _, _) in read_rels(zf, presentation).items()
+            if reltype == RT_SLIDE and rId not in live_slide_rids
+        }
+        reachable = _reachable_parts(zf, presentation, live_slide_rids)
+
+        # Identical media blobs are stored once
+        canonical = {}
+        retarget = {}
+        for name in sorted(reachable):
+            if name.startswith(MEDIA_PREFIXES):
+                digest = hashlib.sha256(zf.read(name)).hexdigest()
+                if digest in canonical:
+                    retarget[name] = canonical[digest]
+                else:
+                    canonical[digest] = name
+        kept = reachable - set(retarget)
+
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as out:
+            out.writestr(CONTENT_TYPES, _rewrite_content_types(zf.read(CONTENT_TYPES), kept))
+            for name in [""] + sorted(kept):
+                rels = rels_name(name)
+                if rels in zf.NameToInfo:
+                    drop = dead_slide_rids if name == presentation else set()
+                    out.writestr(rels, _rewrite_rels(zf.read(rels), name, drop, retarget))
+                if name:
+                    out.writestr(zf.getinfo(name), zf.read(name), compress_type=zipfile.ZIP_DEFLATED)
+
+    os.replace(tmp_path, file_path)
+
+    return {
+        "file": str(file_path),
+        "bytes_before": size_before,
+        "bytes_after": file_path.stat().st_size,
+        "parts_before": len(all_parts),
+        "parts_after": len(kept),
+        "unreachable_parts_removed": len(all_parts - reachable),
+        "duplicate_media_removed": len(retarget),
+        "orphaned_slide_relationships_removed": len(dead_slide_rids),
+    }
+
+def compact_deck(deck_name: str) -> dict:
+    """Compacts a deck's generated PPTX, keeping its build cache valid."""
+    output_file = get_deck_path(deck_name) / "output" / f"{deck_name}.pptx"
+    if not output_file.exists():
+        raise FileNotFoundError(f"Deck file '{output_file}' not found.")
+
+    before = _file_signature(output_file)
+    stats = compact_pptx(output_file)
+    # Slide content is unchanged, so cached slide hashes still describe the file
+    refresh_output_signature(deck_name, before)
+    sync_deck(deck_name)
+    return stats
@@ -1,8 +1,17 @@
+from datetime import datetime, timezone
 from pathlib import Path
 import json
+import os
 import shutil
+import stat
+
+from .tracing import span
 
 DECKS_DIR = Path(__file__).parent.parent / "decks"
+CLONE_MODES = ("copy", "cow")
+# Folders whose files are shared between cow clones; everything else is copied
+SHARED_DIRS = ("assets",)
+FICLONE = 0x40049409 # Linux reflink ioctl
 
 def initialize_deck_dir(deck_name: str, metadata: dict = None) -> Path:
     """Creates a new isolated project folder for a slide deck."""
@@ -20,27 +29,113 @@ def initialize_deck_dir(deck_name: str, metadata: dict = None) -> Path:
     config = {
         "name": deck_name,
         "status": "initialized",
-        "created_at": None, # Should add timestamp logic
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         "metadata": metadata or {}
     }
 
     with open(deck_path / "config.json", "w") as f:
         json.dump(config, f, indent=4)
 
+    from .catalog import sync_deck
+    from .search import index_deck
+    sync_deck(deck_name)
+    index_deck(deck_name)
     return deck_path
 
 def list_decks() -> list:
-    """Returns a list of all existing decks."""
-    if not DECKS_DIR.exists():
-        return []
-    return [d.name for d in DECKS_DIR.iterdir() if d.is_dir()]
+    """Returns a list of all existing decks, read from the deck catalog."""
+    from .catalog import deck_names
+    return deck_names()
 
 def get_deck_path(deck_name: str) -> Path:
     """Gets the absolute path to a deck directory."""
     return DECKS_DIR / deck_name
 
-def clone_deck(source_deck: str, target_deck: str) -> Path:
-    """Clones an existing deck structure and assets to a new deck."""
+def _reflink(src: Path, dst: Path) -> bool:
+    """Copy-on-write clones src to dst where the filesystem supports it (btrfs, xfs)."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            pass
+    dst.unlink()
+    return False
+
+def _share_file(src: Path, dst: Path):
+    """
+    Gives dst the bytes of src without duplicating them: a reflink if possible,
+    otherwise a hardlink, otherwise a plain copy. The source is left as it is;
+    write_asset replaces files rather than writing through a shared link.
+    """
+    if _reflink(src, dst):
+        shutil.copystat(src, dst)
+        return
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def _cow_copytree(source_path: Path, target_path: Path):
+    shared = {source_path / d for d in SHARED_DIRS}
+
+    def copy_function(src, dst):
+        if any(parent in shared for parent in Path(src).parents):
+            _share_file(Path(src), Path(dst))
+        else:
+            shutil.copy2(src, dst)
+
+    shutil.copytree(source_path, target_path, copy_function=copy_function)
+
+def write_asset(deck_name: str, asset_name: str, data: bytes) -> Path:
+    """
+    Stores an asset in a deck's assets folder. The file is written beside
+    the old one and swapped in, so an asset shared with other decks through
+    a cow clone gets a new file of its own and the other decks keep theirs.
+    """
+    assets_dir = DECKS_DIR / deck_name / "assets"
+    if not assets_dir.exists():
+        raise FileNotFoundError(f"Deck '{deck_name}' not found.")
+    if Path(asset_name).name != asset_name or asset_name in ("", ".", ".."):
+        raise ValueError(f"Asset name '{asset_name}' must be a plain file name.")
+    asset_path = assets_dir / asset_name
+
+    tmp_path = asset_path.with_name(f"{asset_path.name}.write.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, asset_path)
+    return asset_path
+
+def materialize_asset(deck_name: str, asset_name: str) -> Path:
+    """
+    Gives a deck a private, writable copy of an asset it shares with other
+    decks through a cow clone. Call this before modifying the asset in place
+    by other means than write_asset.
+    """
+    asset_path = DECKS_DIR / deck_name / "assets" / asset_name
+    if not asset_path.exists():
+        raise FileNotFoundError(f"Asset '{asset_name}' not found in deck '{deck_name}'.")
+
+    if asset_path.stat().st_nlink > 1:
+        tmp_path = asset_path.with_name(f"{asset_path.name}.materialize.tmp")
+        shutil.copyfile(asset_path, tmp_path)
+        os.replace(tmp_path, asset_path)
+    os.chmod(asset_path, asset_path.stat().st_mode | stat.S_IWUSR)
+    return asset_path
+
+def clone_deck(source_deck: str, target_deck: str, mode: str = "copy") -> Path:
+    """
+    Clones an existing deck structure and assets to a new deck.
+    mode='cow' shares asset bytes with the source (reflinks, or hardlinks
+    where reflinks are unsupported) instead of copying them; store assets
+    with write_asset(), or call materialize_asset() before editing one in
+    place. Outputs, caches and config are always copied.
+    """
+    if mode not in CLONE_MODES:
+        raise ValueError(f"Unknown clone mode '{mode}'. Use one of {', '.join(CLONE_MODES)}.")
     source_path = DECKS_DIR / source_deck
     target_path = DECKS_DIR / target_deck
 
@@ -49,7 +144,11 @@ def clone_deck(source_deck: str, target_deck: str) -> Path:
     if target_path.exists():
         raise FileExistsError(f"Target deck '{target_deck}' already exists.")
 
-    shutil.copytree(source_path, target_path)
+    with span("clone_copy", mode=mode):
+        if mode == "cow":
+            _cow_copytree(source_path, target_path)
+        else:
+            shutil.copytree(source_path, target_path)
 
     # Update target config
     config_path = target_path / "config.json"
@@ -61,12 +160,21 @@ def clone_deck(source_deck: str, target_deck: str) -> Path:
         with open(config_path, "w") as f:
             json.dump(config, f, indent=4)
 
+    from .catalog import sync_deck
+    from .search import index_deck
+    sync_deck(target_deck)
+    index_deck(target_deck)
     return target_path
 
 def delete_deck(deck_name: str):
     """Safely removes a deck project folder."""
     deck_path = DECKS_DIR / deck_name
     if deck_path.exists() and deck_path.is_dir():
-        shutil.rmtree(deck_path)
+        with span("delete_tree"):
+            shutil.rmtree(deck_path)
+        from .catalog import remove_deck
+        from .search import remove_deck_index
+        remove_deck(deck_name)
+        remove_deck_index(deck_name)
     else:
         raise FileNotFoundError(f"Deck '{deck_name}' not found.")
@@ -2,6 +2,8 @@ from pathlib import Path
 import os
 import shutil
 
+from .tracing import count, span
+
 def package_assets(deck_name: str, target_dir: Path) -> Path:
     """
     Bundles the output PPTX and its assets into a distribution folder.
@@ -18,27 +20,22 @@ def package_assets(deck_name: str, target_dir: Path) -> Path:
         shutil.rmtree(dist_path)
     os.makedirs(dist_path)
 
-    # Copy PPTX
-    shutil.copy2(output_pptx, dist_path / f"{deck_name}.pptx")
+    with span("package_copy"):
+        # Copy PPTX
+        shutil.copy2(output_pptx, dist_path / f"{deck_name}.pptx")
 
-    # Copy Assets if they exist
-    assets_src = deck_path / "assets"
-    if assets_src.exists():
-        shutil.copytree(assets_src, dist_path / "assets")
+        # Copy Assets if they exist
+        assets_src = deck_path / "assets"
+        if assets_src.exists():
+            shutil.copytree(assets_src, dist_path / "assets")
+    count("bytes_written", sum(p.stat().st_size for p in dist_path.rglob("*") if p.is_file()))
 
     return dist_path
 
-def export_to_pdf(deck_name: str) -> Path:
+def export_to_pdf(deck_name: str, force: bool = False) -> Path:
     """
-    Placeholder for PDF export.
-    In a full production environment, this would use a tool like 'unoconv' or 'libreoffice'.
+    Exports the deck's PPTX to PDF with headless LibreOffice.
+    Raises ConverterNotFoundError when LibreOffice is not installed.
     """
-    from .deck_manager import get_deck_path
-    deck_path = get_deck_path(deck_name)
-    output_pdf = deck_path / "output" / f"{deck_name}.pdf"
-
-    # Simulate PDF generation for now
-    with open(output_pdf, "w") as f:
-        f.write("%PDF-1.4 (Placeholder for generated content)")
-
-    return output_pdf
+    from .pdf_export import default_pool
+    return Path(default_pool().export_deck(deck_name, force)["pdf"])
@@ -1,55 +1,177 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+import hashlib
 import json
+import os
 import subprocess
+import sys
+import time
 
-def run_mcp_command(command: str, target: str = ".") -> str:
-    """Runs an mcp-global command via the root proxy and returns output."""
+# Called directly rather than through the root mcp.py proxy, which would spawn a second interpreter
+MCP_SCRIPT = Path("mcp-global") / "mcp-global-rules" / "mcp.py"
+COMMANDS = {
+    "review": "🔍 Code Review Findings",
+    "security": "🛡️ Security Audit",
+}
+TARGET_DIR = "backend"
+CACHE_FILE = ".feedback_cache.json"
+REPORT_FILE = "AI_FEEDBACK.md"
+
+def _script() -> Path:
+    return MCP_SCRIPT if (Path.cwd() / MCP_SCRIPT).exists() else Path("mcp.py")
+
+def _run(command: str, target: str) -> tuple:
+    """Runs an mcp-global command. Returns (output, ok), ok meaning it exited with status 0."""
     try:
-        # Using the project root's mcp.py proxy
         result = subprocess.run(
-            ["python", "mcp.py", command, target],
+            [sys.executable, str(_script()), command, target],
             capture_output=True,
             text=True,
             cwd=Path.cwd()
         )
-        return result.stdout
     except Exception as e:
-        return f"Error running mcp {command}: {str(e)}"
+        return f"Error running mcp {command}: {str(e)}", False
+    if result.returncode != 0:
+        output = (result.stdout + result.stderr).strip()
+        return output or f"mcp {command} exited with status {result.returncode}", False
+    return result.stdout, True
 
-def generate_ai_feedback_report():
-    """Aggregates mcp-global findings into AI_FEEDBACK.md."""
-    print("--- Generating AI Feedback Report ---")
+def run_mcp_command(command: str, target: str = ".") -> str:
+    """Runs an mcp-global command and returns its output."""
+    return _run(command, target)[0]
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def _rules_hash(root: Path) -> str:
+    """Hash of the analyzer scripts, so cached outputs are dropped when the rules change."""
+    script = root / _script()
+    # The rules package imports its own modules; the root proxy is a single file
+    paths = sorted(script.parent.rglob("*.py")) if script.parent != root else [script]
+    digest = hashlib.sha256()
+    for path in paths:
+        if path.is_file():
+            digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def _load_cache(root: Path, rules: str) -> dict:
+    try:
+        with open(root / CACHE_FILE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get("results", {}) if cache.get("rules") == rules else {}
 
-    # Run core analysis tools
-    review_output = run_mcp_command("review", "backend/")
-    security_output = run_mcp_command("security", "backend/")
-    # You could add others like 'errors' or 'predict-bugs'
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
 
-    report_content = [
+def _render_report(root: Path, results: dict, timings: dict) -> str:
+    generated = subprocess.run(["git", "log", "-1", "--format=%ai"], capture_output=True, text=True, cwd=root)
+    lines = [
         "# AI Agent Feedback Report",
-        f"Generated: {subprocess.check_output(['git', 'log', '-1', '--format=%ai']).decode().strip()}",
-        "",
-        "## 🔍 Code Review Findings",
-        "```text",
-        review_output,
-        "```",
+        f"Generated: {generated.stdout.strip() or time.strftime('%Y-%m-%d %H:%M:%S %z')}",
         "",
-        "## 🛡️ Security Audit",
-        "```text",
-        security_output,
-        "```",
+        "## ⏱ Timings",
+        "| Command | Files | Analyzed | Cached | Seconds |",
+        "|---------|-------|----------|--------|---------|",
+    ]
+    for command in COMMANDS:
+        t = timings[command]
+        seconds = f"{t['seconds']:.2f}" if t["done"] else "running"
+        lines.append(f"| {command} | {t['files']} | {t['analyzed']} | {t['cached']} | {seconds} |")
+    for command, heading in COMMANDS.items():
+        lines += ["", f"## {heading}"]
+        if not timings[command]["done"]:
+            lines.append("_Still running._")
+            continue
+        lines.append("```text")
+        for path, output in sorted(results[command].items()):
+            lines += [f"--- {path} ---", output.strip(), ""]
+        lines.append("```")
+    lines += [
         "",
         "## 💡 Action Items for AI Agents",
         "Based on the findings above, please prioritize fixing the identified warnings and errors in the next session.",
         "Always check this file after `autocontext` to stay informed about codebase health."
     ]
+    return "\n".join(lines)
+
+def generate_ai_feedback_report(workers: int = None, use_cache: bool = True):
+    """Aggregates mcp-global findings into AI_FEEDBACK.md.
+
+    Each command runs once per file, concurrently. Output is cached against
+    the file's content hash and the analyzer scripts' hash, so only files
+    changed since the last report (or all of them, after a rules update) are
+    analyzed again. Runs that exit with an error are reported but not cached.
+    The report is rewritten as each command finishes.
+    """
+    print("--- Generating AI Feedback Report ---")
+    root = Path.cwd()
+    report_path = root / REPORT_FILE
+    files = sorted(p.relative_to(root).as_posix() for p in (root / TARGET_DIR).rglob("*.py"))
+    hashes = {path: _file_hash(root / path) for path in files}
+    rules = _rules_hash(root)
+    cache = _load_cache(root, rules) if use_cache else {}
+
+    results, timings, started, pending = {}, {}, {}, {}
+    for command in COMMANDS:
+        cached = cache.get(command, {})
+        results_for = {}
+        for path in files:
+            entry = cached.get(path)
+            if entry and entry["hash"] == hashes[path]:
+                results_for[path] = entry["output"]
+            else:
+                pending.setdefault(command, []).append(path)
+        results[command] = results_for
+        started[command] = time.perf_counter()
+        timings[command] = {
+            "files": len(files), "cached": len(results_for), "analyzed": 0, "seconds": 0.0,
+            "done": command not in pending,
+        }
+
+    remaining = {command: len(paths) for command, paths in pending.items()}
+    failed = set()
+    with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        futures = {
+            pool.submit(_run, command, path): (command, path)
+            for command, paths in pending.items() for path in paths
+        }
+        for future in as_completed(futures):
+            command, path = futures[future]
+            results[command][path], ok = future.result()
+            if not ok:
+                failed.add((command, path))
+            timings[command]["analyzed"] += 1
+            remaining[command] -= 1
+            if not remaining[command]:
+                timings[command].update(seconds=time.perf_counter() - started[command], done=True)
+                _write_atomic(report_path, _render_report(root, results, timings))
 
-    report_path = Path.cwd() / "AI_FEEDBACK.md"
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(report_content))
+    cache = {
+        command: {
+            path: {"hash": hashes[path], "output": output}
+            for path, output in outputs.items() if (command, path) not in failed
+        }
+        for command, outputs in results.items()
+    }
+    _write_atomic(root / CACHE_FILE, json.dumps({"rules": rules, "results": cache}))
+    _write_atomic(report_path, _render_report(root, results, timings))
 
-    print(f"   Success: AI_FEEDBACK.md updated.")
+    for command, t in timings.items():
+        print(f"   {command}: {t['analyzed']} analyzed, {t['cached']} cached, {t['seconds']:.2f}s")
+    if failed:
+        print(f"   Warning: {len(failed)} analyses failed and will be retried next time.")
+    print(f"   Success: {REPORT_FILE} updated.")
     return report_path
 
 if __name__ == "__main__":
-    generate_ai_feedback_report()
+    import argparse
+    parser = argparse.ArgumentParser(description="Regenerate AI_FEEDBACK.md from mcp-global findings.")
+    parser.add_argument("--workers", type=int, help="Concurrent analyses (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-analyze every file")
+    args = parser.parse_args()
+    generate_ai_feedback_report(args.workers, use_cache=not args.no_cache)
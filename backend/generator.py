@@ -1,11 +1,201 @@
 from pathlib import Path
 
+from .builders import FastCategoryChartData, add_table_fast, paginate_slide_specs
+from .chart_ingest import ingest_chart_data
+from .catalog import sync_deck
 from .deck_manager import get_deck_path
+from .search import index_deck
+from .snapshots import record_snapshot
+from .templates import layout_index, layout_names, new_presentation
+from .tracing import count, span
 from pptx import Presentation
-from pptx.chart.data import CategoryChartData
 from pptx.enum.chart import XL_CHART_TYPE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from pptx.util import Inches
 
+def _output_path(deck_name: str) -> Path:
+    """Returns the path of the generated PPTX for a deck."""
+    return get_deck_path(deck_name) / "output" / f"{deck_name}.pptx"
+
+def _load_presentation(output_file: Path) -> Presentation:
+    """Opens an existing deck output, or starts a new presentation from the deck's template."""
+    with span("load"):
+        if output_file.exists():
+            return Presentation(output_file)
+        return new_presentation(output_file.stem)
+
+def _save_presentation(prs: Presentation, output_file: Path, snapshot: bool = False) -> Path:
+    """
+    Writes the presentation to its output file and records it in the deck
+    catalog and search index. Whole-deck writes (builds, batches, session
+    commits) pass snapshot=True to also record a snapshot version; single
+    slide edits do not, so they stay cheap.
+    """
+    with span("save"):
+        prs.save(output_file)
+    count("bytes_written", output_file.stat().st_size)
+    with span("catalog_update"):
+        sync_deck(output_file.stem, slide_count=len(prs.slides))
+    index_deck(output_file.stem)
+    if snapshot:
+        record_snapshot(output_file.stem)
+    return output_file
+
+def _slide_kind(slide_data: dict) -> str:
+    for key, kind in (('image', 'image'), ('chart_data', 'chart'), ('table_data', 'table')):
+        if key in slide_data:
+            return kind
+    return 'text'
+
+def _build_slide(prs: Presentation, slide_data: dict, default_title: str = 'Untitled Slide',
+                 assets_dir: Path = None):
+    """Appends one slide built from a slide spec and returns it."""
+    with span("slide", kind=_slide_kind(slide_data)):
+        slide = _fill_slide(prs, slide_data, default_title, assets_dir)
+    count("slides")
+    count("shapes", len(slide.shapes))
+    return slide
+
+def _fill_slide(prs: Presentation, slide_data: dict, default_title: str, assets_dir: Path):
+    # Image slides reference a file in the deck's assets folder
+    if 'image' in slide_data and assets_dir is not None:
+        image_path = assets_dir / slide_data['image']
+        if not image_path.exists():
+            raise FileNotFoundError(f"Asset '{slide_data['image']}' not found in {assets_dir}")
+        return _build_image_slide(prs, slide_data.get('title', default_title), image_path, assets_dir.parent)
+
+    layout_idx = layout_index(prs, slide_data.get('layout', 1))
+    if layout_idx >= len(prs.slide_layouts):
+        layout_idx = 1 # fallback
+
+    slide_layout = prs.slide_layouts[layout_idx]
+    slide = prs.slides.add_slide(slide_layout)
+
+    # Handle Title
+    if slide.shapes.title:
+        slide.shapes.title.text = slide_data.get('title', default_title)
+
+    # Handle Charts
+    if 'chart_data' in slide_data:
+        c_data = ingest_chart_data(slide_data['chart_data'], assets_dir)
+        chart_data = FastCategoryChartData()
+        chart_data.categories = c_data.get('categories', [])
+        for series_name, values in c_data.get('series', {}).items():
+            chart_data.add_series(series_name, values)
+
+        x, y, cx, cy = Inches(0.5), Inches(1.5), Inches(9), Inches(5)
+        chart_type = getattr(XL_CHART_TYPE, c_data.get('type', 'COLUMN_CLUSTERED'))
+        # Builds the chart part and its embedded workbook
+        with span("chart"):
+            slide.shapes.add_chart(chart_type, x, y, cx, cy, chart_data)
+
+    # Handle Tables
+    elif 'table_data' in slide_data:
+        data = slide_data['table_data']
+        left, top, width, height = Inches(0.5), Inches(1.5), Inches(9), Inches(5)
+        with span("table", rows=len(data)):
+            add_table_fast(slide, data, left, top, width, height)
+
+    # Handle Content / Body (if not a table)
+    elif len(slide.placeholders) > 1:
+        body_shape = slide.placeholders[1]
+        tf = body_shape.text_frame
+
+        # Simple content text or bullet points
+        if 'bullet_points' in slide_data:
+            tf.text = slide_data['bullet_points'][0]
+            for bp in slide_data['bullet_points'][1:]:
+                p = tf.add_paragraph()
+                p.text = bp
+                p.level = 0
+        else:
+            tf.text = slide_data.get('content', '')
+
+    return slide
+
+def _build_image_slide(prs: Presentation, title_text: str, image_path: Path, deck_path: Path = None):
+    """
+    Appends a blank-layout slide holding an image and a title text box.
+    With a deck_path the image goes through the asset pipeline first.
+    """
+    # Picture layout (often layout 8 in standard templates)
+    # We'll use a blank layout (6) and add shapes manually for more control
+    names = layout_names(prs)
+    layout = prs.slide_layouts[names.get('Blank', min(6, len(prs.slide_layouts) - 1))]
+    slide = prs.slides.add_slide(layout)
+
+    # Add title manually if needed, or use a layout with placeholders
+    # Let's keep it simple and just add the picture
+    left = top = Inches(1)
+    embed_path = image_path
+    if deck_path is not None:
+        # Pillow is only loaded once a deck actually has an image slide
+        from .assets import prepare_image
+        with span("image_prepare"):
+            embed_path = prepare_image(deck_path, image_path, height_emu=Inches(5))
+    with span("image_embed"):
+        picture = slide.shapes.add_picture(str(embed_path), left, top, height=Inches(5))
+    # Keep the asset's own filename as the picture description, not the cache name
+    picture._element.nvPicPr.cNvPr.set("descr", image_path.name)
+
+    # Add title text box
+    txBox = slide.shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(9), Inches(1))
+    tf = txBox.text_frame
+    tf.text = title_text
+
+    return slide
+
+def _remove_slide(prs: Presentation, slide_index: int):
+    """
+    Removes a slide by index, dropping its relationship so the part is not saved.
+    The remaining slide parts are renumbered, since python-pptx names the next
+    new slide part after the slide count and would otherwise reuse a live name.
+    """
+    # Internal logic for slide deletion in python-pptx
+    xml_slides = prs.slides._sldIdLst
+    slides = list(xml_slides)
+    if not 0 <= slide_index < len(slides):
+        raise IndexError(f"Slide index {slide_index} out of range (0-{len(slides)-1})")
+
+    sld_id = slides[slide_index]
+    xml_slides.remove(sld_id)
+    prs.part.drop_rel(sld_id.rId)
+    prs.part.rename_slide_parts([s.rId for s in xml_slides])
+
+def _move_slide(prs: Presentation, old_index: int, new_index: int):
+    """Moves a slide to a new position in the slide order."""
+    xml_slides = prs.slides._sldIdLst
+    slides = list(xml_slides)
+    sld_id = slides[old_index]
+    xml_slides.remove(sld_id)
+    xml_slides.insert(new_index, sld_id)
+
+def _slide_checkpoint(prs: Presentation) -> tuple:
+    """Captures the slide list so in-memory edits can be undone with _restore_slides."""
+    slide_parts = [rel.target_part for rel in prs.part.rels.values() if rel.reltype == RT.SLIDE]
+    return (
+        list(prs.slides._sldIdLst),
+        dict(prs.part.rels._rels),
+        [(part, part.partname) for part in slide_parts],
+    )
+
+def _restore_slides(prs: Presentation, checkpoint: tuple):
+    """
+    Puts the slide list, the presentation's relationships and the slide
+    partnames back as captured. Slides added since are left unreachable
+    and are not saved.
+    """
+    sld_ids, rels, partnames = checkpoint
+    xml_slides = prs.slides._sldIdLst
+    for sld_id in list(xml_slides):
+        xml_slides.remove(sld_id)
+    for sld_id in sld_ids:
+        xml_slides.append(sld_id)
+    prs.part.rels._rels.clear()
+    prs.part.rels._rels.update(rels)
+    for part, partname in partnames:
+        part.partname = partname
+
 def create_enhanced_deck(deck_name: str, slides_content: list) -> Path:
     """
     Generates a PPTX file with support for multiple layouts.
@@ -13,145 +203,82 @@ def create_enhanced_deck(deck_name: str, slides_content: list) -> Path:
     {
         'title': '...',
         'content': '...',
-        'layout': 1, # default Title and Content
+        'layout': 1, # default Title and Content; layouts can also be named
         'bullet_points': ['...', '...']
     }
+    Slides may instead carry 'chart_data', 'table_data', or 'image'
+    (a filename in the deck's assets folder). Table slides with
+    'table_max_rows' are split across continuation slides. Chart data may
+    come from a CSV or NumPy file in the assets folder and is reduced to
+    a point budget (see chart_ingest). An open session for the deck is
+    reloaded from the new output, replacing its pending edits.
     """
     deck_path = get_deck_path(deck_name)
     if not deck_path.exists():
         raise FileNotFoundError(f"Deck folder '{deck_name}' does not exist.")
 
-    prs = Presentation()
-
-    for slide_data in slides_content:
-        layout_idx = slide_data.get('layout', 1)
-        if layout_idx >= len(prs.slide_layouts):
-            layout_idx = 1 # fallback
+    prs = new_presentation(deck_name)
 
-        slide_layout = prs.slide_layouts[layout_idx]
-        slide = prs.slides.add_slide(slide_layout)
+    with span("build_slides"):
+        for slide_data in paginate_slide_specs(slides_content, deck_path / "assets"):
+            _build_slide(prs, slide_data, assets_dir=deck_path / "assets")
 
-        # Handle Title
-        if slide.shapes.title:
-            slide.shapes.title.text = slide_data.get('title', 'Untitled Slide')
-
-        # Handle Charts
-        if 'chart_data' in slide_data:
-            c_data = slide_data['chart_data']
-            chart_data = CategoryChartData()
-            chart_data.categories = c_data.get('categories', [])
-            for series_name, values in c_data.get('series', {}).items():
-                chart_data.add_series(series_name, values)
-
-            x, y, cx, cy = Inches(0.5), Inches(1.5), Inches(9), Inches(5)
-            chart_type = getattr(XL_CHART_TYPE, c_data.get('type', 'COLUMN_CLUSTERED'))
-            slide.shapes.add_chart(chart_type, x, y, cx, cy, chart_data)
-
-        # Handle Tables
-        elif 'table_data' in slide_data:
-            data = slide_data['table_data']
-            rows, cols = len(data), len(data[0])
-            left, top, width, height = Inches(0.5), Inches(1.5), Inches(9), Inches(5)
-            table = slide.shapes.add_table(rows, cols, left, top, width, height).table
-
-            for r in range(rows):
-                for c in range(cols):
-                    table.cell(r, c).text = str(data[r][c])
-
-        # Handle Content / Body (if not a table)
-        elif len(slide.placeholders) > 1:
-            body_shape = slide.placeholders[1]
-            tf = body_shape.text_frame
-
-            # Simple content text or bullet points
-            if 'bullet_points' in slide_data:
-                tf.text = slide_data['bullet_points'][0]
-                for bp in slide_data['bullet_points'][1:]:
-                    p = tf.add_paragraph()
-                    p.text = bp
-                    p.level = 0
-            else:
-                tf.text = slide_data.get('content', '')
-
-    output_file = deck_path / "output" / f"{deck_name}.pptx"
-    prs.save(output_file)
+    from .session import reload_session
+    output_file = _save_presentation(prs, _output_path(deck_name), snapshot=True)
+    reload_session(deck_name)
     return output_file
 
 def add_slide_to_deck(deck_name: str, slide_data: dict) -> Path:
-    """Adds a single slide to an existing presentation."""
-    deck_path = get_deck_path(deck_name)
-    output_file = deck_path / "output" / f"{deck_name}.pptx"
+    """Adds a single slide to an existing presentation (or to its open session)."""
+    from .session import get_session
+    output_file = _output_path(deck_name)
+    session = get_session(deck_name)
+    if session is not None:
+        session.append_slide(slide_data)
+        return output_file
+    prs = _load_presentation(output_file)
 
-    if output_file.exists():
-        prs = Presentation(output_file)
-    else:
-        prs = Presentation()
+    _build_slide(prs, slide_data, default_title='New Slide',
+                 assets_dir=get_deck_path(deck_name) / "assets")
 
-    layout_idx = slide_data.get('layout', 1)
-    slide_layout = prs.slide_layouts[layout_idx]
-    slide = prs.slides.add_slide(slide_layout)
-
-    # Reuse logic for title/content (Simplified for this snippet)
-    if slide.shapes.title:
-        slide.shapes.title.text = slide_data.get('title', 'New Slide')
-    if len(slide.placeholders) > 1:
-        slide.placeholders[1].text = slide_data.get('content', '')
-
-    prs.save(output_file)
-    return output_file
+    return _save_presentation(prs, output_file)
 
 def delete_slide_from_deck(deck_name: str, slide_index: int) -> Path:
-    """Removes a slide from an existing presentation by index."""
-    deck_path = get_deck_path(deck_name)
-    output_file = deck_path / "output" / f"{deck_name}.pptx"
+    """Removes a slide from an existing presentation (or from its open session) by index."""
+    from .session import get_session
+    output_file = _output_path(deck_name)
+    session = get_session(deck_name)
+    if session is not None:
+        session.delete_slide(slide_index)
+        return output_file
 
     if not output_file.exists():
         raise FileNotFoundError(f"Deck file '{output_file}' not found.")
 
     prs = Presentation(output_file)
+    _remove_slide(prs, slide_index)
 
-    # Internal logic for slide deletion in python-pptx
-    xml_slides = prs.slides._sldIdLst
-    slides = list(xml_slides)
-    if 0 <= slide_index < len(slides):
-        xml_slides.remove(slides[slide_index])
-    else:
-        raise IndexError(f"Slide index {slide_index} out of range (0-{len(slides)-1})")
-
-    prs.save(output_file)
-    return output_file
+    return _save_presentation(prs, output_file)
 
 def add_image_slide(deck_name: str, title_text: str, image_filename: str) -> Path:
     """
     Adds a slide with an image from the assets folder to an existing deck.
-    If the deck output doesn't exist, it creates a new one.
+    If the deck output doesn't exist, it creates a new one. When a session
+    is open for the deck the slide is added to it instead of the file.
     """
     deck_path = get_deck_path(deck_name)
     image_path = deck_path / "assets" / image_filename
-    output_file = deck_path / "output" / f"{deck_name}.pptx"
+    from .session import get_session
+    output_file = _output_path(deck_name)
+    session = get_session(deck_name)
+    if session is not None:
+        session.add_image_slide(title_text, image_filename)
+        return output_file
 
     if not image_path.exists():
         raise FileNotFoundError(f"Asset '{image_filename}' not found in {deck_name}/assets")
 
-    if output_file.exists():
-        prs = Presentation(output_file)
-    else:
-        prs = Presentation()
-
-    # Picture layout (often layout 8 in standard templates)
-    # We'll use a blank layout (6) and add shapes manually for more control
-    layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(layout)
+    prs = _load_presentation(output_file)
+    _build_image_slide(prs, title_text, image_path, deck_path)
 
-    # Add title manually if needed, or use a layout with placeholders
-    # Let's keep it simple and just add the picture
-    left = top = Inches(1)
-    slide.shapes.add_picture(str(image_path), left, top, height=Inches(5))
-
-    # Add title text box
-    txBox = slide.shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(9), Inches(1))
-    tf = txBox.text_frame
-    tf.text = title_text
-
-    prs.save(output_file)
-    return output_file
+    return _save_presentation(prs, output_file)
@@ -0,0 +1,206 @@
+"""
+Cross-deck slide library.
+
+import_slides copies saved slides from other decks' PPTX files into a deck
+as parts: the slide XML, its charts with their embedded workbooks, and its
+images and media are carried over with their relationships instead of the
+slides being rebuilt from specs. Media already present in the target (by
+SHA-1 of its bytes) is referenced rather than stored again. Layouts are
+matched by name in the target's template; speaker notes, comments and
+links to other slides of the source deck are left behind.
+"""
+import hashlib
+
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM, RELATIONSHIP_TYPE as RT
+from pptx.opc.package import _Relationship
+from pptx.opc.packuri import PackURI
+
+from .deck_manager import get_deck_path
+from .generator import (
+    _load_presentation, _move_slide, _output_path, _restore_slides, _save_presentation, _slide_checkpoint,
+)
+from .opc import PartNames
+from .session import get_session
+from .templates import layout_names
+from .tracing import count, span
+
+MEDIA_PREFIX = "/ppt/media/"
+# Relationships that stay with the source deck
+_DROPPED_RELTYPES = {RT.NOTES_SLIDE, RT.COMMENTS, RT.SLIDE}
+
+class _SlideCopier:
+    """Copies slides, and the parts they reach, from other packages into one presentation."""
+
+    def __init__(self, prs):
+        self.prs = prs
+        self.package = prs.part.package
+        self.names = PartNames(str(part.partname) for part in self.package.iter_parts())
+        self.media = None
+        self.copied = {}
+        self.layout = None
+        self.parts_copied = 0
+        self.media_reused = 0
+
+    def _next_name(self, partname: str) -> PackURI:
+        return PackURI(self.names.next(partname))
+
+    def _media_part(self, part):
+        if self.media is None:
+            self.media = {
+                hashlib.sha1(p.blob).hexdigest(): p for p in self.package.iter_parts()
+                if str(p.partname).startswith(MEDIA_PREFIX)
+            }
+        digest = hashlib.sha1(part.blob).hexdigest()
+        if digest in self.media:
+            self.media_reused += 1
+            return self.media[digest]
+        self.media[digest] = clone = self._clone(part)
+        return clone
+
+    def _clone(self, part):
+        clone = type(part).load(self._next_name(str(part.partname)), part.content_type, self.package, part.blob)
+        self.copied[part] = clone
+        self.parts_copied += 1
+        for rId, rel in part.rels.items():
+            if rel.reltype in _DROPPED_RELTYPES:
+                # Nothing else may point at the dropped relationship
+                for element in clone._element.xpath(f'.//*[@r:id="{rId}"]'):
+                    element.getparent().remove(element)
+                continue
+            if rel.is_external:
+                mode, target = RTM.EXTERNAL, rel.target_ref
+            elif rel.reltype == RT.SLIDE_LAYOUT:
+                mode, target = RTM.INTERNAL, self.layout
+            else:
+                mode, target = RTM.INTERNAL, self._copy(rel.target_part)
+            # Keep the rIds the copied XML refers to
+            clone.rels._rels[rId] = _Relationship(clone.partname.baseURI, rId, rel.reltype, mode, target)
+        return clone
+
+    def _copy(self, part):
+        if part in self.copied:
+            return self.copied[part]
+        if str(part.partname).startswith(MEDIA_PREFIX):
+            return self._media_part(part)
+        return self._clone(part)
+
+    def _target_layout(self, source, slide):
+        """The target layout with the slide's layout name, else the one at the same position."""
+        layouts = self.prs.slide_layouts
+        index = layout_names(self.prs).get(slide.slide_layout.name)
+        if index is None:
+            try:
+                index = min(source.slide_layouts.index(slide.slide_layout), len(layouts) - 1)
+            except ValueError:
+                index = min(1, len(layouts) - 1)
+        return layouts[index].part
+
+    def add(self, source, slide_index: int):
+        """Appends a copy of a slide from another presentation."""
+        slide = source.slides[slide_index]
+        self.layout = self._target_layout(source, slide)
+        self.copied = {}
+        clone = self._copy(slide.part)
+        self.prs.slides._sldIdLst.add_sldId(self.prs.part.relate_to(clone, RT.SLIDE))
+
+def validate_imports(imports: list, sources: dict, slide_count: int) -> list:
+    """
+    Checks a batch of imports against the source decks' slide counts and
+    the target's slide count as it will be at each entry. Returns a list of
+    problems (empty when the batch is valid).
+    """
+    problems = []
+    count = slide_count
+    for i, entry in enumerate(imports):
+        prefix = f"Import {i}"
+        if not isinstance(entry, dict) or not entry.get("source_deck"):
+            problems.append(f"{prefix}: 'source_deck' is required")
+            continue
+        source = sources.get(entry["source_deck"])
+        if source is None:
+            problems.append(f"{prefix}: deck '{entry['source_deck']}' has no generated output")
+            continue
+        slide_index = entry.get("slide_index")
+        source_count = len(source.slides._sldIdLst)
+        if not isinstance(slide_index, int) or not 0 <= slide_index < source_count:
+            problems.append(f"{prefix}: slide_index {slide_index} out of range (0-{source_count - 1})")
+            continue
+        index = entry.get("index")
+        if index is not None and (not isinstance(index, int) or not 0 <= index <= count):
+            problems.append(f"{prefix}: index {index} out of range (0-{count})")
+            continue
+        count += 1
+    return problems
+
+def import_slides(deck_name: str, imports: list) -> dict:
+    """
+    Copies saved slides from other decks into a deck with a single load and save.
+    Each entry names a slide of a source deck's generated PPTX:
+        {'source_deck': 'Library', 'slide_index': 3}
+        {'source_deck': 'Library', 'slide_index': 0, 'index': 0}
+    'index' is optional (appends by default) and counts slides as the deck
+    is when that entry is applied. The whole batch is checked first; nothing
+    is written if any entry is invalid. When a session is open for the deck
+    the slides are added to it instead of the file; if a copy fails, the
+    session is rolled back to its state before the batch.
+    """
+    deck_path = get_deck_path(deck_name)
+    if not deck_path.exists():
+        raise FileNotFoundError(f"Deck folder '{deck_name}' does not exist.")
+
+    session = get_session(deck_name)
+    output_file = _output_path(deck_name)
+    prs = session.prs if session is not None else _load_presentation(output_file)
+
+    sources = {}
+    with span("load_sources"):
+        for entry in imports:
+            name = entry.get("source_deck") if isinstance(entry, dict) else None
+            if name and name not in sources:
+                source_file = _output_path(name)
+                sources[name] = Presentation(source_file) if source_file.exists() else None
+
+    problems = validate_imports(imports, sources, len(prs.slides._sldIdLst))
+    if problems:
+        raise ValueError("Invalid imports: " + "; ".join(problems))
+
+    copier = _SlideCopier(prs)
+    checkpoint = _slide_checkpoint(prs) if session is not None else None
+    results = []
+    with span("import_slides"):
+        for i, entry in enumerate(imports):
+            try:
+                copier.add(sources[entry["source_deck"]], entry["slide_index"])
+                last = len(prs.slides._sldIdLst) - 1
+                index = entry.get("index")
+                if index is not None:
+                    _move_slide(prs, last, index)
+            except Exception as e:
+                if checkpoint is not None:
+                    _restore_slides(prs, checkpoint)
+                raise RuntimeError(f"Import {i} ({entry['source_deck']} slide {entry['slide_index']}) failed: {e}") from e
+            results.append({
+                "source_deck": entry["source_deck"],
+                "slide_index": entry["slide_index"],
+                "index": last if index is None else index,
+            })
+    count("slides", len(imports))
+    count("parts_copied", copier.parts_copied)
+    count("media_reused", copier.media_reused)
+
+    if session is not None:
+        if imports:
+            session.mark_dirty(len(imports))
+        saved_to = None
+    else:
+        saved_to = str(_save_presentation(prs, output_file, snapshot=True))
+
+    return {
+        "output": saved_to,
+        "session": session is not None,
+        "slide_count": len(prs.slides._sldIdLst),
+        "parts_copied": copier.parts_copied,
+        "media_reused": copier.media_reused,
+        "results": results,
+    }
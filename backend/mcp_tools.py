@@ -1,15 +1,18 @@
+from pathlib import Path
 from typing import Dict, List
 import json
 
-from .deck_manager import initialize_deck_dir, list_decks, get_deck_path, clone_deck
-from .distributor import package_assets, export_to_pdf
-from .generator import create_enhanced_deck, add_image_slide, add_slide_to_deck, delete_slide_from_deck
-from .validator import validate_pptx
+from .tracing import traced_tools
 
+# Backend modules are imported inside each tool so a call only pays for the
+# dependencies (python-pptx, lxml, Pillow, XlsxWriter) its own code path needs.
+
+@traced_tools
 class SlideDeckMCPTools:
     """
     Standard interface for AI agents to interact with the Slide Deck Backend.
     These methods are designed to be wrapped as MCP tools.
+    Every tool also accepts debug=True (and profile=True) to return a timing trace with its result.
     """
 
     @staticmethod
@@ -18,31 +21,80 @@ class SlideDeckMCPTools:
         Initializes a new isolated slide deck project folder.
         """
         try:
+            from .deck_manager import initialize_deck_dir
             path = initialize_deck_dir(deck_name, {"purpose": purpose})
             return f"Success: Deck '{deck_name}' initialized at {path}"
         except Exception as e:
             return f"Error: {str(e)}"
 
     @staticmethod
-    def clone_existing_deck(source_deck: str, target_deck: str) -> str:
+    def clone_existing_deck(source_deck: str, target_deck: str, mode: str = "copy") -> str:
         """
         Clones an existing deck to a new one, including all assets.
+        mode='cow' shares asset files with the source instead of copying them.
         """
         try:
-            path = clone_deck(source_deck, target_deck)
+            from .deck_manager import clone_deck
+            path = clone_deck(source_deck, target_deck, mode)
             return f"Success: Deck '{source_deck}' cloned to '{target_deck}' at {path}"
         except Exception as e:
             return f"Error: {str(e)}"
 
     @staticmethod
-    def generate_slides(deck_name: str, slides: List[Dict[str, str]]) -> str:
+    def set_template(deck_name: str, template: str = "") -> str:
+        """
+        Sets the .pptx/.potx template new slides of the deck are built on,
+        as a path relative to the deck folder (e.g. 'assets/corporate.potx')
+        or absolute. An empty template restores the default.
+        """
+        try:
+            from .templates import set_deck_template
+            parsed = set_deck_template(deck_name, template or None)
+            return f"Success: Deck '{deck_name}' uses template {template or 'default'} ({len(parsed.layout_names)} layouts)"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def list_layouts(deck_name: str) -> str:
+        """
+        Lists the slide layouts of the deck's template by index. Slide specs
+        may give 'layout' as either the index or the name.
+        """
+        try:
+            from .templates import deck_template
+            return json.dumps(deck_template(deck_name).layout_names, indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def generate_slides(deck_name: str, slides: List[Dict[str, str]], stream: bool = False) -> str:
         """
         Generates or updates a PPTX file with the provided slide content.
         'slides' should be a list of {'title': '...', 'content': '...'}.
+        Unchanged slides are served from the deck's build cache.
+        stream=True writes slides to the file as they are built, keeping memory
+        flat for very large decks; it always rebuilds every slide.
+        Chart slides may read 'chart_data' from a CSV/NumPy 'source' in the
+        deck's assets and set 'aggregate', 'top_n' and 'max_points'; large
+        series are downsampled and the reduction is reported.
         """
         try:
-            output_file = create_enhanced_deck(deck_name, slides)
-            return f"Success: Slide deck generated at {output_file}"
+            if stream:
+                from .streaming import stream_enhanced_deck
+                build = stream_enhanced_deck(deck_name, slides)
+                message = f"Success: Slide deck streamed to {build['output']} ({build['slide_count']} slides)"
+            else:
+                from .build_cache import build_deck
+                build = build_deck(deck_name, slides)
+                message = (f"Success: Slide deck generated at {build['output']} "
+                           f"(cache: {build['mode']}, {build['hits']} hits, {build['misses']} misses)")
+            reductions = [
+                f"slide {r['slide'] + 1}: {r['points_in']} -> {r['points_out']} points ({', '.join(r['steps'])})"
+                for r in build['chart_reductions']
+            ]
+            if reductions:
+                message += "\nChart data reduced: " + "; ".join(reductions)
+            return message
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -50,23 +102,104 @@ class SlideDeckMCPTools:
     def validate_deck(deck_name: str) -> str:
         """
         Performs quality and structural validation on the generated deck.
+        Per-slide results are cached, so only changed slides are re-checked.
         """
         try:
+            from .deck_manager import get_deck_path
+            from .validator import VALIDATION_CACHE_FILE, incremental_validate_pptx
             deck_path = get_deck_path(deck_name)
             output_file = deck_path / "output" / f"{deck_name}.pptx"
-            results = validate_pptx(output_file)
+            results = incremental_validate_pptx(output_file, deck_path / VALIDATION_CACHE_FILE)
             return json.dumps(results, indent=2)
         except Exception as e:
             return f"Error: {str(e)}"
 
+    @staticmethod
+    def batch_build_and_validate(jobs: List, workers: int = None) -> str:
+        """
+        Builds and validates many decks in parallel worker processes.
+        Each job is a deck name (validate only) or
+        {'deck_name': '...', 'slides': [...]} (build, then validate).
+        Use ["*"] to validate every existing deck. Failures are reported per deck.
+        Jobs naming the same deck run in order, one at a time.
+        """
+        try:
+            from .batch import run_batch
+            from .deck_manager import list_decks
+            if jobs == ["*"]:
+                jobs = list_decks()
+            return json.dumps(run_batch(jobs, workers), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
     @staticmethod
     def add_image_to_deck(deck_name: str, title: str, image_filename: str) -> str:
         """
         Adds a slide with an image from the assets folder to the deck.
         """
         try:
+            from .assets import asset_savings
+            from .deck_manager import get_deck_path
+            from .generator import add_image_slide
+            from .session import get_session
+            session = get_session(deck_name)
+            if session is not None:
+                index = session.add_image_slide(title, image_filename)
+                return f"Success: Image slide added at index {index} (session, {session.dirty_slides} pending)"
             output_file = add_image_slide(deck_name, title, image_filename)
-            return f"Success: Image slide added to {output_file}"
+            saved = asset_savings(get_deck_path(deck_name))["bytes_saved"]
+            return f"Success: Image slide added to {output_file} ({saved} bytes saved by asset preprocessing in this deck)"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def add_asset(deck_name: str, source_path: str, asset_name: str = "") -> str:
+        """
+        Copies a local file into the deck's assets folder (as asset_name, or
+        under its own file name), replacing any asset of that name without
+        touching decks that share it through a copy-on-write clone.
+        """
+        try:
+            from .deck_manager import write_asset
+            source = Path(source_path)
+            path = write_asset(deck_name, asset_name or source.name, source.read_bytes())
+            return f"Success: Asset stored at {path}"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def asset_report(deck_name: str) -> str:
+        """
+        Reports how many bytes the image preprocessing pipeline saved for the deck.
+        """
+        try:
+            from .assets import asset_savings
+            from .deck_manager import get_deck_path
+            return json.dumps(asset_savings(get_deck_path(deck_name)), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def preview_slides(deck_name: str, width: int = 320) -> str:
+        """
+        Renders low-resolution PNG thumbnails of every slide and returns their paths.
+        Only slides changed since the last preview are redrawn.
+        """
+        try:
+            from .thumbnails import render_thumbnails
+            return json.dumps(render_thumbnails(deck_name, width), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def preview_deck(deck_name: str, width: int = 320, columns: int = 4) -> str:
+        """
+        Renders a contact sheet showing all slide thumbnails of the deck in one PNG.
+        """
+        try:
+            from .thumbnails import contact_sheet
+            path = contact_sheet(deck_name, width, columns)
+            return f"Success: Contact sheet at {path}"
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -76,7 +209,13 @@ class SlideDeckMCPTools:
         Appends a single slide to the deck.
         """
         try:
+            from .generator import add_slide_to_deck
+            from .session import get_session
             slide_data = {"title": title, "content": content, "layout": layout}
+            session = get_session(deck_name)
+            if session is not None:
+                index = session.append_slide(slide_data)
+                return f"Success: Slide added at index {index} (session, {session.dirty_slides} pending)"
             output_file = add_slide_to_deck(deck_name, slide_data)
             return f"Success: Slide added to {output_file}"
         except Exception as e:
@@ -88,38 +227,244 @@ class SlideDeckMCPTools:
         Removes a slide from the deck by its index.
         """
         try:
+            from .generator import delete_slide_from_deck
+            from .session import get_session
+            session = get_session(deck_name)
+            if session is not None:
+                session.delete_slide(index)
+                return f"Success: Slide {index} removed (session, {session.dirty_slides} pending)"
             output_file = delete_slide_from_deck(deck_name, index)
             return f"Success: Slide {index} removed from {output_file}"
         except Exception as e:
             return f"Error: {str(e)}"
 
     @staticmethod
-    def distribute_deck(deck_name: str, destination_dir: str) -> str:
+    def apply_operations(deck_name: str, ops: List[Dict], compact: bool = False) -> str:
+        """
+        Applies an ordered batch of slide operations (append, insert, delete,
+        replace, add_image, add_chart, add_table) with one load and one save.
+        Returns per-operation results as JSON.
+        """
+        try:
+            from .operations import apply_operations
+            return json.dumps(apply_operations(deck_name, ops, compact), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def import_slides(deck_name: str, slides: List[Dict]) -> str:
+        """
+        Copies saved slides from other decks into this one as parts (charts,
+        workbooks and media included) instead of regenerating them. Each entry
+        is {"source_deck": ..., "slide_index": ..., "index": optional position}.
+        Returns per-slide results as JSON.
+        """
+        try:
+            from .library import import_slides
+            return json.dumps(import_slides(deck_name, slides), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def open_deck_session(deck_name: str, max_dirty_slides: int = 50, max_dirty_seconds: float = 30.0) -> str:
+        """
+        Opens an in-memory editing session for the deck. While it is open,
+        append_slide, add_image_to_deck and remove_slide edit the loaded deck
+        and only write to disk on commit or when a dirty threshold is reached.
+        """
+        try:
+            from .session import open_session
+            session = open_session(deck_name, max_dirty_slides, max_dirty_seconds)
+            return f"Success: Session opened for '{deck_name}' ({session.slide_count} slides)"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def commit_deck_session(deck_name: str, compact: bool = False) -> str:
+        """
+        Writes pending session changes to the deck file.
+        """
+        try:
+            from .session import commit_session
+            output_file = commit_session(deck_name, compact)
+            return f"Success: Session committed to {output_file}"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def close_deck_session(deck_name: str, commit: bool = True, compact: bool = False) -> str:
+        """
+        Closes the deck's editing session, committing pending changes by default.
+        """
+        try:
+            from .session import close_session
+            output_file = close_session(deck_name, commit, compact)
+            if output_file is None:
+                return f"Success: Session for '{deck_name}' closed without committing"
+            return f"Success: Session closed and committed to {output_file}"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def compact_deck(deck_name: str) -> str:
+        """
+        Drops unreachable parts and duplicate media from the saved deck.
+        Returns before/after sizes and part counts as JSON.
+        """
+        try:
+            from .compaction import compact_deck
+            return json.dumps(compact_deck(deck_name), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def snapshot_deck(deck_name: str, label: str = "") -> str:
+        """
+        Records the deck's saved output as a new snapshot version. Builds,
+        apply_operations, import_slides and session commits do this
+        automatically; single-slide edits do not. Returns the version summary as JSON.
+        """
+        try:
+            from .snapshots import snapshot_deck
+            return json.dumps(snapshot_deck(deck_name, label or None), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def list_snapshots(deck_name: str) -> str:
+        """Lists the deck's snapshot versions, oldest first, as JSON."""
+        try:
+            from .snapshots import list_snapshots
+            return json.dumps(list_snapshots(deck_name), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def restore_snapshot(deck_name: str, version: int) -> str:
+        """
+        Restores the deck's output to a snapshot version. The restore is
+        recorded as a new version, so it can be undone.
+        """
+        try:
+            from .snapshots import restore_snapshot
+            return json.dumps(restore_snapshot(deck_name, version), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def diff_snapshots(deck_name: str, from_version: int, to_version: int = None) -> str:
+        """
+        Compares two snapshot versions (to_version defaults to the latest):
+        added, removed and changed parts and the slide positions that differ.
+        """
+        try:
+            from .snapshots import diff_snapshots
+            return json.dumps(diff_snapshots(deck_name, from_version, to_version), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def gc_snapshots(deck_name: str, keep: int = 50) -> str:
+        """Deletes all but the newest `keep` snapshot versions and their unused parts."""
+        try:
+            from .snapshots import gc_snapshots
+            return json.dumps(gc_snapshots(deck_name, keep), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def distribute_deck(deck_name: str, destination_dir: str, format: str = "folder", workers: int = None) -> str:
         """
         Packages the deck and its assets for distribution.
+        format='folder' copies them into a folder; 'zip' or 'tar.gz' streams
+        them into a single archive, compressing in parallel.
         """
         try:
+            from .distributor import package_assets
+            from .packager import package_archive
             dest_path = Path(destination_dir)
+            if format != "folder":
+                stats = package_archive(deck_name, dest_path, format, workers)
+                return (f"Success: Deck packaged at {stats['archive']} ({stats['bytes']} bytes, "
+                        f"{stats['reused']} of {stats['members']} members reused)")
             dist_path = package_assets(deck_name, dest_path)
             return f"Success: Deck packaged at {dist_path}"
         except Exception as e:
             return f"Error: {str(e)}"
 
     @staticmethod
-    def export_pdf(deck_name: str) -> str:
+    def export_pdf(deck_name: str, force: bool = False) -> str:
+        """
+        Exports the deck to a PDF format with headless LibreOffice.
+        Skipped when the PPTX is unchanged since the last export, unless force is set.
+        """
+        try:
+            from .pdf_export import default_pool
+            result = default_pool().export_deck(deck_name, force)
+            if result["skipped"]:
+                return f"Success: PDF at {result['pdf']} is up to date"
+            return f"Success: PDF exported to {result['pdf']} in {result['seconds']}s"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def export_pdfs(deck_names: List[str], force: bool = False) -> str:
+        """
+        Exports several decks to PDF concurrently on the converter pool.
+        """
+        try:
+            from .pdf_export import default_pool
+            return json.dumps(default_pool().export_many(deck_names, force))
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def list_all_decks(status: str = None, name_contains: str = None, limit: int = 100, offset: int = 0,
+                       order_by: str = "name", descending: bool = False) -> str:
+        """
+        Lists slide deck projects from the deck catalog, optionally filtered by
+        status or name substring, one page at a time. Each entry carries status,
+        timestamps, slide count, output size, metadata and last build hash.
+        """
+        try:
+            from .catalog import query_decks
+            return json.dumps(query_decks(status, name_contains, limit, offset, order_by, descending))
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def rebuild_deck_catalog() -> str:
         """
-        Exports the deck to a PDF format.
+        Rebuilds the deck catalog from the deck folders on disk.
         """
         try:
-            pdf_path = export_to_pdf(deck_name)
-            return f"Success: PDF exported to {pdf_path}"
+            from .catalog import rebuild_catalog
+            count = rebuild_catalog()
+            return f"Success: Deck catalog rebuilt with {count} decks."
         except Exception as e:
             return f"Error: {str(e)}"
 
     @staticmethod
-    def list_all_decks() -> str:
+    def search_slides(query: str, deck_name: str = None, limit: int = 20, offset: int = 0) -> str:
         """
-        Lists all existing slide deck projects.
+        Full-text search over slide titles, text, table cells and chart
+        series of all decks (or one deck). Returns ranked matches with deck
+        name and slide index, plus decks whose name or metadata match.
         """
-        decks = list_decks()
-        return json.dumps(decks)
+        try:
+            from .search import search_slides
+            return json.dumps(search_slides(query, limit, offset, deck_name), indent=2)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    @staticmethod
+    def rebuild_search_index() -> str:
+        """
+        Rebuilds the slide search index from the deck folders on disk.
+        """
+        try:
+            from .search import rebuild_index
+            count = rebuild_index()
+            return f"Success: Search index rebuilt with {count} decks."
+        except Exception as e:
+            return f"Error: {str(e)}"
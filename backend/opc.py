@@ -0,0 +1,117 @@
+"""
+Helpers for reading a PPTX package (an OPC zip) directly, without building
+a python-pptx object graph.
+"""
+import hashlib
+import posixpath
+import re
+import zipfile
+
+from lxml import etree
+
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "c": "http://schemas.openxmlformats.org/drawingml/2006/chart",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "ct": "http://schemas.openxmlformats.org/package/2006/content-types",
+}
+
+RT_OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+RT_SLIDE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+RT_SLIDE_LAYOUT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+RT_SLIDE_MASTER = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideMaster"
+
+_NUMBERED = re.compile(r"^(.*?)(\d+)(\.\w+)$")
+
+def qn(tag: str) -> str:
+    """Expands a prefixed tag like 'p:sp' to Clark notation."""
+    prefix, local = tag.split(":")
+    return f"{{{NS[prefix]}}}{local}"
+
+def rels_name(part_name: str) -> str:
+    """Returns the zip member holding a part's relationships."""
+    directory, filename = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", f"{filename}.rels")
+
+def resolve(source_part: str, target: str) -> str:
+    """Resolves a relationship target relative to the part that declares it."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+def read_rels(zf: zipfile.ZipFile, part_name: str) -> dict:
+    """Maps rId -> (reltype, resolved zip member or external target, is_external)."""
+    name = rels_name(part_name)
+    if name not in zf.NameToInfo:
+        return {}
+
+    rels = {}
+    root = etree.fromstring(zf.read(name))
+    for rel in root.iterfind("rel:Relationship", NS):
+        external = rel.get("TargetMode") == "External"
+        target = rel.get("Target") if external else resolve(part_name, rel.get("Target"))
+        rels[rel.get("Id")] = (rel.get("Type"), target, external)
+    return rels
+
+def main_part_name(zf: zipfile.ZipFile) -> str:
+    """Returns the zip member of the presentation part."""
+    for reltype, target, _ in read_rels(zf, "").values():
+        if reltype == RT_OFFICE_DOCUMENT:
+            return target
+    return "ppt/presentation.xml"
+
+def slide_part_names(zf: zipfile.ZipFile) -> list:
+    """Returns the slide zip members in presentation order (orphaned slide parts are skipped)."""
+    presentation = main_part_name(zf)
+    rels = read_rels(zf, presentation)
+    root = etree.fromstring(zf.read(presentation))
+    return [
+        rels[sld_id.get(qn("r:id"))][1]
+        for sld_id in root.iterfind("p:sldIdLst/p:sldId", NS)
+    ]
+
+def related(zf: zipfile.ZipFile, part_name: str, reltype: str):
+    """Returns the first internal part related to part_name by reltype, or None."""
+    for rtype, target, external in read_rels(zf, part_name).values():
+        if rtype == reltype and not external:
+            return target
+    return None
+
+def slide_key(zf: zipfile.ZipFile, part_name: str, part_hashes: dict) -> tuple:
+    """Hashes a slide part together with its layout and master parts. Returns (key, slide bytes)."""
+    def part_hash(name):
+        if name not in part_hashes:
+            part_hashes[name] = hashlib.sha256(zf.read(name)).hexdigest() if name else ""
+        return part_hashes[name]
+
+    blob = zf.read(part_name)
+    layout = related(zf, part_name, RT_SLIDE_LAYOUT)
+    master = related(zf, layout, RT_SLIDE_MASTER) if layout else None
+
+    digest = hashlib.sha256(blob)
+    digest.update(part_hash(layout).encode("ascii"))
+    digest.update(part_hash(master).encode("ascii"))
+    return digest.hexdigest(), blob
+
+class PartNames:
+    """Hands out unused part names in the numbered series a name belongs to (slideN.xml, chartN.xml, ...)."""
+
+    def __init__(self, taken):
+        self.taken = set(taken)
+        self.counters = {}
+
+    def next(self, partname: str) -> str:
+        """Next free name in partname's series, e.g. '/ppt/slides/slide7.xml' for any slide part name."""
+        match = _NUMBERED.match(partname)
+        if match:
+            prefix, _, ext = match.groups()
+        else:
+            prefix, ext = posixpath.splitext(partname)
+        n = self.counters.get(prefix, 0)
+        while f"{prefix}{n}{ext}" in self.taken or n == 0:
+            n += 1
+        self.counters[prefix] = n
+        self.taken.add(f"{prefix}{n}{ext}")
+        return f"{prefix}{n}{ext}"
@@ -0,0 +1,192 @@
+from pathlib import Path
+
+from pptx.enum.chart import XL_CHART_TYPE
+
+from .builders import paginate_slide_specs, table_page_count
+from .chart_ingest import AGGREGATES
+from .compaction import compact_deck
+from .deck_manager import get_deck_path
+from .generator import (
+    _build_image_slide, _build_slide, _load_presentation, _move_slide,
+    _output_path, _remove_slide, _restore_slides, _save_presentation,
+    _slide_checkpoint,
+)
+from .session import get_session
+
+OPERATIONS = ("append", "insert", "delete", "replace", "add_image", "add_chart", "add_table")
+
+def _slide_spec(op: dict) -> dict:
+    """Returns the slide spec carried by an operation."""
+    if op["op"] in ("append", "insert", "replace"):
+        return op["slide"]
+    return {k: v for k, v in op.items() if k not in ("op", "index")}
+
+def _check_spec(spec, assets_dir: Path, problems: list, prefix: str):
+    if not isinstance(spec, dict):
+        problems.append(f"{prefix}: slide spec must be an object")
+        return
+    if 'image' in spec and not (assets_dir / spec['image']).exists():
+        problems.append(f"{prefix}: asset '{spec['image']}' not found in assets")
+    if 'chart_data' in spec:
+        chart_type = spec['chart_data'].get('type', 'COLUMN_CLUSTERED')
+        if not hasattr(XL_CHART_TYPE, chart_type):
+            problems.append(f"{prefix}: unknown chart type '{chart_type}'")
+        source = spec['chart_data'].get('source')
+        if source and not (assets_dir / source).exists():
+            problems.append(f"{prefix}: chart source '{source}' not found in assets")
+        aggregate = spec['chart_data'].get('aggregate')
+        if aggregate is not None and aggregate not in AGGREGATES:
+            problems.append(f"{prefix}: unknown aggregate '{aggregate}'")
+    if 'table_data' in spec:
+        data = spec['table_data']
+        if not data or not data[0]:
+            problems.append(f"{prefix}: table_data must have at least one row and column")
+        elif any(len(row) != len(data[0]) for row in data):
+            problems.append(f"{prefix}: table_data rows must all have the same length")
+
+def validate_operations(deck_path: Path, ops: list, slide_count: int) -> list:
+    """
+    Checks a batch before anything is applied, replaying slide counts
+    (including table continuation slides) so indices are checked against
+    the deck as it will be at that point. Returns a list of problems
+    (empty when the batch is valid).
+    """
+    problems = []
+    count = slide_count
+
+    for i, op in enumerate(ops):
+        prefix = f"Operation {i}"
+        kind = op.get("op") if isinstance(op, dict) else None
+        if kind not in OPERATIONS:
+            problems.append(f"{prefix}: unknown op '{kind}' (expected one of {', '.join(OPERATIONS)})")
+            continue
+
+        index = op.get("index")
+        if kind in ("insert", "delete", "replace") and not isinstance(index, int):
+            problems.append(f"{prefix}: '{kind}' requires an integer 'index'")
+            continue
+        if index is not None:
+            upper = count if kind in ("insert", "add_image", "add_chart", "add_table") else count - 1
+            if not isinstance(index, int) or not 0 <= index <= upper:
+                problems.append(f"{prefix}: index {index} out of range (0-{upper})")
+                continue
+
+        if kind in ("append", "insert", "replace"):
+            if "slide" not in op:
+                problems.append(f"{prefix}: '{kind}' requires a 'slide' spec")
+                continue
+            _check_spec(op["slide"], deck_path / "assets", problems, prefix)
+        elif kind == "add_image":
+            image = op.get("image")
+            if not image:
+                problems.append(f"{prefix}: 'add_image' requires an 'image' filename")
+            elif not (deck_path / "assets" / image).exists():
+                problems.append(f"{prefix}: asset '{image}' not found in assets")
+        elif kind == "add_chart" and "chart_data" not in op:
+            problems.append(f"{prefix}: 'add_chart' requires 'chart_data'")
+        elif kind == "add_table" and "table_data" not in op:
+            problems.append(f"{prefix}: 'add_table' requires 'table_data'")
+        if kind in ("add_chart", "add_table"):
+            _check_spec(_slide_spec(op), deck_path / "assets", problems, prefix)
+
+        spec = _slide_spec(op) if kind not in ("delete", "add_image") else None
+        pages = table_page_count(spec) if isinstance(spec, dict) else 1
+        if kind == "delete":
+            count -= 1
+        elif kind == "replace":
+            count += pages - 1
+        else:
+            count += pages
+
+    return problems
+
+def _apply(prs, deck_path: Path, op: dict) -> tuple:
+    """
+    Applies one operation to a loaded presentation. Returns the affected
+    index and the number of slides it covers (more than one when a table
+    is split across continuation slides).
+    """
+    kind = op["op"]
+    index = op.get("index")
+
+    if kind == "delete":
+        _remove_slide(prs, index)
+        return index, 1
+
+    if kind == "add_image":
+        _build_image_slide(prs, op.get("title", ""), deck_path / "assets" / op["image"], deck_path)
+        pages = 1
+    else:
+        specs = paginate_slide_specs([_slide_spec(op)], deck_path / "assets")
+        for spec in specs:
+            _build_slide(prs, spec, default_title='New Slide', assets_dir=deck_path / "assets")
+        pages = len(specs)
+
+    first = len(prs.slides._sldIdLst) - pages
+    if index is None:
+        return first, pages
+    for offset in range(pages):
+        _move_slide(prs, first + offset, index + offset)
+    if kind == "replace":
+        _remove_slide(prs, index + pages)
+    return index, pages
+
+def apply_operations(deck_name: str, ops: list, compact: bool = False) -> dict:
+    """
+    Applies an ordered batch of slide operations with a single load and save.
+    Each op is a dict with an 'op' key:
+        {'op': 'append', 'slide': {...}}
+        {'op': 'insert', 'index': 2, 'slide': {...}}
+        {'op': 'delete', 'index': 0}
+        {'op': 'replace', 'index': 1, 'slide': {...}}
+        {'op': 'add_image', 'title': '...', 'image': 'logo.png', 'index': 3}
+        {'op': 'add_chart', 'title': '...', 'chart_data': {...}}
+        {'op': 'add_table', 'title': '...', 'table_data': [[...], ...]}
+    'index' is optional for the add_* ops (they append by default). Table
+    slides with 'table_max_rows' are split across continuation slides; the
+    result's 'slides' counts them.
+    The whole batch is validated first; nothing is written if any op is
+    invalid or fails. When a session is open for the deck the batch is
+    applied to it instead of the file and written according to the
+    session's commit rules; a failing op rolls the session back to its
+    state before the batch. With compact=True the saved file is compacted
+    afterwards.
+    """
+    deck_path = get_deck_path(deck_name)
+    if not deck_path.exists():
+        raise FileNotFoundError(f"Deck folder '{deck_name}' does not exist.")
+
+    session = get_session(deck_name)
+    output_file = _output_path(deck_name)
+    prs = session.prs if session is not None else _load_presentation(output_file)
+
+    problems = validate_operations(deck_path, ops, len(prs.slides._sldIdLst))
+    if problems:
+        raise ValueError("Invalid operations: " + "; ".join(problems))
+
+    checkpoint = _slide_checkpoint(prs) if session is not None else None
+    results = []
+    for i, op in enumerate(ops):
+        try:
+            index, pages = _apply(prs, deck_path, op)
+        except Exception as e:
+            if checkpoint is not None:
+                _restore_slides(prs, checkpoint)
+            raise RuntimeError(f"Operation {i} ({op['op']}) failed: {e}") from e
+        results.append({"op": op["op"], "index": index, "slides": pages, "status": "ok"})
+
+    if session is not None:
+        if ops:
+            session.mark_dirty(sum(r["slides"] for r in results))
+        saved_to = None
+    else:
+        saved_to = str(_save_presentation(prs, output_file, snapshot=True))
+        if compact:
+            compact_deck(deck_name)
+
+    return {
+        "output": saved_to,
+        "session": session is not None,
+        "slide_count": len(prs.slides._sldIdLst),
+        "results": results,
+    }
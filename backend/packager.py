@@ -0,0 +1,256 @@
+"""
+Single-file distribution archives for decks.
+
+The output PPTX and the assets tree are streamed straight into a zip or
+tar.gz next to the destination, with no intermediate folder. Compressible
+members are deflated in parallel threads (zlib releases the GIL), media
+that is already compressed is stored as-is, and when a zip is repackaged
+members whose source file is unchanged are copied over without being
+decompressed or recompressed. Both shortcuts write member bytes through
+zipfile internals; if this Python's zipfile lacks them, every member is
+written through the public ZipFile.open API instead.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import copy
+import gzip
+import os
+import shutil
+import struct
+import tarfile
+import zipfile
+import zlib
+
+from .deck_manager import get_deck_path
+from .tracing import count, span
+
+ARCHIVE_FORMATS = {"zip": ".zip", "tar.gz": ".tar.gz"}
+# Formats whose bytes deflate would not shrink; stored instead of compressed
+STORED_EXTENSIONS = {
+    ".pptx", ".docx", ".xlsx", ".zip", ".gz", ".tgz", ".zst", ".7z", ".bz2", ".xz",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".mp4", ".m4v", ".mov", ".webm", ".mp3", ".m4a", ".aac", ".ogg",
+}
+COMPRESS_LEVEL = 6
+# Larger compressible files are streamed by the writer instead of held in memory by a worker
+MAX_INLINE_BYTES = 16 * 2**20
+GZIP_CHUNK_BYTES = 4 * 2**20
+COPY_BUFFER = 2**20
+# zipfile internals the raw-copy path relies on; without them every member goes through ZipFile.open
+_ZIPFILE_INTERNALS = ("_strip_extra", "_FH_FILENAME_LENGTH", "_FH_EXTRA_FIELD_LENGTH", "structFileHeader", "sizeFileHeader")
+_ZIPFILE_WRITER_INTERNALS = ("_writecheck", "start_dir", "_didModify", "fp")
+
+def _archive_members(deck_name: str) -> list:
+    """(arcname, path) pairs laid out like the package_assets folder."""
+    deck_path = get_deck_path(deck_name)
+    output_pptx = deck_path / "output" / f"{deck_name}.pptx"
+    if not output_pptx.exists():
+        raise FileNotFoundError(f"No generated deck found for '{deck_name}'")
+
+    root = f"{deck_name}_dist"
+    members = [(f"{root}/{deck_name}.pptx", output_pptx)]
+    assets_dir = deck_path / "assets"
+    if assets_dir.exists():
+        for path in sorted(p for p in assets_dir.rglob("*") if p.is_file()):
+            members.append((f"{root}/assets/{path.relative_to(assets_dir).as_posix()}", path))
+    return members
+
+def _signature(path: Path) -> bytes:
+    # Kept as the member comment so a later repackage can tell the source is unchanged
+    st = path.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}".encode("ascii")
+
+def _is_stored(path: Path) -> bool:
+    return path.suffix.lower() in STORED_EXTENSIONS
+
+def _deflate(path: Path, arcname: str) -> tuple:
+    """Worker: reads and raw-deflates one member. Returns (ZipInfo, compressed bytes)."""
+    info = zipfile.ZipInfo.from_file(path, arcname)
+    info.comment = _signature(path)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    data = path.read_bytes()
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    info.CRC = zlib.crc32(data)
+    info.file_size = len(data)
+    info.compress_size = len(compressed)
+    return info, compressed
+
+def _append_raw(zf: zipfile.ZipFile, info: zipfile.ZipInfo, chunks):
+    """Writes a member whose compressed bytes and CRC are already known."""
+    zf._writecheck(info)
+    zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+    info.header_offset = zf.fp.tell()
+    zf.fp.write(info.FileHeader(zip64))
+    for chunk in chunks:
+        zf.fp.write(chunk)
+    zf.start_dir = zf.fp.tell()
+    zf.filelist.append(info)
+    zf.NameToInfo[info.filename] = info
+    zf._didModify = True
+
+def _raw_append_supported(zf: zipfile.ZipFile) -> bool:
+    return (all(hasattr(zipfile, name) for name in _ZIPFILE_INTERNALS)
+            and all(hasattr(zf, name) for name in _ZIPFILE_WRITER_INTERNALS))
+
+def _raw_chunks(zf: zipfile.ZipFile, info: zipfile.ZipInfo):
+    """Yields a member's compressed bytes straight from its archive."""
+    zf.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, zf.fp.read(zipfile.sizeFileHeader))
+    zf.fp.seek(
+        info.header_offset + zipfile.sizeFileHeader
+        + header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH]
+    )
+    remaining = info.compress_size
+    while remaining:
+        chunk = zf.fp.read(min(COPY_BUFFER, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member '{info.filename}'")
+        remaining -= len(chunk)
+        yield chunk
+
+def _stream_member(zf: zipfile.ZipFile, path: Path, arcname: str, compress_type: int):
+    info = zipfile.ZipInfo.from_file(path, arcname)
+    info.comment = _signature(path)
+    info.compress_type = compress_type
+    with open(path, "rb") as src, zf.open(info, "w") as dest:
+        shutil.copyfileobj(src, dest, COPY_BUFFER)
+
+def _open_previous(archive: Path):
+    try:
+        return zipfile.ZipFile(archive)
+    except (OSError, zipfile.BadZipFile):
+        return None
+
+def _write_zip(members: list, archive: Path, tmp_path: Path, workers: int) -> dict:
+    stats = {"members": len(members), "reused": 0, "deflated": 0, "stored": 0}
+    previous = _open_previous(archive) if archive.exists() else None
+    try:
+        with zipfile.ZipFile(tmp_path, "w") as zf, ThreadPoolExecutor(workers) as pool:
+            raw = _raw_append_supported(zf)
+            pending = deque()
+
+            def drain(limit):
+                while len(pending) > limit:
+                    kind, item = pending.popleft()
+                    if kind == "deflate":
+                        info, data = item.result()
+                        _append_raw(zf, info, (data,))
+                        stats["deflated"] += 1
+                    elif kind == "reuse":
+                        info = copy.copy(item)
+                        info.extra = zipfile._strip_extra(info.extra, (1,))
+                        info.flag_bits &= ~0x08 # sizes are written up front, no data descriptor
+                        _append_raw(zf, info, _raw_chunks(previous, item))
+                        stats["reused"] += 1
+                    else:
+                        path, arcname, compress_type = item
+                        _stream_member(zf, path, arcname, compress_type)
+                        stats["stored" if compress_type == zipfile.ZIP_STORED else "deflated"] += 1
+
+            for arcname, path in members:
+                old = previous.NameToInfo.get(arcname) if previous else None
+                if raw and old is not None and old.comment == _signature(path):
+                    pending.append(("reuse", old))
+                elif _is_stored(path):
+                    pending.append(("stream", (path, arcname, zipfile.ZIP_STORED)))
+                elif not raw or path.stat().st_size > MAX_INLINE_BYTES:
+                    pending.append(("stream", (path, arcname, zipfile.ZIP_DEFLATED)))
+                else:
+                    pending.append(("deflate", pool.submit(_deflate, path, arcname)))
+                # Bound the compressed data held in memory while keeping workers busy
+                drain(workers * 2)
+            drain(0)
+    finally:
+        if previous:
+            previous.close()
+    return stats
+
+class _ParallelGzipWriter:
+    """
+    File object that gzips what is written to it in fixed-size chunks on a
+    thread pool. Each chunk becomes its own gzip member; concatenated members
+    are a valid gzip stream that gzip/tar read as one file.
+    """
+
+    def __init__(self, fileobj, pool: ThreadPoolExecutor, window: int):
+        self.fileobj = fileobj
+        self.pool = pool
+        self.window = window
+        self.level = COMPRESS_LEVEL
+        self.buffer = bytearray()
+        self.pending = deque()
+        self.offset = 0
+
+    def write(self, data) -> int:
+        self.buffer += data
+        self.offset += len(data)
+        if len(self.buffer) >= GZIP_CHUNK_BYTES:
+            self._submit()
+        return len(data)
+
+    def tell(self) -> int:
+        return self.offset
+
+    def set_level(self, level: int):
+        # Chunks are compressed at one level, so cut the current one at the switch
+        if level != self.level:
+            self._submit()
+            self.level = level
+
+    def _submit(self):
+        if self.buffer:
+            self.pending.append(self.pool.submit(gzip.compress, bytes(self.buffer), self.level, mtime=0))
+            self.buffer = bytearray()
+        while len(self.pending) > self.window:
+            self.fileobj.write(self.pending.popleft().result())
+
+    def close(self):
+        self._submit()
+        while self.pending:
+            self.fileobj.write(self.pending.popleft().result())
+
+def _write_tar_gz(members: list, tmp_path: Path, workers: int) -> dict:
+    stats = {"members": len(members), "reused": 0, "deflated": 0, "stored": 0}
+    with open(tmp_path, "wb") as f, ThreadPoolExecutor(workers) as pool:
+        writer = _ParallelGzipWriter(f, pool, workers * 2)
+        with tarfile.open(fileobj=writer, mode="w", format=tarfile.PAX_FORMAT) as tar:
+            for arcname, path in members:
+                stored = _is_stored(path)
+                writer.set_level(0 if stored else COMPRESS_LEVEL)
+                tar.add(path, arcname)
+                stats["stored" if stored else "deflated"] += 1
+        writer.close()
+    return stats
+
+def package_archive(deck_name: str, target_dir: Path, fmt: str = "zip", workers: int = None) -> dict:
+    """
+    Streams a deck's PPTX and assets into target_dir/<deck>_dist.<zip|tar.gz>.
+    Repackaging a zip reuses the compressed bytes of members whose source
+    file is unchanged; tar.gz archives are always rewritten. The archive is
+    replaced atomically. Returns the archive path and member counts.
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format '{fmt}'. Use one of {', '.join(ARCHIVE_FORMATS)}.")
+    members = _archive_members(deck_name)
+    workers = workers or os.cpu_count() or 1
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    archive = target_dir / f"{deck_name}_dist{ARCHIVE_FORMATS[fmt]}"
+    tmp_path = archive.with_name(f"{archive.name}.tmp")
+    try:
+        with span("package_archive", format=fmt, members=len(members)):
+            if fmt == "zip":
+                stats = _write_zip(members, archive, tmp_path, workers)
+            else:
+                stats = _write_tar_gz(members, tmp_path, workers)
+        os.replace(tmp_path, archive)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    stats.update(archive=str(archive), format=fmt, bytes=archive.stat().st_size)
+    count("bytes_written", stats["bytes"])
+    count("archive_members_reused", stats["reused"])
+    return stats
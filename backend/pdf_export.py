@@ -0,0 +1,311 @@
+"""
+PDF export through a locally installed headless LibreOffice.
+
+Conversions run on a fixed number of converter slots. Each slot keeps one
+long-lived soffice process listening on a local UNO socket, with its own
+user profile, and hands it every job, so LibreOffice starts once per slot
+rather than once per deck. This needs LibreOffice's Python bindings
+(`import uno`); without them each job falls back to a one-shot
+`soffice --convert-to` run on the slot's profile. Profiles live in a
+per-process temporary directory, so separate processes never contend for
+a profile lock. Jobs queue for a free slot, are killed after a timeout and
+retried on a reset profile. A deck is not converted again while its PPTX
+hash matches the one its current PDF was made from.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import atexit
+import hashlib
+import json
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+from .deck_manager import get_deck_path
+
+CONVERTER_ENV = "FSP_SOFFICE"
+CONVERTER_NAMES = ("soffice", "libreoffice")
+EXPORT_STATE_FILE = "pdf_export.json"
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_RETRIES = 1
+PROFILE_PREFIX = "fsp_soffice_"
+LISTENER_START_TIMEOUT = 60.0
+PDF_FILTER = "impress_pdf_Export"
+SOFFICE_FLAGS = ["--headless", "--invisible", "--nologo", "--norestore", "--nodefault", "--nolockcheck"]
+
+class ConverterNotFoundError(RuntimeError):
+    pass
+
+def find_converter() -> str:
+    """Path of the LibreOffice binary, from $FSP_SOFFICE or PATH."""
+    configured = os.environ.get(CONVERTER_ENV)
+    if configured:
+        if shutil.which(configured):
+            return shutil.which(configured)
+        raise ConverterNotFoundError(f"{CONVERTER_ENV} points to '{configured}', which is not an executable.")
+    for name in CONVERTER_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise ConverterNotFoundError(
+        "PDF export needs LibreOffice, but neither 'soffice' nor 'libreoffice' is on PATH. "
+        f"Install LibreOffice or set {CONVERTER_ENV} to its soffice binary."
+    )
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _load_state(deck_path: Path) -> dict:
+    try:
+        with open(deck_path / EXPORT_STATE_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_state(deck_path: Path, state: dict):
+    tmp_path = deck_path / f"{EXPORT_STATE_FILE}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=4)
+    os.replace(tmp_path, deck_path / EXPORT_STATE_FILE)
+
+def _start_process(cmd: list, output=subprocess.PIPE) -> subprocess.Popen:
+    """Starts soffice in its own process group so a kill also reaches the soffice.bin it launches."""
+    if os.name == "nt":
+        return subprocess.Popen(cmd, stdout=output, stderr=output, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+    return subprocess.Popen(cmd, stdout=output, stderr=output, start_new_session=True)
+
+def _kill_process(proc: subprocess.Popen):
+    """Kills a process started by _start_process together with its children."""
+    if proc.poll() is not None:
+        return
+    if os.name == "nt":
+        # taskkill /T also ends the soffice.bin child of the soffice.exe launcher
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _uno():
+    """LibreOffice's Python bindings, or None when they are not importable."""
+    try:
+        import uno
+    except ImportError:
+        return None
+    return uno
+
+class _Listener:
+    """A soffice process accepting UNO connections on a local port, converting one deck at a time."""
+
+    def __init__(self, converter: str, profile: Path):
+        self.uno = _uno()
+        self.port = _free_port()
+        self.proc = _start_process([
+            converter, f"-env:UserInstallation={profile.as_uri()}", *SOFFICE_FLAGS,
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+        ], output=subprocess.DEVNULL)
+        self.desktop = self._connect()
+
+    def _connect(self):
+        local = self.uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+        url = f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        deadline = time.monotonic() + LISTENER_START_TIMEOUT
+        while True:
+            try:
+                ctx = resolver.resolve(url)
+                return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+            except Exception:
+                # NoConnectException until soffice has opened its socket
+                if self.proc.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"soffice listener did not start on port {self.port}")
+                time.sleep(0.1)
+
+    def _props(self, **values) -> tuple:
+        from com.sun.star.beans import PropertyValue
+        props = []
+        for name, value in values.items():
+            prop = PropertyValue()
+            prop.Name, prop.Value = name, value
+            props.append(prop)
+        return tuple(props)
+
+    def convert(self, pptx: Path, pdf: Path, timeout: float):
+        # A stuck conversion cannot be interrupted over UNO; killing soffice makes the call fail
+        timed_out = threading.Event()
+
+        def expire():
+            timed_out.set()
+            _kill_process(self.proc)
+
+        watchdog = threading.Timer(timeout, expire)
+        watchdog.start()
+        try:
+            doc = self.desktop.loadComponentFromURL(
+                self.uno.systemPathToFileUrl(str(pptx.resolve())), "_blank", 0, self._props(Hidden=True)
+            )
+            try:
+                doc.storeToURL(self.uno.systemPathToFileUrl(str(pdf.resolve())), self._props(FilterName=PDF_FILTER))
+            finally:
+                doc.close(True)
+        except Exception as e:
+            if timed_out.is_set():
+                raise TimeoutError(f"soffice did not finish converting '{pptx.name}' within {timeout}s") from e
+            raise RuntimeError(f"soffice failed to convert '{pptx.name}': {e}") from e
+        finally:
+            watchdog.cancel()
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def stop(self):
+        _kill_process(self.proc)
+        self.proc.wait()
+
+class ConverterPool:
+    """
+    Runs soffice conversions on a bounded set of slots, each with a
+    persistent user profile and, when the UNO bindings are available, a
+    persistent soffice listener. Safe to share between threads; close()
+    stops the listeners and removes the profiles (also done at exit).
+    """
+
+    def __init__(self, workers: int = None, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 profile_root: Path = None):
+        self.converter = find_converter()
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.retries = retries
+        self.persistent = _uno() is not None
+        self._owns_profile_root = profile_root is None
+        self.profile_root = Path(tempfile.mkdtemp(prefix=PROFILE_PREFIX)) if profile_root is None else profile_root
+        self._listeners = {}
+        self._slots = queue.Queue()
+        for slot in range(self.workers):
+            self._slots.put(slot)
+        atexit.register(self.close)
+
+    def _profile(self, slot: int) -> Path:
+        return self.profile_root / f"slot_{slot}"
+
+    def _listener(self, slot: int) -> _Listener:
+        listener = self._listeners.get(slot)
+        if listener is None or not listener.alive():
+            listener = self._listeners[slot] = _Listener(self.converter, self._profile(slot))
+        return listener
+
+    def _reset(self, slot: int):
+        """Stops the slot's listener and deletes its profile after a failed job."""
+        listener = self._listeners.pop(slot, None)
+        if listener is not None:
+            listener.stop()
+        shutil.rmtree(self._profile(slot), ignore_errors=True)
+
+    def _run(self, slot: int, pptx: Path, outdir: Path):
+        produced = outdir / f"{pptx.stem}.pdf"
+        if self.persistent:
+            self._listener(slot).convert(pptx, produced, self.timeout)
+            return produced
+
+        cmd = [
+            self.converter, f"-env:UserInstallation={self._profile(slot).as_uri()}", *SOFFICE_FLAGS,
+            "--convert-to", "pdf", "--outdir", str(outdir), str(pptx),
+        ]
+        proc = _start_process(cmd)
+        try:
+            _, stderr = proc.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process(proc)
+            proc.communicate()
+            raise TimeoutError(f"soffice did not finish converting '{pptx.name}' within {self.timeout}s")
+        if proc.returncode != 0 or not produced.exists():
+            raise RuntimeError(
+                f"soffice failed to convert '{pptx.name}' (exit {proc.returncode}): "
+                f"{stderr.decode(errors='replace').strip()[-500:]}"
+            )
+        return produced
+
+    def convert(self, pptx: Path, pdf: Path) -> int:
+        """Converts pptx to pdf, waiting for a free slot. Returns the number of attempts used."""
+        slot = self._slots.get()
+        try:
+            for attempt in range(1, self.retries + 2):
+                with tempfile.TemporaryDirectory(dir=pdf.parent, prefix=".pdf_export_") as outdir:
+                    try:
+                        produced = self._run(slot, pptx, Path(outdir))
+                        os.replace(produced, pdf)
+                        return attempt
+                    except (TimeoutError, RuntimeError):
+                        # A killed or crashed run can leave the profile locked or half written
+                        self._reset(slot)
+                        if attempt > self.retries:
+                            raise
+        finally:
+            self._slots.put(slot)
+
+    def close(self):
+        """Stops the slot listeners and removes the profiles this pool created."""
+        for slot in list(self._listeners):
+            self._listeners.pop(slot).stop()
+        if self._owns_profile_root:
+            shutil.rmtree(self.profile_root, ignore_errors=True)
+
+    def export_deck(self, deck_name: str, force: bool = False) -> dict:
+        """
+        Exports a deck's PPTX to output/<deck>.pdf unless the existing PDF was
+        made from a PPTX with the same hash.
+        """
+        deck_path = get_deck_path(deck_name)
+        pptx = deck_path / "output" / f"{deck_name}.pptx"
+        pdf = pptx.with_suffix(".pdf")
+        if not pptx.exists():
+            raise FileNotFoundError(f"No generated deck found for '{deck_name}'")
+
+        pptx_hash = _file_sha256(pptx)
+        state = _load_state(deck_path)
+        if not force and pdf.exists() and state.get("pptx_sha256") == pptx_hash:
+            return {"deck": deck_name, "pdf": str(pdf), "skipped": True, "attempts": 0, "seconds": 0.0}
+
+        start = time.perf_counter()
+        attempts = self.convert(pptx, pdf)
+        _write_state(deck_path, {"pptx_sha256": pptx_hash, "pdf_bytes": pdf.stat().st_size})
+        return {"deck": deck_name, "pdf": str(pdf), "skipped": False, "attempts": attempts,
+                "seconds": round(time.perf_counter() - start, 3)}
+
+    def export_many(self, deck_names: list, force: bool = False) -> list:
+        """Exports several decks concurrently, one job per slot. Failures are reported per deck."""
+        def job(deck_name):
+            try:
+                return dict(self.export_deck(deck_name, force), ok=True)
+            except Exception as e:
+                return {"deck": deck_name, "ok": False, "error": str(e)}
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            return list(pool.map(job, deck_names))
+
+_default_pool = None
+
+def default_pool() -> ConverterPool:
+    """Process-wide converter pool, created on first use."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ConverterPool()
+    return _default_pool
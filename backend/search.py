@@ -0,0 +1,303 @@
+"""
+Full-text search over the slides of every deck, kept in the decks root.
+
+The index is an SQLite FTS5 database with one row per slide (title, body
+text, table cells, chart titles, series names and categories) and one row
+per deck (name and config.json metadata). It is updated whenever a deck is
+saved: each slide is keyed by the checksums of its XML and chart parts, and only slides
+whose hash is new to the deck are parsed and re-indexed; moved slides just
+get their index updated. It can be rebuilt from disk at any time:
+    python -m backend.search rebuild
+    python -m backend.search query "q3 revenue"
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import warnings
+import zipfile
+
+from lxml import etree
+
+from . import deck_manager
+from .opc import NS, qn, read_rels, slide_part_names
+from .tracing import count, span
+
+SEARCH_FILE = "search.sqlite3"
+RT_CHART = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/chart"
+TITLE_TYPES = ("title", "ctrTitle")
+# bm25 column weights for deck, slide_index (unindexed), title, body, tables, charts
+COLUMN_WEIGHTS = (0.0, 0.0, 10.0, 1.0, 1.0, 3.0)
+SNIPPET_TOKENS = 12
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slides (
+    deck TEXT NOT NULL,
+    slide_index INTEGER NOT NULL,
+    slide_hash TEXT NOT NULL,
+    text_id INTEGER NOT NULL,
+    PRIMARY KEY (deck, slide_index)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS slide_text USING fts5(
+    deck UNINDEXED, slide_index UNINDEXED, title, body, tables, charts
+);
+CREATE TABLE IF NOT EXISTS decks (
+    deck TEXT PRIMARY KEY,
+    meta_hash TEXT NOT NULL,
+    text_id INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS deck_text USING fts5(deck UNINDEXED, name, metadata);
+"""
+
+def search_path():
+    return deck_manager.DECKS_DIR / SEARCH_FILE
+
+def _connect(backfill: bool = True) -> sqlite3.Connection:
+    deck_manager.DECKS_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(search_path(), timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        created = not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'slides'").fetchone()
+        conn.executescript(_SCHEMA)
+        if created and backfill:
+            # As with the catalog, a new index starts out covering the decks already on disk
+            with conn:
+                _index_all(conn)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+def _safely(fn, *args):
+    # Like the catalog, the index must not fail the deck operation that triggered it
+    try:
+        fn(*args)
+    except (sqlite3.Error, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+        warnings.warn(f"Search index not updated ({e}); run 'python -m backend.search rebuild'.")
+
+def _text(elem) -> str:
+    """Text of the a:p paragraphs under elem, one line per paragraph."""
+    lines = ("".join(t.text or "" for t in p.iter(qn("a:t"))) for p in elem.iter(qn("a:p")))
+    return "\n".join(line for line in lines if line)
+
+def _chart_text(zf: zipfile.ZipFile, chart_part: str) -> str:
+    root = etree.fromstring(zf.read(chart_part))
+    words = [_text(title) for title in root.iter(qn("c:title"))]
+    for ser in root.iter(qn("c:ser")):
+        words.extend(v.text for v in ser.iterfind("c:tx//c:v", NS))
+    # Categories repeat per series; keep the first series' labels only
+    first = next(root.iter(qn("c:ser")), None)
+    if first is not None:
+        words.extend(v.text for v in first.iterfind("c:cat//c:v", NS))
+    return " ".join(w for w in words if w)
+
+def _slide_charts(zf: zipfile.ZipFile, part_name: str) -> list:
+    return sorted(
+        target for reltype, target, external in read_rels(zf, part_name).values()
+        if reltype == RT_CHART and not external and target in zf.NameToInfo
+    )
+
+def _slide_hash(zf: zipfile.ZipFile, part_name: str, charts: list) -> str:
+    # CRC and size from the zip directory identify the content without decompressing it
+    digest = hashlib.sha256()
+    for name in [part_name] + charts:
+        info = zf.getinfo(name)
+        digest.update(f"{info.CRC}:{info.file_size};".encode("ascii"))
+    return digest.hexdigest()
+
+def _slide_fields(zf: zipfile.ZipFile, part_name: str, charts: list) -> dict:
+    """Extracts the searchable text of one slide by column."""
+    root = etree.fromstring(zf.read(part_name))
+    title, body = [], []
+    for sp in root.iter(qn("p:sp")):
+        ph = sp.find("p:nvSpPr/p:nvPr/p:ph", NS)
+        (title if ph is not None and ph.get("type") in TITLE_TYPES else body).append(_text(sp))
+    for pic in root.iter(qn("p:pic")):
+        body.append(pic.find("p:nvPicPr/p:cNvPr", NS).get("descr", ""))
+    tables = [
+        " ".join(_text(tc) for tc in tbl.iter(qn("a:tc")))
+        for tbl in root.iter(qn("a:tbl"))
+    ]
+    body = [text for text in body if text]
+    # Slides without a title placeholder (image slides) carry their title in a text box
+    if not any(title) and body:
+        title = [body.pop(0)]
+    return {
+        "title": "\n".join(t for t in title if t),
+        "body": "\n".join(body),
+        "tables": "\n".join(tables),
+        "charts": "\n".join(_chart_text(zf, chart) for chart in charts),
+    }
+
+def _flatten(value) -> list:
+    if isinstance(value, dict):
+        return [w for k, v in value.items() for w in [str(k)] + _flatten(v)]
+    if isinstance(value, list):
+        return [w for item in value for w in _flatten(item)]
+    return [] if value is None else [str(value)]
+
+def _index_metadata(conn: sqlite3.Connection, deck_name: str):
+    try:
+        with open(deck_manager.get_deck_path(deck_name) / "config.json", "r") as f:
+            metadata = json.load(f).get("metadata", {})
+    except (OSError, ValueError):
+        metadata = {}
+    text = " ".join(_flatten(metadata))
+    meta_hash = hashlib.sha256(f"{deck_name}\0{text}".encode("utf-8")).hexdigest()
+    row = conn.execute("SELECT meta_hash, text_id FROM decks WHERE deck = ?", (deck_name,)).fetchone()
+    if row is not None and row["meta_hash"] == meta_hash:
+        return
+    if row is not None:
+        conn.execute("DELETE FROM deck_text WHERE rowid = ?", (row["text_id"],))
+    text_id = conn.execute("INSERT INTO deck_text (deck, name, metadata) VALUES (?, ?, ?)",
+                           (deck_name, deck_name.replace("_", " "), text)).lastrowid
+    conn.execute("INSERT OR REPLACE INTO decks (deck, meta_hash, text_id) VALUES (?, ?, ?)",
+                 (deck_name, meta_hash, text_id))
+
+def _index_slides(conn: sqlite3.Connection, deck_name: str) -> int:
+    """Brings the deck's slide rows in line with its output file. Returns the number of slides parsed."""
+    previous = {}
+    for row in conn.execute("SELECT slide_index, slide_hash, text_id FROM slides WHERE deck = ?", (deck_name,)):
+        previous.setdefault(row["slide_hash"], []).append((row["slide_index"], row["text_id"]))
+
+    current = []
+    output = deck_manager.get_deck_path(deck_name) / "output" / f"{deck_name}.pptx"
+    parsed = 0
+    if output.exists():
+        with zipfile.ZipFile(output) as zf:
+            for index, part_name in enumerate(slide_part_names(zf)):
+                charts = _slide_charts(zf, part_name)
+                slide_hash = _slide_hash(zf, part_name, charts)
+                reusable = previous.get(slide_hash)
+                if reusable:
+                    old_index, text_id = reusable.pop()
+                    if old_index != index:
+                        conn.execute("UPDATE slide_text SET slide_index = ? WHERE rowid = ?", (index, text_id))
+                else:
+                    fields = _slide_fields(zf, part_name, charts)
+                    text_id = conn.execute(
+                        "INSERT INTO slide_text (deck, slide_index, title, body, tables, charts) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (deck_name, index, fields["title"], fields["body"], fields["tables"], fields["charts"]),
+                    ).lastrowid
+                    parsed += 1
+                current.append((deck_name, index, slide_hash, text_id))
+
+    for leftovers in previous.values():
+        for _, text_id in leftovers:
+            conn.execute("DELETE FROM slide_text WHERE rowid = ?", (text_id,))
+    conn.execute("DELETE FROM slides WHERE deck = ?", (deck_name,))
+    conn.executemany("INSERT INTO slides (deck, slide_index, slide_hash, text_id) VALUES (?, ?, ?, ?)", current)
+    return parsed
+
+def index_deck(deck_name: str):
+    """Re-indexes a deck's metadata and any slides that changed since it was last indexed."""
+    def update():
+        with span("search_index"):
+            conn = _connect()
+            try:
+                with conn:
+                    _index_metadata(conn, deck_name)
+                    count("slides_indexed", _index_slides(conn, deck_name))
+            finally:
+                conn.close()
+    _safely(update)
+
+def remove_deck_index(deck_name: str):
+    """Drops a deck and its slides from the index."""
+    def update():
+        conn = _connect()
+        try:
+            with conn:
+                for table, text_table in (("slides", "slide_text"), ("decks", "deck_text")):
+                    conn.execute(f"DELETE FROM {text_table} WHERE rowid IN "
+                                 f"(SELECT text_id FROM {table} WHERE deck = ?)", (deck_name,))
+                    conn.execute(f"DELETE FROM {table} WHERE deck = ?", (deck_name,))
+        finally:
+            conn.close()
+    _safely(update)
+
+def _index_all(conn: sqlite3.Connection) -> int:
+    names = []
+    if deck_manager.DECKS_DIR.exists():
+        names = sorted(d.name for d in deck_manager.DECKS_DIR.iterdir() if d.is_dir())
+    for name in names:
+        _index_metadata(conn, name)
+        _index_slides(conn, name)
+    return len(names)
+
+def rebuild_index() -> int:
+    """Re-indexes every deck folder on disk from scratch."""
+    conn = _connect(backfill=False)
+    try:
+        with conn:
+            for table in ("slides", "slide_text", "decks", "deck_text"):
+                conn.execute(f"DELETE FROM {table}")
+            return _index_all(conn)
+    finally:
+        conn.close()
+
+def ensure_index():
+    """Builds the index from disk the first time it is needed."""
+    _connect().close()
+
+def _match_expression(query: str) -> str:
+    """Turns free text into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r"\w+", query.lower())
+    return " ".join(f'"{word}"*' for word in words)
+
+def search_slides(query: str, limit: int = 20, offset: int = 0, deck_name: str = None) -> dict:
+    """
+    Ranks slides matching every word of query (title matches weigh most,
+    then charts), optionally within one deck. Decks whose name or metadata
+    match (within the same deck filter) are listed separately.
+    """
+    match = _match_expression(query)
+    result = {"query": query, "total": 0, "limit": limit, "offset": offset, "results": [], "decks": []}
+    if not match:
+        return result
+
+    deck_filter, params = "", [match]
+    if deck_name:
+        deck_filter = "AND deck = ?"
+        params.append(deck_name)
+    weights = ", ".join(str(w) for w in COLUMN_WEIGHTS)
+
+    conn = _connect()
+    try:
+        result["total"] = conn.execute(
+            f"SELECT COUNT(*) FROM slide_text WHERE slide_text MATCH ? {deck_filter}", params
+        ).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT deck, slide_index, title, bm25(slide_text, {weights}) AS score, "
+            f"snippet(slide_text, -1, '[', ']', '...', {SNIPPET_TOKENS}) AS snippet "
+            f"FROM slide_text WHERE slide_text MATCH ? {deck_filter} "
+            "ORDER BY score LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        deck_rows = conn.execute(
+            f"SELECT deck, bm25(deck_text) AS score FROM deck_text WHERE deck_text MATCH ? {deck_filter} "
+            "ORDER BY score LIMIT ?",
+            params + [limit],
+        ).fetchall()
+    finally:
+        conn.close()
+
+    # bm25 scores are negative, lower is better; report them as positive relevance
+    result["results"] = [
+        {"deck": row["deck"], "slide_index": row["slide_index"], "title": row["title"],
+         "score": round(-row["score"], 4), "snippet": row["snippet"]}
+        for row in rows
+    ]
+    result["decks"] = [{"deck": row["deck"], "score": round(-row["score"], 4)} for row in deck_rows]
+    return result
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["rebuild"]:
+        print(f"Search index rebuilt: {rebuild_index()} decks indexed at {search_path()}")
+    elif sys.argv[1:2] == ["query"] and len(sys.argv) > 2:
+        print(json.dumps(search_slides(" ".join(sys.argv[2:])), indent=2))
+    else:
+        print("Usage: python -m backend.search rebuild | query <words>")
@@ -0,0 +1,303 @@
+"""
+Asynchronous JSON-lines front-end for SlideDeckMCPTools over stdio.
+
+Each input line is a request {"id": ..., "method": ..., "params": {...}}
+and each output line a response carrying the same id; responses can
+arrive out of order. A method is any SlideDeckMCPTools tool, or one of
+job_status, list_jobs, list_tools and shutdown.
+
+Long-running tools return a job id straight away ({"job_id": ..., "status":
+"queued"}) and are polled with job_status; pass "wait": true to get the
+result in the response instead. Writes to a deck are serialized while
+reads of it, and work on other decks, run in parallel. When max_queue jobs
+are already pending, new work is rejected with "busy" until some finish.
+
+    python -m backend.server --workers 4 --max-queue 64
+"""
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from . import deck_manager
+from .batch import _init_worker, group_jobs, run_deck_jobs
+from .mcp_tools import SlideDeckMCPTools
+from .session import get_session
+
+# Tools answered with a job id unless the request sets "wait"
+JOB_TOOLS = {
+    "generate_slides", "validate_deck", "batch_build_and_validate", "apply_operations", "import_slides",
+    "compact_deck", "distribute_deck", "export_pdf", "export_pdfs", "rebuild_deck_catalog", "rebuild_search_index",
+    "preview_slides", "preview_deck",
+}
+# CPU-bound tools that do not touch in-memory sessions run in worker processes,
+# unless they write a deck with an open session (which must be reloaded here)
+PROCESS_TOOLS = {"generate_slides", "validate_deck", "distribute_deck"}
+# Tools that only read the deck they name
+READ_TOOLS = {
+    "validate_deck", "asset_report", "distribute_deck", "export_pdf", "export_pdfs",
+    "preview_slides", "preview_deck", "list_layouts", "search_slides", "list_snapshots", "diff_snapshots",
+}
+FINISHED_JOBS_KEPT = 1000
+
+class BusyError(RuntimeError):
+    pass
+
+def _tools() -> dict:
+    return {
+        name: fn for name, fn in inspect.getmembers(SlideDeckMCPTools, inspect.isfunction)
+        if not name.startswith("_")
+    }
+
+def _call_tool(name: str, params: dict) -> str:
+    return getattr(SlideDeckMCPTools, name)(**params)
+
+def _deck_locks(tool: str, params: dict) -> list:
+    """(deck, write) pairs a call must hold, in a fixed order so calls cannot deadlock."""
+    locks = {}
+    if tool == "clone_existing_deck":
+        locks[params["source_deck"]] = False
+        locks[params["target_deck"]] = True
+    elif tool == "import_slides":
+        for entry in params["slides"]:
+            if isinstance(entry, dict) and entry.get("source_deck"):
+                locks.setdefault(entry["source_deck"], False)
+        locks[params["deck_name"]] = True
+    elif tool == "export_pdfs":
+        locks.update((deck, False) for deck in params["deck_names"])
+    elif tool == "batch_build_and_validate":
+        jobs = deck_manager.list_decks() if params["jobs"] == ["*"] else params["jobs"]
+        for job in jobs:
+            if isinstance(job, str):
+                locks.setdefault(job, False)
+            elif isinstance(job, dict) and job.get("deck_name"):
+                locks[job["deck_name"]] = True
+    elif "deck_name" in params:
+        locks[params["deck_name"]] = tool not in READ_TOOLS
+    return sorted(locks.items())
+
+class DeckLock:
+    """Readers-writer lock for one deck. Waiting writers hold back new readers."""
+
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    async def acquire(self, write: bool):
+        async with self._cond:
+            if write:
+                self._writers_waiting += 1
+                try:
+                    await self._cond.wait_for(lambda: not self._writer and not self._readers)
+                finally:
+                    self._writers_waiting -= 1
+                self._writer = True
+            else:
+                await self._cond.wait_for(lambda: not self._writer and not self._writers_waiting)
+                self._readers += 1
+
+    async def release(self, write: bool):
+        async with self._cond:
+            if write:
+                self._writer = False
+            else:
+                self._readers -= 1
+            self._cond.notify_all()
+
+class DeckServer:
+    """Runs tool calls as jobs with per-deck locking and a bounded number of pending jobs."""
+
+    def __init__(self, workers: int = None, max_queue: int = 64):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.tools = _tools()
+        self.jobs = OrderedDict()
+        self.locks = defaultdict(DeckLock)
+        self._ids = itertools.count(1)
+        self._slots = asyncio.Semaphore(self.workers)
+        self._threads = ThreadPoolExecutor(self.workers)
+        # Spawned, not forked: the server process already runs threads
+        self._processes = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                              initializer=_init_worker,
+                                              initargs=(str(deck_manager.DECKS_DIR),))
+
+    def close(self):
+        self._threads.shutdown(wait=True)
+        self._processes.shutdown(wait=True)
+
+    @property
+    def pending(self) -> int:
+        return sum(job["status"] in ("queued", "running") for job in self.jobs.values())
+
+    def _job_view(self, job: dict) -> dict:
+        view = {k: v for k, v in job.items() if k != "task"}
+        end = job["finished_at"] or time.time()
+        view["elapsed"] = round(end - (job["started_at"] or end), 3)
+        return view
+
+    def _forget_old_jobs(self):
+        finished = [jid for jid, job in self.jobs.items() if job["status"] in ("done", "failed")]
+        for jid in finished[:max(0, len(finished) - FINISHED_JOBS_KEPT)]:
+            del self.jobs[jid]
+
+    async def _execute(self, job: dict, params: dict):
+        loop = asyncio.get_running_loop()
+        tool = job["tool"]
+        if tool == "batch_build_and_validate":
+            return await self._run_batch(job, params)
+        session_open = tool not in READ_TOOLS and get_session(params.get("deck_name")) is not None
+        if tool in PROCESS_TOOLS and not session_open:
+            return await loop.run_in_executor(self._processes, _call_tool, tool, params)
+        return await loop.run_in_executor(self._threads, _call_tool, tool, params)
+
+    async def _run_batch(self, job: dict, params: dict) -> str:
+        # Same as the tool, but on the server's worker processes and reporting progress as decks finish
+        loop = asyncio.get_running_loop()
+        jobs = deck_manager.list_decks() if params["jobs"] == ["*"] else params["jobs"]
+        job["progress"] = {"done": 0, "total": len(jobs)}
+        results = []
+        futures = [loop.run_in_executor(self._processes, run_deck_jobs, group) for group in group_jobs(jobs)]
+        for future in asyncio.as_completed(futures):
+            results.extend(await future)
+            job["progress"] = {"done": len(results), "total": len(jobs)}
+        return json.dumps(results, indent=2)
+
+    async def _run_job(self, job: dict, params: dict):
+        held = []
+        try:
+            for deck, write in _deck_locks(job["tool"], params):
+                await self.locks[deck].acquire(write)
+                held.append((deck, write))
+            async with self._slots:
+                job["status"] = "running"
+                job["started_at"] = time.time()
+                result = await self._execute(job, params)
+            job["result"] = result
+            job["status"] = "failed" if isinstance(result, str) and result.startswith("Error:") else "done"
+        except Exception as e:
+            job["result"] = f"Error: {type(e).__name__}: {e}"
+            job["status"] = "failed"
+        finally:
+            for deck, write in reversed(held):
+                await self.locks[deck].release(write)
+            job["finished_at"] = time.time()
+            self._forget_old_jobs()
+
+    def submit(self, tool: str, params: dict) -> dict:
+        """Queues a tool call and returns its job record. Raises if the queue is full."""
+        if self.pending >= self.max_queue:
+            raise BusyError(f"{self.pending} jobs pending (max {self.max_queue}); retry later")
+        job = {
+            "job_id": str(next(self._ids)), "tool": tool, "status": "queued", "progress": None,
+            "result": None, "submitted_at": time.time(), "started_at": None, "finished_at": None,
+        }
+        job["task"] = asyncio.get_running_loop().create_task(self._run_job(job, params))
+        self.jobs[job["job_id"]] = job
+        return job
+
+    async def handle(self, request: dict) -> dict:
+        """Answers one request."""
+        method = request.get("method")
+        params = request.get("params") or {}
+        response = {"id": request.get("id")}
+
+        if method == "job_status":
+            job = self.jobs.get(str(params.get("job_id")))
+            if job is None:
+                return dict(response, error=f"Unknown job '{params.get('job_id')}'")
+            return dict(response, result=self._job_view(job))
+        if method == "list_jobs":
+            return dict(response, result=[self._job_view(job) for job in self.jobs.values()])
+        if method == "list_tools":
+            return dict(response, result={
+                name: {"doc": inspect.getdoc(fn), "job": name in JOB_TOOLS}
+                for name, fn in self.tools.items()
+            })
+
+        if method not in self.tools:
+            return dict(response, error=f"Unknown method '{method}'")
+        try:
+            inspect.signature(self.tools[method]).bind(**params)
+            job = self.submit(method, params)
+        except TypeError as e:
+            return dict(response, error=f"Invalid params for '{method}': {e}")
+        except BusyError as e:
+            return dict(response, error=str(e), busy=True)
+
+        if method in JOB_TOOLS and not request.get("wait"):
+            return dict(response, job_id=job["job_id"], status=job["status"])
+        await job["task"]
+        return dict(response, result=job["result"], job_id=job["job_id"])
+
+async def serve_stdio(server: DeckServer, reader=None, writer=None):
+    """Reads requests line by line and writes responses until EOF or a shutdown request."""
+    reader = reader or sys.stdin
+    writer = writer or sys.stdout
+    write_lock = asyncio.Lock()
+    tasks = set()
+
+    async def respond(request):
+        try:
+            response = await server.handle(request)
+        except Exception as e:
+            response = {"id": request.get("id"), "error": f"{type(e).__name__}: {e}"}
+        async with write_lock:
+            writer.write(json.dumps(response) + "\n")
+            writer.flush()
+
+    while True:
+        line = await asyncio.to_thread(reader.readline)
+        if not line:
+            break
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            async with write_lock:
+                writer.write(json.dumps({"id": None, "error": f"Bad request: {e}"}) + "\n")
+                writer.flush()
+            continue
+        if request.get("method") == "shutdown":
+            break
+        task = asyncio.create_task(respond(request))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    # Let accepted work finish before exiting
+    if tasks:
+        await asyncio.gather(*tasks)
+    pending_jobs = [job["task"] for job in server.jobs.values() if not job["task"].done()]
+    if pending_jobs:
+        await asyncio.gather(*pending_jobs)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve SlideDeckMCPTools as JSON lines over stdio.")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent jobs (default: CPU count)")
+    parser.add_argument("--max-queue", type=int, default=64, help="Pending jobs before requests are refused")
+    args = parser.parse_args(argv)
+
+    async def run():
+        server = DeckServer(args.workers, args.max_queue)
+        try:
+            await serve_stdio(server)
+        finally:
+            server.close()
+
+    asyncio.run(run())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+from pathlib import Path
+import time
+
+from .compaction import compact_deck
+from .deck_manager import get_deck_path
+from .generator import (
+    _build_image_slide, _build_slide, _load_presentation, _output_path,
+    _remove_slide, _save_presentation,
+)
+from .snapshots import record_snapshot
+
+DEFAULT_MAX_DIRTY_SLIDES = 50
+DEFAULT_MAX_DIRTY_SECONDS = 30.0
+
+_SESSIONS = {}
+
+class DeckSession:
+    """
+    Keeps one deck's Presentation loaded in memory so edits skip the
+    parse/save round trip. Changes are written on commit(), or automatically
+    once max_dirty_slides edits or max_dirty_seconds have accumulated
+    (checked whenever the session is modified). A limit of 0 disables it.
+    Only explicit commits record a snapshot version, not threshold ones.
+    """
+
+    def __init__(self, deck_name: str, max_dirty_slides: int = DEFAULT_MAX_DIRTY_SLIDES,
+                 max_dirty_seconds: float = DEFAULT_MAX_DIRTY_SECONDS):
+        self.deck_name = deck_name
+        self.deck_path = get_deck_path(deck_name)
+        if not self.deck_path.exists():
+            raise FileNotFoundError(f"Deck folder '{deck_name}' does not exist.")
+
+        self.output_file = _output_path(deck_name)
+        self.max_dirty_slides = max_dirty_slides
+        self.max_dirty_seconds = max_dirty_seconds
+        self.prs = _load_presentation(self.output_file)
+        self.dirty_slides = 0
+        self.dirty_since = None
+        self.commits = 0
+
+    @property
+    def slide_count(self) -> int:
+        return len(self.prs.slides._sldIdLst)
+
+    @property
+    def dirty(self) -> bool:
+        return self.dirty_slides > 0
+
+    def append_slide(self, slide_data: dict) -> int:
+        """Appends a slide built from a spec and returns its index."""
+        _build_slide(self.prs, slide_data, default_title='New Slide',
+                     assets_dir=self.deck_path / "assets")
+        self.mark_dirty()
+        return self.slide_count - 1
+
+    def add_image_slide(self, title_text: str, image_filename: str) -> int:
+        """Appends an image slide from the deck's assets folder and returns its index."""
+        image_path = self.deck_path / "assets" / image_filename
+        if not image_path.exists():
+            raise FileNotFoundError(f"Asset '{image_filename}' not found in {self.deck_name}/assets")
+
+        _build_image_slide(self.prs, title_text, image_path, self.deck_path)
+        self.mark_dirty()
+        return self.slide_count - 1
+
+    def delete_slide(self, slide_index: int):
+        """Removes a slide by index."""
+        _remove_slide(self.prs, slide_index)
+        self.mark_dirty()
+
+    def commit(self, compact: bool = False, snapshot: bool = True) -> Path:
+        """
+        Writes pending changes to the deck output file, optionally compacting
+        it afterwards. With snapshot set the output is recorded as a snapshot
+        version, including changes written by earlier threshold commits.
+        """
+        if self.dirty or not self.output_file.exists():
+            _save_presentation(self.prs, self.output_file)
+            self.commits += 1
+            if compact:
+                compact_deck(self.deck_name)
+        if snapshot:
+            record_snapshot(self.deck_name)
+        self.dirty_slides = 0
+        self.dirty_since = None
+        return self.output_file
+
+    def reload(self):
+        """Discards pending edits and reloads the presentation from the output file."""
+        self.prs = _load_presentation(self.output_file)
+        self.dirty_slides = 0
+        self.dirty_since = None
+
+    def mark_dirty(self, count: int = 1):
+        """Records in-memory edits and commits if a dirty threshold is reached."""
+        self.dirty_slides += count
+        if self.dirty_since is None:
+            self.dirty_since = time.monotonic()
+
+        if self.max_dirty_slides and self.dirty_slides >= self.max_dirty_slides:
+            self.commit(snapshot=False)
+        elif self.max_dirty_seconds and time.monotonic() - self.dirty_since >= self.max_dirty_seconds:
+            self.commit(snapshot=False)
+
+def open_session(deck_name: str, max_dirty_slides: int = DEFAULT_MAX_DIRTY_SLIDES,
+                 max_dirty_seconds: float = DEFAULT_MAX_DIRTY_SECONDS) -> DeckSession:
+    """Opens (or returns the already open) in-memory session for a deck."""
+    session = _SESSIONS.get(deck_name)
+    if session is None:
+        session = DeckSession(deck_name, max_dirty_slides, max_dirty_seconds)
+        _SESSIONS[deck_name] = session
+    else:
+        session.max_dirty_slides = max_dirty_slides
+        session.max_dirty_seconds = max_dirty_seconds
+    return session
+
+def get_session(deck_name: str):
+    """Returns the open session for a deck, or None."""
+    return _SESSIONS.get(deck_name)
+
+def reload_session(deck_name: str):
+    """
+    Reloads an open session after the deck's output was regenerated outside
+    it, so a later commit cannot overwrite the new file with the stale copy.
+    """
+    session = _SESSIONS.get(deck_name)
+    if session is not None:
+        session.reload()
+
+def commit_session(deck_name: str, compact: bool = False) -> Path:
+    """Flushes an open session to disk."""
+    session = _SESSIONS.get(deck_name)
+    if session is None:
+        raise KeyError(f"No open session for deck '{deck_name}'.")
+    return session.commit(compact)
+
+def close_session(deck_name: str, commit: bool = True, compact: bool = False):
+    """Closes a session, committing pending changes unless commit is False."""
+    session = _SESSIONS.pop(deck_name, None)
+    if session is None:
+        raise KeyError(f"No open session for deck '{deck_name}'.")
+    if commit:
+        return session.commit(compact)
+    return None
@@ -0,0 +1,264 @@
+"""
+Versioned snapshots of a deck's generated PPTX.
+
+Builds, operation batches, slide imports, explicit session commits and
+restores record a version under decks/<name>/snapshots (single-slide edits
+and threshold commits do not; snapshot_deck records one on demand): a manifest
+listing the package's zip members in order, each pointing at an object
+stored content-addressed (zlib-compressed, named by the SHA-256 of the
+member's bytes) in snapshots/objects. Slides, masters, charts and media
+that did not change between versions are stored once. Members whose name,
+CRC and size match the previous version are not even read again.
+
+A deck opts out with "snapshots": false in its config.json. Only the
+newest SNAPSHOT_KEEP versions (or "snapshot_keep" from the config) are
+kept: once SNAPSHOT_GC_SLACK more have accumulated, older ones and the
+objects only they used are garbage-collected.
+"""
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from pathlib import Path
+import hashlib
+import json
+import os
+import warnings
+import zipfile
+import zlib
+
+from lxml import etree
+
+from .deck_manager import get_deck_path
+from .opc import slide_part_names
+from .tracing import count, span
+
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_KEEP = 50
+# Versions allowed beyond the keep limit before a snapshot runs gc_snapshots
+SNAPSHOT_GC_SLACK = 10
+COMPRESS_LEVEL = 6
+
+def _snapshot_dir(deck_name: str) -> Path:
+    return get_deck_path(deck_name) / SNAPSHOT_DIR
+
+def _output_file(deck_name: str) -> Path:
+    return get_deck_path(deck_name) / "output" / f"{deck_name}.pptx"
+
+def _config(deck_name: str) -> dict:
+    try:
+        with open(get_deck_path(deck_name) / "config.json", "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _manifest_path(snapshot_dir: Path, version: int) -> Path:
+    return snapshot_dir / "manifests" / f"{version:06d}.json"
+
+def _object_path(snapshot_dir: Path, digest: str) -> Path:
+    return snapshot_dir / "objects" / digest[:2] / digest
+
+def _versions(snapshot_dir: Path) -> list:
+    manifests = snapshot_dir / "manifests"
+    if not manifests.exists():
+        return []
+    return sorted(int(p.stem) for p in manifests.glob("*.json") if p.stem.isdigit())
+
+def _read_manifest(snapshot_dir: Path, version: int) -> dict:
+    path = _manifest_path(snapshot_dir, version)
+    if not path.exists():
+        raise FileNotFoundError(f"Snapshot version {version} not found.")
+    with open(path, "r") as f:
+        return json.load(f)
+
+def _write_object(snapshot_dir: Path, digest: str, data: bytes) -> int:
+    """Stores an object unless it already exists. Returns the bytes written."""
+    path = _object_path(snapshot_dir, digest)
+    if path.exists():
+        return 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    blob = zlib.compress(data, COMPRESS_LEVEL)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(blob)
+    os.replace(tmp_path, path)
+    return len(blob)
+
+def _summary(manifest: dict) -> dict:
+    return {
+        "version": manifest["version"],
+        "created_at": manifest["created_at"],
+        "label": manifest.get("label"),
+        "slide_count": len(manifest["slides"]),
+        "parts": len(manifest["parts"]),
+        "size": manifest["size"],
+    }
+
+def snapshot_deck(deck_name: str, label: str = None) -> dict:
+    """
+    Records the deck's current output as a new version. Nothing is recorded
+    when it matches the latest version part for part; the result then
+    reports that version with "unchanged": True.
+    """
+    output_file = _output_file(deck_name)
+    if not output_file.exists():
+        raise FileNotFoundError(f"Deck file '{output_file}' not found.")
+
+    snapshot_dir = _snapshot_dir(deck_name)
+    versions = _versions(snapshot_dir)
+    previous = _read_manifest(snapshot_dir, versions[-1]) if versions else None
+    known = {(p["name"], p["crc"], p["size"]): p["sha256"] for p in previous["parts"]} if previous else {}
+
+    parts, new_objects, bytes_stored = [], 0, 0
+    with span("snapshot"), zipfile.ZipFile(output_file) as zf:
+        for info in zf.infolist():
+            digest = known.get((info.filename, info.CRC, info.file_size))
+            if digest is None:
+                data = zf.read(info)
+                digest = hashlib.sha256(data).hexdigest()
+                written = _write_object(snapshot_dir, digest, data)
+                new_objects += bool(written)
+                bytes_stored += written
+            parts.append({"name": info.filename, "sha256": digest, "crc": info.CRC, "size": info.file_size})
+        slides = slide_part_names(zf)
+
+    if previous and [(p["name"], p["sha256"]) for p in parts] == [(p["name"], p["sha256"]) for p in previous["parts"]]:
+        return dict(_summary(previous), unchanged=True, new_objects=0, bytes_stored=0)
+
+    manifest = {
+        "version": versions[-1] + 1 if versions else 1,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": label,
+        "size": output_file.stat().st_size,
+        "slides": slides,
+        "parts": parts,
+    }
+    path = _manifest_path(snapshot_dir, manifest["version"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+    count("snapshot_objects_written", new_objects)
+
+    keep = _config(deck_name).get("snapshot_keep", SNAPSHOT_KEEP)
+    if keep and len(versions) + 1 >= keep + SNAPSHOT_GC_SLACK:
+        gc_snapshots(deck_name, keep)
+    return dict(_summary(manifest), unchanged=False, new_objects=new_objects, bytes_stored=bytes_stored)
+
+def record_snapshot(deck_name: str, label: str = None):
+    """Snapshots a freshly written deck unless its config opts out; never fails the write itself."""
+    if _config(deck_name).get("snapshots", True) is False:
+        return
+    try:
+        snapshot_deck(deck_name, label)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+        warnings.warn(f"Snapshot of '{deck_name}' not recorded ({e}).")
+
+def list_snapshots(deck_name: str) -> list:
+    """Summaries of the deck's recorded versions, oldest first."""
+    snapshot_dir = _snapshot_dir(deck_name)
+    return [_summary(_read_manifest(snapshot_dir, v)) for v in _versions(snapshot_dir)]
+
+def restore_snapshot(deck_name: str, version: int) -> dict:
+    """
+    Rewrites the deck's output from a recorded version and records the
+    result as a new version, so the restore itself can be undone. The output
+    being replaced is recorded first if no version holds it yet.
+    """
+    from .catalog import sync_deck
+    from .search import index_deck
+    from .session import get_session
+
+    if get_session(deck_name) is not None:
+        raise RuntimeError(f"Close the open session for '{deck_name}' before restoring a snapshot.")
+    snapshot_dir = _snapshot_dir(deck_name)
+    manifest = _read_manifest(snapshot_dir, version)
+    output_file = _output_file(deck_name)
+    if output_file.exists():
+        record_snapshot(deck_name)
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    try:
+        with span("restore"), zipfile.ZipFile(tmp_file, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for part in manifest["parts"]:
+                zf.writestr(part["name"], zlib.decompress(_object_path(snapshot_dir, part["sha256"]).read_bytes()))
+        os.replace(tmp_file, output_file)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+    sync_deck(deck_name, slide_count=len(manifest["slides"]))
+    index_deck(deck_name)
+    recorded = snapshot_deck(deck_name, label=f"restored from version {version}")
+    return {"output": str(output_file), "restored": version, "version": recorded["version"],
+            "slide_count": len(manifest["slides"])}
+
+def diff_snapshots(deck_name: str, from_version: int, to_version: int = None) -> dict:
+    """
+    Part-level differences between two versions (to_version defaults to the
+    latest), plus the slides inserted and changed (positions in to_version)
+    and deleted (positions in from_version).
+    """
+    snapshot_dir = _snapshot_dir(deck_name)
+    if to_version is None:
+        versions = _versions(snapshot_dir)
+        if not versions:
+            raise FileNotFoundError(f"Deck '{deck_name}' has no snapshots.")
+        to_version = versions[-1]
+    old = _read_manifest(snapshot_dir, from_version)
+    new = _read_manifest(snapshot_dir, to_version)
+    old_parts = {p["name"]: p for p in old["parts"]}
+    new_parts = {p["name"]: p for p in new["parts"]}
+
+    def entry(part):
+        return {"name": part["name"], "size": part["size"]}
+
+    changed = [
+        {"name": name, "size_before": old_parts[name]["size"], "size_after": part["size"]}
+        for name, part in new_parts.items()
+        if name in old_parts and old_parts[name]["sha256"] != part["sha256"]
+    ]
+    old_slides = [old_parts[name]["sha256"] for name in old["slides"]]
+    new_slides = [new_parts[name]["sha256"] for name in new["slides"]]
+    slides = {"before": len(old_slides), "after": len(new_slides), "inserted": [], "deleted": [], "changed": []}
+    # Align the slide sequences so one insertion or deletion does not mark every later slide as changed
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_slides, new_slides, autojunk=False).get_opcodes():
+        if tag == "replace":
+            slides["changed"].extend(range(j1, j1 + min(i2 - i1, j2 - j1)))
+            slides["deleted"].extend(range(i1 + min(i2 - i1, j2 - j1), i2))
+            slides["inserted"].extend(range(j1 + min(i2 - i1, j2 - j1), j2))
+        elif tag == "delete":
+            slides["deleted"].extend(range(i1, i2))
+        elif tag == "insert":
+            slides["inserted"].extend(range(j1, j2))
+    return {
+        "from": from_version,
+        "to": to_version,
+        "added": [entry(p) for name, p in new_parts.items() if name not in old_parts],
+        "removed": [entry(p) for name, p in old_parts.items() if name not in new_parts],
+        "changed": changed,
+        "unchanged": len(new_parts) - len(changed) - sum(name not in old_parts for name in new_parts),
+        "slides": slides,
+    }
+
+def gc_snapshots(deck_name: str, keep: int = SNAPSHOT_KEEP) -> dict:
+    """Deletes all but the newest `keep` versions and the objects no remaining version uses."""
+    snapshot_dir = _snapshot_dir(deck_name)
+    versions = _versions(snapshot_dir)
+    removed = versions[:max(0, len(versions) - max(keep, 1))]
+    for version in removed:
+        _manifest_path(snapshot_dir, version).unlink()
+
+    live = set()
+    for version in versions[len(removed):]:
+        live.update(p["sha256"] for p in _read_manifest(snapshot_dir, version)["parts"])
+    objects_removed = bytes_freed = 0
+    objects_dir = snapshot_dir / "objects"
+    if objects_dir.exists():
+        for path in objects_dir.glob("*/*"):
+            if path.name not in live:
+                bytes_freed += path.stat().st_size
+                path.unlink()
+                objects_removed += 1
+    return {
+        "versions_removed": len(removed),
+        "versions_kept": len(versions) - len(removed),
+        "objects_removed": objects_removed,
+        "bytes_freed": bytes_freed,
+    }
@@ -0,0 +1,156 @@
+"""
+Streaming generation for very large decks.
+
+create_enhanced_deck keeps every slide, chart workbook and image of the
+deck in one python-pptx object graph until a single save. Here each slide
+is built against a skeleton presentation, its parts (slide, charts,
+embedded workbooks, media) are written into the output zip straight away
+and the slide is dropped again, so memory holds the skeleton plus the
+current slide however long the deck is. Part names, relationship ids and
+slide ids come out as the normal path assigns them; the skeleton parts and
+[Content_Types].xml are written last.
+"""
+from collections import namedtuple
+import hashlib
+import os
+import zipfile
+
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import Part
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+
+from .build_cache import record_build, slide_hash
+from .builders import iter_slide_specs
+from .catalog import sync_deck
+from .chart_ingest import chart_reductions
+from .deck_manager import get_deck_path
+from .generator import _build_slide, _output_path, _remove_slide
+from .opc import PartNames
+from .search import index_deck
+from .session import reload_session
+from .snapshots import record_snapshot
+from .templates import new_presentation
+from .tracing import count, span
+
+MEDIA_PREFIX = "/ppt/media/"
+
+# Content-types entry for a part that has already been written and released
+_WrittenPart = namedtuple("_WrittenPart", "partname content_type")
+
+class _SlideStreamer:
+    """Moves slides out of a skeleton presentation into an open PPTX zip, one at a time."""
+
+    def __init__(self, prs, zf: zipfile.ZipFile):
+        self.prs = prs
+        self.zf = zf
+        self.package = prs.part.package
+        self.skeleton = set(self.package.iter_parts())
+        self.names = PartNames(str(part.partname) for part in self.skeleton)
+        self.media = {}
+        self.written = []
+        self.slide_names = []
+
+    def _next_name(self, partname: str) -> PackURI:
+        return PackURI(self.names.next(partname))
+
+    def _new_parts(self, slide_part) -> list:
+        """The slide part and every part it reaches that is not part of the skeleton."""
+        parts, queue = [], [slide_part]
+        while queue:
+            part = queue.pop(0)
+            if part in self.skeleton or part in parts:
+                continue
+            parts.append(part)
+            queue.extend(rel.target_part for rel in part.rels.values() if not rel.is_external)
+        return parts
+
+    def add(self, slide):
+        """Writes the slide's parts to the zip and removes the slide from the skeleton."""
+        with span("stream_slide"):
+            to_write = []
+            # Rename everything first: relationship targets serialize from the final partnames
+            for part in self._new_parts(slide.part):
+                if str(part.partname).startswith(MEDIA_PREFIX):
+                    digest = hashlib.sha1(part.blob).hexdigest()
+                    if digest in self.media:
+                        part.partname = self.media[digest]
+                        continue
+                    part.partname = self.media[digest] = self._next_name(str(part.partname))
+                else:
+                    part.partname = self._next_name(str(part.partname))
+                to_write.append(part)
+
+            for part in to_write:
+                self.zf.writestr(part.partname.membername, part.blob)
+                if part._rels:
+                    self.zf.writestr(part.partname.rels_uri.membername, part.rels.xml)
+                self.written.append(_WrittenPart(part.partname, part.content_type))
+            self.slide_names.append(slide.part.partname)
+            _remove_slide(self.prs, len(self.prs.slides) - 1)
+
+    def finish(self):
+        """Relates the written slides to the presentation and writes the skeleton and content types."""
+        presentation_part = self.prs.part
+        stubs = set()
+        for partname in self.slide_names:
+            # Empty stand-ins: only their partname is needed for the presentation's relationships
+            stub = Part(partname, CT.PML_SLIDE, self.package)
+            stubs.add(stub)
+            self.prs.slides._sldIdLst.add_sldId(presentation_part.relate_to(stub, RT.SLIDE))
+
+        parts = [part for part in self.package.iter_parts() if part not in stubs]
+        for part in parts:
+            self.zf.writestr(part.partname.membername, part.blob)
+            if part._rels:
+                self.zf.writestr(part.partname.rels_uri.membername, part.rels.xml)
+        self.zf.writestr(PACKAGE_URI.rels_uri.membername, self.package._rels.xml)
+        self.zf.writestr(CONTENT_TYPES_URI.membername,
+                         serialize_part_xml(_ContentTypesItem.xml_for(parts + self.written)))
+
+def stream_enhanced_deck(deck_name: str, slides_content) -> dict:
+    """
+    Generates a deck like create_enhanced_deck from any iterable of slide
+    specs, such as a generator, writing each slide into the output file as
+    soon as it is built. The output replaces the previous one only once it
+    is complete, and its slide hashes are recorded in the build cache. An
+    open session for the deck is reloaded from the new output.
+    """
+    deck_path = get_deck_path(deck_name)
+    if not deck_path.exists():
+        raise FileNotFoundError(f"Deck folder '{deck_name}' does not exist.")
+
+    assets_dir = deck_path / "assets"
+    output_file = _output_path(deck_name)
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    prs = new_presentation(deck_name)
+    hashes, reductions = [], []
+    try:
+        with zipfile.ZipFile(tmp_file, "w", compression=zipfile.ZIP_DEFLATED, strict_timestamps=False) as zf:
+            streamer = _SlideStreamer(prs, zf)
+            for slide_data in iter_slide_specs(slides_content, assets_dir):
+                reductions.extend(dict(r, slide=len(hashes)) for r in chart_reductions([slide_data]))
+                hashes.append(slide_hash(slide_data, assets_dir))
+                streamer.add(_build_slide(prs, slide_data, assets_dir=assets_dir))
+            with span("save"):
+                streamer.finish()
+        os.replace(tmp_file, output_file)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+    count("bytes_written", output_file.stat().st_size)
+    with span("catalog_update"):
+        sync_deck(deck_name, slide_count=len(hashes))
+    index_deck(deck_name)
+    record_snapshot(deck_name)
+    record_build(deck_name, hashes)
+    reload_session(deck_name)
+    return {
+        "output": str(output_file),
+        "mode": "streamed",
+        "hits": 0,
+        "misses": len(hashes),
+        "slide_count": len(hashes),
+        "chart_reductions": reductions,
+    }
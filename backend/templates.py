@@ -0,0 +1,182 @@
+"""
+Template registry.
+
+Each template (.pptx or .potx) is parsed once per process into a pristine
+Presentation that is never handed out; new decks get a deep copy of it,
+which skips reading the zip and parsing the masters, layouts and theme
+again. The TEMPLATE_CACHE_SIZE most recently used templates stay resident.
+
+A deck picks its template with the "template" key of its config.json, a
+path relative to the deck folder or absolute. Decks without one use the
+python-pptx default template. Slide specs may name layouts ('Title Only')
+as well as index them.
+"""
+from collections import OrderedDict
+from pathlib import Path
+import copy
+import hashlib
+import io
+import json
+import threading
+import weakref
+import zipfile
+
+import pptx
+from pptx import Presentation
+
+from .deck_manager import get_deck_path
+
+TEMPLATE_CACHE_SIZE = 8
+TEMPLATE_EXTENSIONS = (".pptx", ".potx")
+DEFAULT_TEMPLATE = "default"
+CT_TEMPLATE_MAIN = b"application/vnd.openxmlformats-officedocument.presentationml.template.main+xml"
+CT_PRESENTATION_MAIN = b"application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"
+
+_templates = OrderedDict()
+_templates_lock = threading.Lock()
+# Layout name -> index lookups of presentations in use, keyed by their presentation part
+_layout_names = weakref.WeakKeyDictionary()
+
+class Template:
+    """
+    A parsed template. prs must never be modified, nor even read through
+    its proxies: python-pptx caches sub-element references on first access
+    and deepcopy would detach those from the copied tree. Use clone().
+    """
+
+    def __init__(self, prs: Presentation, identity: str, layout_names: dict):
+        self.prs = prs
+        self.identity = identity
+        self.layout_names = layout_names
+
+    def clone(self) -> Presentation:
+        """Returns an independent Presentation with the template's masters, layouts and theme."""
+        prs = copy.deepcopy(self.prs)
+        _layout_names[prs.part] = self.layout_names
+        return prs
+
+def _layout_lookup(prs: Presentation) -> dict:
+    return {layout.name: i for i, layout in enumerate(prs.slide_layouts)}
+
+def _as_presentation_package(blob: bytes) -> bytes:
+    """Rewrites a .potx package's main content type so python-pptx opens it as a presentation."""
+    with zipfile.ZipFile(io.BytesIO(blob)) as src:
+        content_types = src.read("[Content_Types].xml")
+        if CT_TEMPLATE_MAIN not in content_types:
+            return blob
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as dst:
+            for info in src.infolist():
+                data = src.read(info)
+                if info.filename == "[Content_Types].xml":
+                    data = content_types.replace(CT_TEMPLATE_MAIN, CT_PRESENTATION_MAIN)
+                dst.writestr(info.filename, data)
+    return buf.getvalue()
+
+def _load_template(path: Path) -> Template:
+    if path.suffix.lower() not in TEMPLATE_EXTENSIONS:
+        raise ValueError(f"Template '{path.name}' must be one of {', '.join(TEMPLATE_EXTENSIONS)}.")
+    blob = path.read_bytes()
+    prs = Presentation(io.BytesIO(_as_presentation_package(blob)))
+    # Sample slides in a template are not part of the decks built from it
+    sld_ids = prs.slides._sldIdLst
+    for sld_id in list(sld_ids):
+        sld_ids.remove(sld_id)
+        prs.part.drop_rel(sld_id.rId)
+    buf = io.BytesIO()
+    prs.save(buf)
+    # Reopen so the kept copy has no cached proxies
+    return Template(Presentation(buf), hashlib.sha256(blob).hexdigest(), _layout_lookup(prs))
+
+def get_template(path: Path = None) -> Template:
+    """Returns the parsed template at path (the default template for None), parsing it at most once."""
+    if path is None:
+        key = DEFAULT_TEMPLATE
+    else:
+        path = Path(path)
+        if not path.is_file():
+            raise FileNotFoundError(f"Template '{path}' not found.")
+        st = path.stat()
+        key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is not None:
+            _templates.move_to_end(key)
+            return template
+
+    if path is None:
+        template = Template(Presentation(), f"python-pptx-{pptx.__version__}:{DEFAULT_TEMPLATE}",
+                            _layout_lookup(Presentation()))
+    else:
+        template = _load_template(path)
+
+    with _templates_lock:
+        _templates[key] = template
+        if len(_templates) > TEMPLATE_CACHE_SIZE:
+            _templates.popitem(last=False)
+    return template
+
+def deck_template_path(deck_name: str) -> Path:
+    """The template file configured for a deck, or None for the default template."""
+    deck_path = get_deck_path(deck_name)
+    try:
+        with open(deck_path / "config.json", "r") as f:
+            template = json.load(f).get("template")
+    except (OSError, ValueError):
+        return None
+    if not template:
+        return None
+    path = Path(template)
+    return path if path.is_absolute() else deck_path / path
+
+def deck_template(deck_name: str) -> Template:
+    return get_template(deck_template_path(deck_name))
+
+def new_presentation(deck_name: str) -> Presentation:
+    """A fresh, empty Presentation built on the deck's template."""
+    return deck_template(deck_name).clone()
+
+def set_deck_template(deck_name: str, template: str = None) -> Template:
+    """
+    Points a deck at a template file (relative to the deck folder or
+    absolute), or back at the default template with None. The template is
+    parsed first so a broken file is rejected before the config changes.
+    """
+    deck_path = get_deck_path(deck_name)
+    config_path = deck_path / "config.json"
+    if not config_path.exists():
+        raise FileNotFoundError(f"Deck '{deck_name}' does not exist.")
+    path = None
+    if template:
+        path = Path(template)
+        parsed = get_template(path if path.is_absolute() else deck_path / path)
+    else:
+        parsed = get_template()
+
+    with open(config_path, "r") as f:
+        config = json.load(f)
+    if path is None:
+        config.pop("template", None)
+    else:
+        config["template"] = str(template)
+    with open(config_path, "w") as f:
+        json.dump(config, f, indent=4)
+    return parsed
+
+def layout_names(prs: Presentation) -> dict:
+    """Layout name -> index for a presentation, computed once per Presentation object."""
+    names = _layout_names.get(prs.part)
+    if names is None:
+        names = _layout_lookup(prs)
+        _layout_names[prs.part] = names
+    return names
+
+def layout_index(prs: Presentation, layout) -> int:
+    """Resolves a layout given by index or by name."""
+    if not isinstance(layout, str):
+        return layout
+    names = layout_names(prs)
+    if layout not in names:
+        raise ValueError(f"Unknown layout '{layout}'. Available layouts: {', '.join(names)}")
+    return names[layout]
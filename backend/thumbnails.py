@@ -0,0 +1,387 @@
+"""
+Low-resolution slide previews drawn with Pillow straight from the saved PPTX.
+
+This is not a full renderer: text frames, tables and pictures are drawn
+at their placed positions, charts and other graphics as labelled boxes,
+which is enough to review layout and content without opening PowerPoint.
+Thumbnails are cached under decks/<name>/cache/thumbnails, keyed by a hash
+of the slide XML, its layout and master, and the images it embeds, so
+only changed slides are redrawn. A contact sheet lays a deck's thumbnails
+out in one image.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import hashlib
+import io
+import json
+import os
+import zipfile
+
+from lxml import etree
+from PIL import Image, ImageDraw, ImageFont
+
+from .deck_manager import get_deck_path
+from .opc import (
+    NS, RT_SLIDE_LAYOUT, RT_SLIDE_MASTER, main_part_name, qn, read_rels, related, slide_key, slide_part_names,
+)
+
+RENDER_VERSION = 1
+DEFAULT_WIDTH = 320
+SHEET_COLUMNS = 4
+SHEET_GAP = 8
+SHEET_LABEL = 14
+DEFAULT_SLIDE_SIZE = (9144000, 6858000)
+EMU_PER_PT = 12700
+TITLE_TYPES = ("title", "ctrTitle")
+COLORS = {
+    "background": (255, 255, 255),
+    "text": (40, 40, 40),
+    "outline": (205, 205, 205),
+    "table_line": (150, 150, 150),
+    "table_header": (221, 230, 241),
+    "chart": (226, 233, 243),
+    "chart_outline": (120, 145, 185),
+}
+
+def _cache_dir(deck_path: Path) -> Path:
+    return deck_path / "cache" / "thumbnails"
+
+def _load_index(cache_dir: Path) -> dict:
+    try:
+        with open(cache_dir / "index.json", "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_index(cache_dir: Path, index: dict):
+    tmp_path = cache_dir / "index.json.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=4)
+    os.replace(tmp_path, cache_dir / "index.json")
+
+def _font(size_px: float):
+    try:
+        return ImageFont.load_default(max(6, round(size_px)))
+    except TypeError:
+        # Pillow without FreeType only has the fixed bitmap font
+        return ImageFont.load_default()
+
+def _slide_size(zf: zipfile.ZipFile) -> tuple:
+    root = etree.fromstring(zf.read(main_part_name(zf)))
+    size = root.find("p:sldSz", NS)
+    if size is None:
+        return DEFAULT_SLIDE_SIZE
+    return int(size.get("cx")), int(size.get("cy"))
+
+def _xfrm_box(xfrm) -> tuple:
+    if xfrm is None:
+        return None
+    off, ext = xfrm.find("a:off", NS), xfrm.find("a:ext", NS)
+    if off is None or ext is None:
+        return None
+    return int(off.get("x")), int(off.get("y")), int(ext.get("cx")), int(ext.get("cy"))
+
+def _own_box(shape) -> tuple:
+    if shape.tag == qn("p:graphicFrame"):
+        return _xfrm_box(shape.find("p:xfrm", NS))
+    if shape.tag == qn("p:grpSp"):
+        return _xfrm_box(shape.find("p:grpSpPr/a:xfrm", NS))
+    return _xfrm_box(shape.find("p:spPr/a:xfrm", NS))
+
+def _placeholder(shape):
+    """(type, idx) of a placeholder shape, or None."""
+    ph = shape.find("*/p:nvPr/p:ph", NS)
+    if ph is None:
+        return None
+    return ph.get("type", "body"), ph.get("idx", "0")
+
+def _placeholder_boxes(zf: zipfile.ZipFile, part_name: str) -> dict:
+    """Placeholder positions defined on a layout or master, by idx and by type."""
+    boxes = {}
+    if not part_name:
+        return boxes
+    root = etree.fromstring(zf.read(part_name))
+    for shape in root.iterfind("p:cSld/p:spTree/*", NS):
+        ph = _placeholder(shape)
+        box = _own_box(shape)
+        if ph and box:
+            boxes.setdefault(("idx", ph[1]), box)
+            boxes.setdefault(("type", ph[0]), box)
+    return boxes
+
+def _inherited_box(ph: tuple, layout_boxes: dict, master_boxes: dict) -> tuple:
+    ph_type, idx = ph
+    master_type = "title" if ph_type in TITLE_TYPES else ph_type
+    return (
+        (layout_boxes.get(("idx", idx)) if idx != "0" else None)
+        or layout_boxes.get(("type", ph_type))
+        or master_boxes.get(("type", master_type))
+        or master_boxes.get(("type", "body"))
+    )
+
+def _wrap(draw, text: str, font, width: float) -> list:
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if line and draw.textlength(candidate, font=font) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+def _paragraphs(tx_body) -> tuple:
+    """Paragraph texts and the first explicit font size (pt), if any."""
+    texts = []
+    size = None
+    for p in tx_body.iterfind("a:p", NS):
+        texts.append("".join(t.text or "" for t in p.iter(qn("a:t"))))
+        if size is None:
+            rpr = p.find(".//a:rPr[@sz]", NS)
+            if rpr is not None:
+                size = int(rpr.get("sz")) / 100
+    return texts, size
+
+class _SlideRenderer:
+    def __init__(self, zf, part_name, slide_size, width, layout_boxes, master_boxes):
+        self.zf = zf
+        self.part_name = part_name
+        self.scale = width / slide_size[0]
+        self.image = Image.new("RGB", (width, max(1, round(slide_size[1] * self.scale))), COLORS["background"])
+        self.draw = ImageDraw.Draw(self.image)
+        self.rels = read_rels(zf, part_name)
+        self.layout_boxes = layout_boxes
+        self.master_boxes = master_boxes
+
+    def px(self, box) -> tuple:
+        x, y, cx, cy = box
+        s = self.scale
+        return round(x * s), round(y * s), round((x + cx) * s), round((y + cy) * s)
+
+    def text_block(self, box, texts, size_pt, bullets=False, center=False):
+        x0, y0, x1, y1 = box
+        font = _font(size_pt * EMU_PER_PT * self.scale)
+        line_height = font.size * 1.2 if hasattr(font, "size") else 11
+        y = y0 + 2
+        for text in texts:
+            if not text:
+                continue
+            prefix = "- " if bullets else ""
+            for line in _wrap(self.draw, prefix + text, font, max(1, x1 - x0 - 4)):
+                if y + line_height > y1 + line_height / 2:
+                    return
+                tx = x0 + 2
+                if center:
+                    tx = x0 + max(0, (x1 - x0 - self.draw.textlength(line, font=font)) / 2)
+                self.draw.text((tx, y), line, fill=COLORS["text"], font=font)
+                y += line_height
+
+    def shape(self, shape, box):
+        tag = shape.tag
+        if tag == qn("p:pic"):
+            self.picture(shape, box)
+        elif tag == qn("p:graphicFrame"):
+            if shape.find(".//a:tbl", NS) is not None:
+                self.table(shape.find(".//a:tbl", NS), box)
+            else:
+                label = "Chart" if shape.find(".//c:chart", NS) is not None else "Graphic"
+                self.draw.rectangle(self.px(box), fill=COLORS["chart"], outline=COLORS["chart_outline"])
+                self.text_block(self.px(box), [label], 14, center=True)
+        elif tag == qn("p:sp"):
+            tx_body = shape.find("p:txBody", NS)
+            texts, size = _paragraphs(tx_body) if tx_body is not None else ([], None)
+            ph = _placeholder(shape)
+            if not any(texts):
+                if ph is None:
+                    self.draw.rectangle(self.px(box), outline=COLORS["outline"])
+                return
+            is_title = ph is not None and ph[0] in TITLE_TYPES
+            self.text_block(self.px(box), texts, size or (40 if is_title else 20),
+                            bullets=ph is not None and not is_title, center=is_title)
+        elif tag == qn("p:cxnSp"):
+            x0, y0, x1, y1 = self.px(box)
+            self.draw.line((x0, y0, x1, y1), fill=COLORS["outline"])
+
+    def picture(self, shape, box):
+        blip = shape.find(".//a:blip", NS)
+        rel = self.rels.get(blip.get(qn("r:embed"))) if blip is not None else None
+        x0, y0, x1, y1 = self.px(box)
+        size = (max(1, x1 - x0), max(1, y1 - y0))
+        try:
+            with Image.open(io.BytesIO(self.zf.read(rel[1]))) as source:
+                source.draft("RGB", size)
+                picture = source.convert("RGBA").resize(size, Image.BILINEAR)
+            self.image.paste(picture, (x0, y0), picture)
+        except Exception:
+            self.draw.rectangle((x0, y0, x1, y1), outline=COLORS["outline"])
+            self.draw.line((x0, y0, x1, y1), fill=COLORS["outline"])
+            self.draw.line((x0, y1, x1, y0), fill=COLORS["outline"])
+
+    def table(self, tbl, box):
+        x, y, cx, cy = box
+        widths = [int(col.get("w")) for col in tbl.iterfind("a:tblGrid/a:gridCol", NS)]
+        rows = list(tbl.iterfind("a:tr", NS))
+        row_y = y
+        for r, row in enumerate(rows):
+            height = int(row.get("h"))
+            col_x = x
+            for c, cell in enumerate(row.iterfind("a:tc", NS)):
+                width = widths[c] if c < len(widths) else 0
+                cell_box = self.px((col_x, row_y, width, height))
+                self.draw.rectangle(cell_box, fill=COLORS["table_header"] if r == 0 else None,
+                                    outline=COLORS["table_line"])
+                tx_body = cell.find("a:txBody", NS)
+                if tx_body is not None:
+                    texts, size = _paragraphs(tx_body)
+                    self.text_block(cell_box, [" ".join(texts)], size or 18)
+                col_x += width
+            row_y += height
+            if self.px((x, row_y, 0, 0))[1] > self.image.height:
+                break
+
+    def walk(self, container, transform=None):
+        for shape in container.iterfind("*"):
+            if shape.tag not in (qn("p:sp"), qn("p:pic"), qn("p:graphicFrame"), qn("p:grpSp"), qn("p:cxnSp")):
+                continue
+            box = _own_box(shape)
+            if box is None and shape.tag == qn("p:sp"):
+                ph = _placeholder(shape)
+                box = _inherited_box(ph, self.layout_boxes, self.master_boxes) if ph else None
+            if box is None:
+                continue
+            if transform:
+                box = transform(box)
+            if shape.tag == qn("p:grpSp"):
+                self.walk(shape, self.group_transform(shape, box, transform))
+            else:
+                self.shape(shape, box)
+
+    def group_transform(self, group, box, outer):
+        child = group.find("p:grpSpPr/a:xfrm", NS)
+        ch_off, ch_ext = child.find("a:chOff", NS), child.find("a:chExt", NS)
+        if ch_off is None or ch_ext is None:
+            return outer
+        x, y, cx, cy = box
+        cox, coy = int(ch_off.get("x")), int(ch_off.get("y"))
+        sx = cx / max(1, int(ch_ext.get("cx")))
+        sy = cy / max(1, int(ch_ext.get("cy")))
+        # Child coordinates are mapped into the group's (already transformed) box
+        return lambda b: (round(x + (b[0] - cox) * sx), round(y + (b[1] - coy) * sy),
+                          round(b[2] * sx), round(b[3] * sy))
+
+    def render(self) -> bytes:
+        root = etree.fromstring(self.zf.read(self.part_name))
+        tree = root.find("p:cSld/p:spTree", NS)
+        if tree is not None:
+            self.walk(tree)
+        buf = io.BytesIO()
+        self.image.save(buf, format="PNG", optimize=True)
+        return buf.getvalue()
+
+def _thumbnail_key(zf, part_name: str, part_hashes: dict, width: int) -> str:
+    key, _ = slide_key(zf, part_name, part_hashes)
+    digest = hashlib.sha256(f"{key}|{width}|{RENDER_VERSION}".encode("ascii"))
+    for _, target, external in sorted(read_rels(zf, part_name).values()):
+        if not external and target.startswith("ppt/media/"):
+            if target not in part_hashes:
+                part_hashes[target] = hashlib.sha256(zf.read(target)).hexdigest()
+            digest.update(part_hashes[target].encode("ascii"))
+    return digest.hexdigest()
+
+def render_thumbnails(deck_name: str, width: int = DEFAULT_WIDTH, workers: int = None) -> dict:
+    """
+    Renders a PNG thumbnail per slide of the deck's saved PPTX, redrawing only
+    slides whose content changed since the last call. Slides are drawn in
+    parallel threads. Returns the thumbnail paths in slide order and how many
+    were rendered versus reused.
+    """
+    deck_path = get_deck_path(deck_name)
+    pptx = deck_path / "output" / f"{deck_name}.pptx"
+    if not pptx.exists():
+        raise FileNotFoundError(f"No generated deck found for '{deck_name}'")
+    cache_dir = _cache_dir(deck_path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    with zipfile.ZipFile(pptx) as zf:
+        slide_size = _slide_size(zf)
+        part_hashes = {}
+        slides = [(part, _thumbnail_key(zf, part, part_hashes, width)) for part in slide_part_names(zf)]
+        missing = {key: part for part, key in slides if not (cache_dir / f"{key[:32]}.png").exists()}
+
+        boxes = {}
+        renderers = []
+        for key, part in missing.items():
+            layout = related(zf, part, RT_SLIDE_LAYOUT)
+            if layout not in boxes:
+                master = related(zf, layout, RT_SLIDE_MASTER) if layout else None
+                boxes[layout] = (_placeholder_boxes(zf, layout), _placeholder_boxes(zf, master))
+            renderers.append((key, _SlideRenderer(zf, part, slide_size, width, *boxes[layout])))
+
+        def render(item):
+            key, renderer = item
+            tmp_path = cache_dir / f"{key[:32]}.png.tmp"
+            tmp_path.write_bytes(renderer.render())
+            os.replace(tmp_path, cache_dir / f"{key[:32]}.png")
+
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(render, renderers))
+
+    keys = [key for _, key in slides]
+    index = _load_index(cache_dir)
+    index.update(slides=keys, width=width)
+    _write_index(cache_dir, index)
+
+    # Drop thumbnails of slides that no longer exist
+    current = {f"{key[:32]}.png" for key in keys}
+    for path in cache_dir.glob("*.png"):
+        if path.name not in current and path.name != "contact_sheet.png":
+            path.unlink()
+
+    return {
+        "slides": [str(cache_dir / f"{key[:32]}.png") for key in keys],
+        "rendered": len(missing),
+        "cached": len(keys) - len(missing),
+    }
+
+def contact_sheet(deck_name: str, width: int = DEFAULT_WIDTH, columns: int = SHEET_COLUMNS,
+                  workers: int = None) -> Path:
+    """Lays out all slide thumbnails, numbered, in one PNG. Rebuilt only when a thumbnail changed."""
+    thumbs = render_thumbnails(deck_name, width, workers)
+    cache_dir = _cache_dir(get_deck_path(deck_name))
+    sheet_path = cache_dir / "contact_sheet.png"
+    index = _load_index(cache_dir)
+    sheet_key = hashlib.sha256(f"{index['slides']}|{columns}".encode("ascii")).hexdigest()
+    if index.get("sheet_key") == sheet_key and sheet_path.exists():
+        return sheet_path
+
+    paths = thumbs["slides"]
+    tiles = [Image.open(p) for p in paths]
+    tile_w = width
+    tile_h = max((t.height for t in tiles), default=1)
+    columns = max(1, min(columns, len(tiles) or 1))
+    rows = max(1, -(-len(tiles) // columns))
+    sheet = Image.new(
+        "RGB",
+        (columns * (tile_w + SHEET_GAP) + SHEET_GAP, rows * (tile_h + SHEET_LABEL + SHEET_GAP) + SHEET_GAP),
+        (236, 236, 236),
+    )
+    draw = ImageDraw.Draw(sheet)
+    font = _font(SHEET_LABEL - 3)
+    for i, tile in enumerate(tiles):
+        x = SHEET_GAP + (i % columns) * (tile_w + SHEET_GAP)
+        y = SHEET_GAP + (i // columns) * (tile_h + SHEET_LABEL + SHEET_GAP)
+        draw.text((x, y), str(i + 1), fill=COLORS["text"], font=font)
+        sheet.paste(tile, (x, y + SHEET_LABEL))
+        draw.rectangle((x - 1, y + SHEET_LABEL - 1, x + tile.width, y + SHEET_LABEL + tile.height),
+                       outline=COLORS["outline"])
+        tile.close()
+
+    tmp_path = cache_dir / "contact_sheet.png.tmp"
+    sheet.save(tmp_path, format="PNG", optimize=True)
+    os.replace(tmp_path, sheet_path)
+    index["sheet_key"] = sheet_key
+    _write_index(cache_dir, index)
+    return sheet_path
@@ -0,0 +1,249 @@
+"""
+Lightweight tracing for backend operations.
+
+Code marks phases with span() and bumps counters with count(); both are
+no-ops unless a trace() is active in the current context. A trace records
+nested span timings, counters, sampled peak RSS (tracemalloc's peak
+where RSS cannot be read) and, optionally, a cProfile capture, and can be
+appended to a JSON-lines file.
+
+SlideDeckMCPTools tools accept debug=True to run under a trace and get a
+summary back with their result; setting FSP_TRACE_FILE exports a trace of
+every tool call to that file.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TRACE_FILE_ENV = "FSP_TRACE_FILE"
+SAMPLE_INTERVAL = 0.02
+PROFILE_TOP = 25
+
+_active_trace = ContextVar("fsp_trace", default=None)
+_active_span = ContextVar("fsp_span", default=None)
+
+@functools.lru_cache(maxsize=None)
+def _psutil():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
+
+def _rss_mb():
+    """Current RSS in MB, or None when the platform offers no way to read it."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    psutil = _psutil()
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1048576
+    if resource is not None:
+        # Without /proc or psutil only the process-lifetime peak is available
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return None
+
+class _MemorySampler(threading.Thread):
+    """
+    Polls RSS in the background and keeps the highest value seen. Where RSS
+    cannot be read, the peak of Python allocations from tracemalloc is
+    reported instead.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self._done = threading.Event()
+        self.peak = _rss_mb()
+        self.traced = self.peak is None
+        self._owns_tracemalloc = self.traced and not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+        if self.traced:
+            tracemalloc.reset_peak()
+            self.peak = tracemalloc.get_traced_memory()[0] / 1048576
+
+    def run(self):
+        if self.traced:
+            return
+        while not self._done.wait(SAMPLE_INTERVAL):
+            self.peak = max(self.peak, _rss_mb())
+
+    def stop(self) -> float:
+        self._done.set()
+        self.join()
+        if self.traced:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1] / 1048576)
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+        else:
+            self.peak = max(self.peak, _rss_mb())
+        return self.peak
+
+class Trace:
+    def __init__(self, name: str, attrs: dict = None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.spans = []
+        self.counters = {}
+        self.profile = None
+        self.start_rss_mb = None
+        self.peak_rss_mb = None
+        self.seconds = None
+        self.started = time.perf_counter()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, counter: str, n):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def phases(self) -> dict:
+        """Span durations aggregated by span name."""
+        phases = {}
+        for s in self.spans:
+            p = phases.setdefault(s["name"], {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+            p["count"] += 1
+            p["seconds"] += s["seconds"]
+            p["max_seconds"] = max(p["max_seconds"], s["seconds"])
+        for p in phases.values():
+            p["seconds"] = round(p["seconds"], 6)
+            p["max_seconds"] = round(p["max_seconds"], 6)
+        return dict(sorted(phases.items(), key=lambda item: -item[1]["seconds"]))
+
+    def summary(self) -> dict:
+        summary = {
+            "name": self.name,
+            "attrs": self.attrs,
+            "seconds": self.seconds,
+            "start_rss_mb": self.start_rss_mb,
+            "peak_rss_mb": self.peak_rss_mb,
+            "counters": self.counters,
+            "phases": self.phases(),
+        }
+        if self.profile is not None:
+            summary["profile"] = self.profile
+        return summary
+
+    def export(self, path):
+        """Appends one JSON line per span plus a closing summary line."""
+        with open(path, "a") as f:
+            for s in self.spans:
+                f.write(json.dumps(dict(s, type="span", trace=self.name)) + "\n")
+            f.write(json.dumps(dict(self.summary(), type="trace")) + "\n")
+
+def _profile_rows(profiler) -> list:
+    import io
+    import pstats
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, func), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": f"{os.path.basename(filename)}:{line}({func})", "calls": calls,
+                     "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)})
+    rows.sort(key=lambda r: -r["cumtime"])
+    return rows[:PROFILE_TOP]
+
+@contextmanager
+def trace(name: str, profile: bool = False, **attrs):
+    """Collects spans and counters recorded in this context. Yields the Trace."""
+    current = Trace(name, attrs)
+    trace_token = _active_trace.set(current)
+    span_token = _active_span.set(None)
+    sampler = _MemorySampler()
+    current.start_rss_mb = round(sampler.peak, 1)
+    sampler.start()
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+    current.started = start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield current
+    finally:
+        if profiler:
+            profiler.disable()
+            current.profile = _profile_rows(profiler)
+        current.seconds = round(time.perf_counter() - start, 6)
+        current.peak_rss_mb = round(sampler.stop(), 1)
+        _active_span.reset(span_token)
+        _active_trace.reset(trace_token)
+
+@contextmanager
+def span(name: str, **attrs):
+    """Times a phase of the active trace, nested under the enclosing span."""
+    current = _active_trace.get()
+    if current is None:
+        yield
+        return
+    span_id = next(current._ids)
+    token = _active_span.set(span_id)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _active_span.reset(token)
+        record = {"id": span_id, "parent": _active_span.get(), "name": name,
+                  "start": round(start - current.started, 6), "seconds": round(seconds, 6)}
+        if attrs:
+            record["attrs"] = attrs
+        with current._lock:
+            current.spans.append(record)
+
+def count(counter: str, n=1):
+    """Adds n to a counter of the active trace."""
+    current = _active_trace.get()
+    if current is not None:
+        current.add(counter, n)
+
+def traced_tools(cls):
+    """
+    Class decorator for SlideDeckMCPTools: every public tool gains debug and
+    profile keyword arguments. With debug=True the call runs under a trace
+    and returns {"result": ..., "trace": summary} as JSON; profile=True adds
+    the top cProfile entries. Calls are exported when FSP_TRACE_FILE is set.
+    """
+    for name, fn in inspect.getmembers(cls, inspect.isfunction):
+        if not name.startswith("_"):
+            setattr(cls, name, staticmethod(_traced_tool(name, fn)))
+    return cls
+
+def _traced_tool(name: str, fn):
+    signature = inspect.signature(fn)
+    extra = [
+        inspect.Parameter("debug", inspect.Parameter.KEYWORD_ONLY, default=False, annotation=bool),
+        inspect.Parameter("profile", inspect.Parameter.KEYWORD_ONLY, default=False, annotation=bool),
+    ]
+
+    @functools.wraps(fn)
+    def wrapper(*args, debug: bool = False, profile: bool = False, **kwargs):
+        trace_file = os.environ.get(TRACE_FILE_ENV)
+        if not (debug or profile or trace_file):
+            return fn(*args, **kwargs)
+        with trace(name, profile=profile) as current:
+            result = fn(*args, **kwargs)
+        if trace_file:
+            current.export(trace_file)
+        if debug or profile:
+            return json.dumps({"result": result, "trace": current.summary()}, indent=2)
+        return result
+
+    wrapper.__signature__ = signature.replace(parameters=list(signature.parameters.values()) + extra)
+    return wrapper
@@ -1,6 +1,13 @@
 from pathlib import Path
+import io
+import json
+import os
+import zipfile
 
-from pptx import Presentation
+from lxml import etree
+
+from .opc import NS, qn, slide_key, slide_part_names
+from .tracing import count, span
 
 def validate_pptx(file_path: Path) -> dict:
     """
@@ -19,6 +26,8 @@ def validate_pptx(file_path: Path) -> dict:
         results["issues"].append("File does not exist.")
         return results
 
+    # Only this full check needs python-pptx; the streaming paths below parse the XML directly
+    from pptx import Presentation
     try:
         prs = Presentation(file_path)
         results["slide_count"] = len(prs.slides)
@@ -60,3 +69,195 @@ def validate_pptx(file_path: Path) -> dict:
         results["issues"].append(f"Failed to parse PPTX file: {e}")
 
     return results
+
+SHAPE_TAGS = {qn("p:sp"), qn("p:grpSp"), qn("p:graphicFrame"), qn("p:cxnSp"), qn("p:pic"), qn("p:contentPart")}
+IGNORED_PLACEHOLDER_TYPES = ("obj", "chart") # Same as PP_PLACEHOLDER 7 and 8
+SP_TREE = qn("p:spTree")
+VALIDATION_CACHE_FILE = "validation_cache.json"
+VALIDATION_CACHE_VERSION = 1
+
+def _check_shape(elem, findings: dict):
+    """Records the findings for one top-level shape element."""
+    is_sp = elem.tag == qn("p:sp")
+    text = "".join(t.text or "" for t in elem.iterfind("p:txBody//a:t", NS)) if is_sp else ""
+
+    ph = elem.find("*/p:nvPr/p:ph", NS)
+    if ph is not None:
+        idx = int(ph.get("idx", "0"))
+        if idx == 0 and findings["title"] is None:
+            findings["title"] = text
+        if not is_sp or not text.strip():
+            if ph.get("type", "obj") not in IGNORED_PLACEHOLDER_TYPES:
+                name = elem.find("*/p:cNvPr", NS).get("name")
+                findings["empty_placeholders"].append((idx, name))
+
+    if is_sp:
+        for rPr in elem.iterfind("p:txBody/a:p/a:r/a:rPr", NS):
+            latin = rPr.find("a:latin", NS)
+            if latin is not None and latin.get("typeface"):
+                findings["fonts"].add(latin.get("typeface"))
+            srgb = rPr.find("a:solidFill/a:srgbClr", NS)
+            if srgb is not None:
+                findings["colors"].add(srgb.get("val").upper())
+
+def _check_slide_xml(source) -> dict:
+    """
+    Streams one slide part with iterparse, clearing each top-level shape once
+    it has been checked so memory stays bounded by the largest shape.
+    """
+    findings = {"title": None, "empty_placeholders": [], "fonts": set(), "colors": set()}
+
+    for _, elem in etree.iterparse(source, events=("end",)):
+        parent = elem.getparent()
+        if parent is None or parent.tag != SP_TREE:
+            continue
+        if elem.tag in SHAPE_TAGS:
+            _check_shape(elem, findings)
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+    # Placeholders are reported in idx order, as python-pptx iterates them
+    findings["empty_placeholders"] = [name for _, name in sorted(findings["empty_placeholders"], key=lambda p: p[0])]
+    return findings
+
+def _merge_slide_findings(results: dict, slide_findings: list):
+    """Turns per-slide findings into the issues list and deck-wide consistency checks."""
+    fonts = set()
+    colors = set()
+
+    for i, findings in enumerate(slide_findings):
+        # 1. Title Check
+        if findings["title"] is None or not findings["title"].strip():
+            results["issues"].append(f"Slide {i+1}: Missing or empty title.")
+
+        # 2. Structural: Placeholder Usage
+        for name in findings["empty_placeholders"]:
+            results["issues"].append(f"Slide {i+1}: Placeholder '{name}' is empty.")
+
+        fonts.update(findings["fonts"])
+        colors.update(findings["colors"])
+
+    # 3. Visual: Font and Color Consistency
+    if len(fonts) > 3:
+         results["issues"].append(f"High font variety ({len(fonts)} found): {fonts}")
+         results["visual_consistency"] = "Warning"
+
+def _validate_package(file_path: Path, collect_findings) -> dict:
+    """Shared driver for the zip-based validators; collect_findings(zf, slide_parts) returns per-slide findings."""
+    results = {
+        "valid": True,
+        "issues": [],
+        "slide_count": 0,
+        "structural_integrity": "Passed",
+        "visual_consistency": "Passed"
+    }
+
+    if not file_path.exists():
+        results["valid"] = False
+        results["issues"].append("File does not exist.")
+        return results
+
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            slide_parts = slide_part_names(zf)
+            results["slide_count"] = len(slide_parts)
+
+            if results["slide_count"] == 0:
+                results["valid"] = False
+                results["issues"].append("Presentation has no slides.")
+
+            slide_findings = collect_findings(zf, slide_parts)
+
+        _merge_slide_findings(results, slide_findings)
+
+    except Exception as e:
+        results["valid"] = False
+        results["issues"].append(f"Failed to parse PPTX file: {e}")
+
+    return results
+
+def _stream_findings(zf: zipfile.ZipFile, slide_parts: list) -> list:
+    slide_findings = []
+    for part_name in slide_parts:
+        with zf.open(part_name) as source:
+            slide_findings.append(_check_slide_xml(source))
+    return slide_findings
+
+def stream_validate_pptx(file_path: Path) -> dict:
+    """
+    Runs the same checks as validate_pptx by streaming each slide's XML out
+    of the zip instead of loading the whole presentation, so memory is
+    bounded by the largest single slide rather than the deck.
+    """
+    return _validate_package(file_path, _stream_findings)
+
+def _file_signature(path: Path) -> list:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+def _load_validation_cache(cache_path: Path) -> dict:
+    try:
+        with open(cache_path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get("version") == VALIDATION_CACHE_VERSION else {}
+
+def _write_validation_cache(cache_path: Path, cache: dict):
+    tmp_path = cache_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+def incremental_validate_pptx(file_path: Path, cache_path: Path) -> dict:
+    """
+    Streaming validation that caches each slide's findings in cache_path,
+    keyed by a hash of the slide XML and its layout/master parts. Only slides
+    whose key is not cached are re-parsed; the deck-wide checks are rebuilt
+    from the merged findings. If the file is unchanged since the last run the
+    stored result is returned as is. Adds 'slides_rechecked' to the result.
+    """
+    cache = _load_validation_cache(cache_path)
+    # Taken before reading so a write racing with this run invalidates the stored result
+    signature = _file_signature(file_path) if file_path.exists() else None
+    if signature is not None and cache.get("file_signature") == signature and "results" in cache:
+        count("validation_cache_hits", cache["results"]["slide_count"])
+        return dict(cache["results"], slides_rechecked=0)
+
+    cached_slides = cache.get("slides", {})
+    current_slides = {}
+    rechecked = 0
+
+    def collect(zf, slide_parts):
+        nonlocal rechecked
+        part_hashes = {}
+        slide_findings = []
+        for part_name in slide_parts:
+            key, blob = slide_key(zf, part_name, part_hashes)
+            if key in cached_slides:
+                findings = cached_slides[key]
+            else:
+                with span("validate_slide", part=part_name):
+                    findings = _check_slide_xml(io.BytesIO(blob))
+                findings = dict(findings, fonts=sorted(findings["fonts"]), colors=sorted(findings["colors"]))
+                rechecked += 1
+            current_slides[key] = findings
+            slide_findings.append(findings)
+        return slide_findings
+
+    with span("validate"):
+        results = _validate_package(file_path, collect)
+    count("slides_validated", rechecked)
+    count("validation_cache_hits", results["slide_count"] - rechecked)
+
+    if signature is not None and results["valid"]:
+        # Only this deck's current slides are kept, so stale entries are pruned on every run
+        _write_validation_cache(cache_path, {
+            "version": VALIDATION_CACHE_VERSION,
+            "file_signature": signature,
+            "slides": current_slides,
+            "results": results,
+        })
+
+    return dict(results, slides_rechecked=rechecked)
@@ -0,0 +1,200 @@
+"""
+Pre-forked warm workers for SlideDeckMCPTools.
+
+The parent imports the whole backend once (python-pptx, lxml, Pillow, the
+default template), then forks workers that inherit those modules and serve
+tool calls over a Unix socket, one JSON object per line:
+    {"id": 1, "method": "list_all_decks", "params": {}}
+    -> {"id": 1, "result": "..."} or {"id": 1, "error": "..."}
+
+Short-lived tool processes call call() (or `python -m backend.worker call`)
+instead of importing the backend themselves; this module only imports the
+standard library at the top so the client side stays cheap. Dead workers are
+replaced, and with --max-requests a worker exits and is replaced after that
+many calls, closing its connection even if the client meant to send more.
+Editing sessions live in one process, so session tools are refused here;
+use backend.server for those.
+
+    python -m backend.worker serve --workers 4
+    python -m backend.worker call list_all_decks '{"limit": 10}'
+"""
+import argparse
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+
+SOCKET_ENV = "FSP_WORKER_SOCKET"
+DEFAULT_SOCKET = "/tmp/fsp_slide_worker.sock"
+# Everything the tools import lazily, loaded in the parent before forking
+WARM_MODULES = (
+    "mcp_tools", "assets", "batch", "build_cache", "catalog", "compaction", "distributor",
+    "generator", "library", "operations", "packager", "pdf_export", "search", "snapshots", "streaming", "templates",
+    "thumbnails", "validator",
+)
+SESSION_TOOLS = {"open_deck_session", "commit_deck_session", "close_deck_session"}
+LISTEN_BACKLOG = 128
+
+class _Shutdown(Exception):
+    pass
+
+def socket_path() -> str:
+    return os.environ.get(SOCKET_ENV, DEFAULT_SOCKET)
+
+def call(method: str, params: dict = None, path: str = None, timeout: float = None) -> str:
+    """Runs one tool on a warm worker and returns its result string."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path or socket_path())
+        with sock.makefile("rwb") as stream:
+            stream.write(json.dumps({"method": method, "params": params or {}}).encode("utf-8") + b"\n")
+            stream.flush()
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("Worker closed the connection without a response.")
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["result"]
+
+def preload():
+    """Imports every backend module and parses the default template once."""
+    for name in WARM_MODULES:
+        importlib.import_module(f".{name}", __package__)
+    from .templates import get_template
+    get_template()
+
+def _handle(line: bytes) -> dict:
+    import inspect
+    from .mcp_tools import SlideDeckMCPTools
+
+    try:
+        request = json.loads(line)
+        method, params = request.get("method"), request.get("params") or {}
+    except (ValueError, AttributeError):
+        return {"id": None, "error": "Invalid JSON request."}
+    response = {"id": request.get("id")}
+    tool = getattr(SlideDeckMCPTools, method, None) if isinstance(method, str) else None
+    if tool is None or method.startswith("_"):
+        response["error"] = f"Unknown tool '{method}'."
+    elif method in SESSION_TOOLS:
+        response["error"] = f"'{method}' keeps state in one process; use backend.server instead."
+    else:
+        try:
+            inspect.signature(tool).bind(**params)
+        except TypeError as e:
+            response["error"] = f"Invalid params for '{method}': {e}"
+        else:
+            response["result"] = tool(**params)
+    return response
+
+def _worker_loop(listener: socket.socket, max_requests: int):
+    served = 0
+    while not max_requests or served < max_requests:
+        conn, _ = listener.accept()
+        try:
+            with conn, conn.makefile("rwb") as stream:
+                for line in stream:
+                    if line.strip():
+                        stream.write(json.dumps(_handle(line)).encode("utf-8") + b"\n")
+                        stream.flush()
+                        served += 1
+                        # A client that keeps its connection open must not hold the worker past its limit
+                        if served == max_requests:
+                            break
+        except OSError:
+            # The client went away mid-call; keep serving others
+            continue
+
+def _spawn(listener: socket.socket, max_requests: int) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    status = 0
+    try:
+        _worker_loop(listener, max_requests)
+    except BaseException:
+        status = 1
+    finally:
+        os._exit(status)
+
+def serve(path: str = None, workers: int = None, max_requests: int = 0, decks_dir: str = None):
+    """Preloads the backend and keeps `workers` forked workers accepting on the socket until SIGTERM/SIGINT."""
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Warm workers need os.fork; use backend.server on this platform.")
+    path = path or socket_path()
+    workers = workers or os.cpu_count() or 1
+    if decks_dir:
+        from . import deck_manager
+        from pathlib import Path
+        deck_manager.DECKS_DIR = Path(decks_dir)
+    preload()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(LISTEN_BACKLOG)
+
+    def stop(signum, frame):
+        raise _Shutdown()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    children = set()
+    try:
+        for _ in range(workers):
+            children.add(_spawn(listener, max_requests))
+        print(f"Serving {workers} warm workers on {path}", file=sys.stderr, flush=True)
+        while True:
+            pid, _ = os.wait()
+            children.discard(pid)
+            children.add(_spawn(listener, max_requests))
+    except _Shutdown:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        listener.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-forked warm workers for the slide deck tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Preload the backend and serve tool calls")
+    serve_parser.add_argument("--socket", help=f"Unix socket path (default ${SOCKET_ENV} or {DEFAULT_SOCKET})")
+    serve_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    serve_parser.add_argument("--max-requests", type=int, default=0,
+                              help="Replace a worker after this many calls (0: never)")
+    serve_parser.add_argument("--decks-dir", help="Decks root to serve instead of the project's decks/")
+    call_parser = sub.add_parser("call", help="Run one tool on a running worker and print its result")
+    call_parser.add_argument("method")
+    call_parser.add_argument("params", nargs="?", default="{}", help="Tool parameters as a JSON object")
+    call_parser.add_argument("--socket")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket, args.workers, args.max_requests, args.decks_dir)
+        return 0
+    try:
+        print(call(args.method, json.loads(args.params), args.socket))
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Throughput of the parallel batch build/validate runner from 1 up to N workers.
+
+Run from the project root: python -m benchmarks.bench_batch [decks] [slides_per_deck] [max_workers]
+"""
+import os
+import shutil
+import sys
+
+from backend import deck_manager
+from backend.batch import run_batch
+
+from .common import scratch_decks_dir, text_slides, timed
+
+def run(decks: int = 12, slides: int = 100, max_workers: int = None):
+    max_workers = max_workers or os.cpu_count() or 1
+    print(f"{decks} decks x {slides} slides, cpu_count={os.cpu_count()}")
+    print(f"{'workers':>8} {'seconds':>9} {'decks/s':>9} {'failures':>9}")
+
+    with scratch_decks_dir():
+        workers = 1
+        while True:
+            for d in deck_manager.DECKS_DIR.iterdir():
+                if d.is_dir():
+                    shutil.rmtree(d)
+            jobs = [{"deck_name": f"bench_{i}", "slides": text_slides(slides)} for i in range(decks)]
+            seconds, results = timed(run_batch, jobs, workers)
+            failures = sum(not r["ok"] for r in results)
+            print(f"{workers:>8} {seconds:>9.2f} {decks / seconds:>9.2f} {failures:>9}")
+            if workers >= max_workers:
+                break
+            workers = min(workers * 2, max_workers)
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(*args)
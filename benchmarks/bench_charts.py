@@ -0,0 +1,53 @@
+"""
+Large chart series: building a line chart from every point versus from
+its LTTB-downsampled form, plus the ingestion cost with and without NumPy.
+
+Run from the project root: python -m benchmarks.bench_charts [points] [series] [max_points]
+"""
+import math
+import random
+import sys
+
+from backend import chart_ingest, deck_manager
+from backend.generator import _output_path, create_enhanced_deck
+
+from .common import scratch_decks_dir, timed
+
+def chart_spec(points: int, series: int, max_points: int) -> dict:
+    rng = random.Random(7)
+    return {
+        "type": "LINE",
+        "categories": list(range(points)),
+        "series": {
+            f"Series {s + 1}": [math.sin(i / 400 + s) * 100 + rng.gauss(0, 8) for i in range(points)]
+            for s in range(series)
+        },
+        "max_points": max_points,
+    }
+
+def run(points: int = 50000, series: int = 2, max_points: int = 1000):
+    print(f"{points} points x {series} series, budget {max_points} categories")
+    print(f"{'case':>18} {'ms':>10} {'output KB':>10}")
+    with scratch_decks_dir():
+        for name, budget in (("all points", 0), ("downsampled", max_points)):
+            deck_manager.initialize_deck_dir(name.replace(" ", "_"))
+            spec = chart_spec(points, series, budget)
+            seconds, _ = timed(create_enhanced_deck, name.replace(" ", "_"), [{"title": name, "chart_data": spec}])
+            size = _output_path(name.replace(" ", "_")).stat().st_size
+            print(f"{name:>18} {seconds * 1000:>10.1f} {size / 1024:>10.1f}")
+
+    spec = chart_spec(points, series, max_points)
+    numpy_loader = chart_ingest._numpy
+    engines = [("ingest (numpy)", numpy_loader)] if numpy_loader() is not None else []
+    engines.append(("ingest (python)", lambda: None))
+    try:
+        for name, loader in engines:
+            chart_ingest._numpy = loader
+            seconds, _ = timed(chart_ingest.ingest_chart_data, spec)
+            print(f"{name:>18} {seconds * 1000:>10.1f}")
+    finally:
+        chart_ingest._numpy = numpy_loader
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,46 @@
+"""
+Cloning a deck with large assets: full copy versus copy-on-write sharing.
+
+Run from the project root: python -m benchmarks.bench_clone [asset_files] [mb_per_file]
+"""
+import os
+import sys
+
+from backend import deck_manager
+
+from .common import scratch_decks_dir, timed
+
+def disk_usage_mb(paths) -> float:
+    """Allocated size of the files under paths, counting each hardlinked inode once."""
+    seen = set()
+    blocks = 0
+    for path in paths:
+        for root, _, files in os.walk(path):
+            for name in files:
+                st = os.lstat(os.path.join(root, name))
+                if (st.st_dev, st.st_ino) not in seen:
+                    seen.add((st.st_dev, st.st_ino))
+                    blocks += st.st_blocks
+    return blocks * 512 / 2**20
+
+def run(asset_files: int = 40, mb_per_file: int = 5):
+    print(f"source deck: {asset_files} assets x {mb_per_file} MB")
+    print(f"{'mode':>6} {'clone ms':>10} {'disk MB (source + clone)':>26}")
+
+    with scratch_decks_dir() as decks_dir:
+        source = deck_manager.initialize_deck_dir("template")
+        for i in range(asset_files):
+            (source / "assets" / f"media_{i}.bin").write_bytes(os.urandom(mb_per_file * 2**20))
+
+        for mode in deck_manager.CLONE_MODES:
+            seconds, target = timed(deck_manager.clone_deck, "template", f"clone_{mode}", mode)
+            usage = disk_usage_mb([source, target])
+            print(f"{mode:>6} {seconds * 1000:>10.1f} {usage:>26.1f}")
+
+        seconds, _ = timed(deck_manager.materialize_asset, "clone_cow", "media_0.bin")
+        print(f"\nmaterialize one {mb_per_file} MB asset: {seconds * 1000:.1f} ms, "
+              f"disk now {disk_usage_mb([source, decks_dir / 'clone_cow']):.1f} MB")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,140 @@
+"""
+Cold-start cost per tool: each tool is called once in a fresh interpreter
+under `python -X importtime`, and the import time it triggers (beyond a bare
+interpreter) is summed from that report together with the wall time of the
+whole process. The same calls are then timed through a pre-forked warm
+worker (backend.worker), where a fresh client process only pays for its
+socket round trip. "all backend modules" shows what importing everything
+eagerly would cost.
+
+Run from the project root: python -m benchmarks.bench_imports [--repeat N] [--output results.json]
+"""
+from pathlib import Path
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from backend import deck_manager
+from backend.generator import create_enhanced_deck
+
+from .common import scratch_decks_dir
+from .corpus import deck_specs
+
+ROOT = Path(__file__).resolve().parent.parent
+DECK = "bench"
+COLD_CALL = (
+    "import json, sys\n"
+    "from pathlib import Path\n"
+    "from backend import deck_manager\n"
+    "deck_manager.DECKS_DIR = Path(sys.argv[1])\n"
+    "from backend.mcp_tools import SlideDeckMCPTools\n"
+    "getattr(SlideDeckMCPTools, sys.argv[2])(**json.loads(sys.argv[3]))\n"
+)
+WARM_CALL = (
+    "import json, sys\n"
+    "from backend.worker import call\n"
+    "call(sys.argv[2], json.loads(sys.argv[3]), sys.argv[1])\n"
+)
+EAGER_IMPORT = "import backend.worker as w; w.preload()"
+
+def probes(decks_dir: Path) -> dict:
+    """Tool name -> parameters for one representative call against the bench deck."""
+    return {
+        "list_all_decks": {},
+        "search_slides": {"query": "chart"},
+        "asset_report": {"deck_name": DECK},
+        "validate_deck": {"deck_name": DECK},
+        "append_slide": {"deck_name": DECK, "title": "Probe", "content": "Cold start"},
+        "generate_slides": {"deck_name": DECK, "slides": [{"title": "Probe", "content": "Cold start"}]},
+        "preview_slides": {"deck_name": DECK},
+        "distribute_deck": {"deck_name": DECK, "destination_dir": str(decks_dir / "_dist"), "format": "zip"},
+    }
+
+def _import_ms(stderr: str) -> tuple:
+    """Sums the self times of an -X importtime report. Returns (ms, {top-level module: cumulative ms})."""
+    total, top = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        if not name[1:].startswith(" "):
+            top[name.strip()] = int(cumulative_us) / 1000
+    return total / 1000, top
+
+def _run(code: str, *args, importtime: bool = False) -> tuple:
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code] + list(args)
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, check=True)
+    return (time.perf_counter() - start) * 1000, proc.stderr
+
+def _cold(code: str, args: list, baseline_ms: float, repeat: int) -> dict:
+    walls, imports, top = [], [], {}
+    for _ in range(repeat):
+        wall, stderr = _run(code, *args, importtime=True)
+        ms, top = _import_ms(stderr)
+        walls.append(wall)
+        imports.append(ms - baseline_ms)
+    heaviest = sorted(top.items(), key=lambda item: -item[1])[:3]
+    return {
+        "cold_wall_ms": round(statistics.median(walls), 1),
+        "import_ms": round(statistics.median(imports), 1),
+        "heaviest": {name: round(ms, 1) for name, ms in heaviest},
+    }
+
+def _start_worker(socket_path: Path, decks_dir: Path) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "backend.worker", "serve", "--socket", str(socket_path),
+         "--workers", "1", "--decks-dir", str(decks_dir)],
+        cwd=ROOT, stderr=subprocess.PIPE, text=True,
+    )
+    proc.stderr.readline()  # "Serving ..." once the socket is listening
+    return proc
+
+def run(repeat: int = 3) -> dict:
+    _, bare = _run("pass", importtime=True)
+    baseline_ms, _ = _import_ms(bare)
+    results = []
+    with scratch_decks_dir() as decks_dir:
+        deck_manager.initialize_deck_dir(DECK)
+        specs = deck_specs("chart", 3) + deck_specs("table", 3) + deck_specs("image", 3, decks_dir / DECK / "assets")
+        create_enhanced_deck(DECK, specs)
+        calls = probes(decks_dir)
+
+        entry = _cold(EAGER_IMPORT, [], baseline_ms, repeat)
+        results.append(dict(entry, tool="all backend modules"))
+        for tool, params in calls.items():
+            entry = _cold(COLD_CALL, [str(decks_dir), tool, json.dumps(params)], baseline_ms, repeat)
+            results.append(dict(entry, tool=tool))
+
+        socket_path = decks_dir / "worker.sock"
+        worker = _start_worker(socket_path, decks_dir)
+        try:
+            by_tool = {r["tool"]: r for r in results}
+            for tool, params in calls.items():
+                walls = [_run(WARM_CALL, str(socket_path), tool, json.dumps(params))[0] for _ in range(repeat)]
+                by_tool[tool]["warm_wall_ms"] = round(statistics.median(walls), 1)
+        finally:
+            worker.terminate()
+            worker.wait()
+
+    print(f"{'tool':>20} {'import ms':>10} {'cold ms':>9} {'warm ms':>9}  heaviest imports (cumulative ms)")
+    for r in results:
+        heaviest = ", ".join(f"{name} {ms}" for name, ms in r["heaviest"].items())
+        print(f"{r['tool']:>20} {r['import_ms']:>10.1f} {r['cold_wall_ms']:>9.1f} "
+              f"{r.get('warm_wall_ms', float('nan')):>9.1f}  {heaviest}")
+    return {"python": sys.version.split()[0], "cpu_count": os.cpu_count(), "results": results}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start import cost per tool, cold versus warm worker.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per tool; the median is reported")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+    report = run(args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
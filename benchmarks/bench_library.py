@@ -0,0 +1,50 @@
+"""
+Assembling a deck from library slides: regenerating them from their specs
+with create_enhanced_deck versus copying the saved slides with import_slides.
+
+A library deck holds `library_size` standard slides (text, table, chart and
+image, a quarter each); the assembled deck uses `slides` of them in turn.
+
+Run from the project root: python -m benchmarks.bench_library [slides] [library_size]
+"""
+import shutil
+import sys
+
+from backend import deck_manager
+from backend.generator import _output_path, create_enhanced_deck
+from backend.library import import_slides
+
+from .common import scratch_decks_dir, timed
+from .corpus import deck_specs
+
+def run(slides: int = 100, library_size: int = 20):
+    per_kind = max(1, library_size // 4)
+    with scratch_decks_dir():
+        library = deck_manager.initialize_deck_dir("library")
+        specs = (
+            deck_specs("text", per_kind) + deck_specs("table", per_kind)
+            + deck_specs("chart", per_kind) + deck_specs("image", per_kind, library / "assets")
+        )
+        create_enhanced_deck("library", specs)
+        picks = [i % len(specs) for i in range(slides)]
+
+        regenerated = deck_manager.initialize_deck_dir("regenerated")
+        shutil.copytree(library / "assets", regenerated / "assets", dirs_exist_ok=True)
+        regen_seconds, _ = timed(create_enhanced_deck, "regenerated", [specs[i] for i in picks])
+
+        deck_manager.initialize_deck_dir("imported")
+        import_seconds, result = timed(
+            import_slides, "imported", [{"source_deck": "library", "slide_index": i} for i in picks]
+        )
+
+        print(f"{slides} slides from a {len(specs)}-slide library")
+        print(f"{'method':>12} {'ms':>10} {'output KB':>10}")
+        for name, seconds in (("regenerate", regen_seconds), ("import", import_seconds)):
+            size = _output_path("regenerated" if name == "regenerate" else "imported").stat().st_size
+            print(f"{name:>12} {seconds * 1000:>10.1f} {size / 1024:>10.1f}")
+        print(f"\nimport: {result['parts_copied']} parts copied, {result['media_reused']} media parts reused, "
+              f"{regen_seconds / import_seconds:.1f}x faster")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(*args)
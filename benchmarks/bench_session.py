@@ -0,0 +1,33 @@
+"""
+Per-append latency of add_slide_to_deck (load + save per call) versus an
+in-memory DeckSession, sampled as the deck grows.
+
+Run from the project root: python -m benchmarks.bench_session [total_slides]
+"""
+import sys
+
+from backend.deck_manager import initialize_deck_dir
+from backend.generator import add_slide_to_deck
+from backend.session import DeckSession
+
+from .common import scratch_decks_dir, timed
+
+def run(total: int = 200, sample_every: int = 25):
+    with scratch_decks_dir():
+        initialize_deck_dir("bench_file")
+        initialize_deck_dir("bench_session")
+        session = DeckSession("bench_session", max_dirty_slides=0, max_dirty_seconds=0)
+
+        print(f"{'slides':>8} {'file ms/append':>16} {'session ms/append':>18}")
+        for i in range(1, total + 1):
+            spec = {"title": f"Slide {i}", "content": "Benchmark content"}
+            file_t, _ = timed(add_slide_to_deck, "bench_file", spec)
+            session_t, _ = timed(session.append_slide, spec)
+            if i % sample_every == 0 or i == 1:
+                print(f"{i:>8} {file_t * 1000:>16.2f} {session_t * 1000:>18.2f}")
+
+        commit_t, _ = timed(session.commit)
+        print(f"Final session commit of {total} slides: {commit_t * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
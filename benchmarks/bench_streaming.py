@@ -0,0 +1,51 @@
+"""
+Peak memory of generating large data-report decks (charts, tables and
+images in rotation): create_enhanced_deck versus stream_enhanced_deck.
+Each run happens in a fresh interpreter so peak RSS is comparable.
+
+Run from the project root: python -m benchmarks.bench_streaming [slide_counts...]
+"""
+from pathlib import Path
+import sys
+
+from backend import deck_manager
+from backend.generator import create_enhanced_deck
+from backend.streaming import stream_enhanced_deck
+
+from .common import run_isolated, scratch_decks_dir
+from .corpus import deck_specs
+
+MODES = ("normal", "streamed")
+REPORT_KINDS = ("chart", "table", "image")
+
+def report_specs(count: int, assets_dir: Path):
+    """Yields a data-report deck's slide specs lazily, rotating through chart, table and image slides."""
+    pools = {kind: deck_specs(kind, 30, assets_dir) for kind in REPORT_KINDS}
+    for i in range(count):
+        kind = REPORT_KINDS[i % len(REPORT_KINDS)]
+        yield pools[kind][(i // len(REPORT_KINDS)) % 30]
+
+def run_mode(decks_dir: str, mode: str, deck_name: str, count: int):
+    deck_manager.DECKS_DIR = Path(decks_dir)
+    specs = report_specs(count, deck_manager.get_deck_path(deck_name) / "assets")
+    if mode == "streamed":
+        stream_enhanced_deck(deck_name, specs)
+    else:
+        create_enhanced_deck(deck_name, list(specs))
+    return (deck_manager.get_deck_path(deck_name) / "output" / f"{deck_name}.pptx").stat().st_size
+
+def run(counts=(100, 500, 1000, 2000)):
+    print(f"{'slides':>7} {'mode':>9} {'seconds':>9} {'peak MB':>9} {'over start MB':>14} {'file MB':>8}")
+    with scratch_decks_dir() as decks_dir:
+        for count in counts:
+            for mode in MODES:
+                deck_name = f"report_{count}_{mode}"
+                deck_manager.initialize_deck_dir(deck_name)
+                r = run_isolated(run_mode, str(decks_dir), mode, deck_name, count)
+                print(f"{count:>7} {mode:>9} {r['seconds']:>9.2f} {r['peak_rss_mb']:>9.1f} "
+                      f"{r['peak_rss_mb'] - r['baseline_rss_mb']:>14.1f} {r['result'] / 2**20:>8.1f}")
+                deck_manager.delete_deck(deck_name)
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    run(*([args] if args else []))
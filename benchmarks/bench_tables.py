@@ -0,0 +1,55 @@
+"""
+Table and chart construction: python-pptx proxies versus the bulk builders.
+
+Run from the project root: python -m benchmarks.bench_tables
+"""
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+
+from backend.builders import FastCategoryChartData, add_table_fast
+
+from .common import timed
+
+def _table_data(rows: int, cols: int) -> list:
+    return [[f"R{r}C{c}" if r == 0 else r * cols + c for c in range(cols)] for r in range(rows)]
+
+def proxy_table(slide, data):
+    rows, cols = len(data), len(data[0])
+    table = slide.shapes.add_table(rows, cols, Inches(0.5), Inches(1.5), Inches(9), Inches(5)).table
+    for r in range(rows):
+        for c in range(cols):
+            table.cell(r, c).text = str(data[r][c])
+
+def fast_table(slide, data):
+    add_table_fast(slide, data, Inches(0.5), Inches(1.5), Inches(9), Inches(5))
+
+def add_charts(chart_data_cls, count: int, distinct: int):
+    prs = Presentation()
+    for i in range(count):
+        chart_data = chart_data_cls()
+        chart_data.categories = [f"Cat {c}" for c in range(12)]
+        for s in range(3):
+            chart_data.add_series(f"Series {s}", [(i % distinct) + c * s for c in range(12)])
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(0.5), Inches(1.5),
+                               Inches(9), Inches(5), chart_data)
+
+def run():
+    print(f"{'table':>8} {'proxy ms':>10} {'bulk ms':>10} {'speedup':>8}")
+    for rows, cols in ((50, 20), (500, 10)):
+        data = _table_data(rows, cols)
+        prs = Presentation()
+        proxy_t, _ = timed(proxy_table, prs.slides.add_slide(prs.slide_layouts[5]), data)
+        fast_t, _ = timed(fast_table, prs.slides.add_slide(prs.slide_layouts[5]), data)
+        print(f"{f'{rows}x{cols}':>8} {proxy_t * 1000:>10.1f} {fast_t * 1000:>10.1f} {proxy_t / fast_t:>7.1f}x")
+
+    print(f"\n{'charts':>8} {'distinct':>9} {'XlsxWriter ms':>14} {'fast ms':>9}")
+    for count, distinct in ((100, 100), (100, 5)):
+        slow_t, _ = timed(add_charts, CategoryChartData, count, distinct)
+        fast_t, _ = timed(add_charts, FastCategoryChartData, count, distinct)
+        print(f"{count:>8} {distinct:>9} {slow_t * 1000:>14.1f} {fast_t * 1000:>9.1f}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,52 @@
+"""
+Compares validate_pptx (python-pptx object model) with stream_validate_pptx
+(iterparse over the slide XML) on synthetic image-heavy decks. Each run
+happens in a fresh interpreter so peak RSS is comparable.
+
+Run from the project root: python -m benchmarks.bench_validator [sizes...]
+"""
+from pathlib import Path
+import os
+import sys
+
+from PIL import Image
+
+from backend.deck_manager import initialize_deck_dir
+from backend.generator import create_enhanced_deck
+from backend.validator import stream_validate_pptx, validate_pptx
+
+from .common import run_isolated, scratch_decks_dir, text_slides
+
+IMAGE_EVERY = 5
+
+def build_deck(deck_name: str, count: int) -> Path:
+    """Builds a deck where every fifth slide carries its own noise image."""
+    deck_path = initialize_deck_dir(deck_name)
+    slides = text_slides(count)
+    for i in range(0, count, IMAGE_EVERY):
+        image_name = f"noise_{i}.png"
+        Image.frombytes("RGB", (200, 200), os.urandom(200 * 200 * 3)).save(deck_path / "assets" / image_name)
+        slides[i] = {"title": f"Image {i}", "image": image_name}
+    return create_enhanced_deck(deck_name, slides)
+
+def _comparable(results: dict) -> dict:
+    return {k: v for k, v in results.items() if k != "issues"} | {"issues": sorted(results["issues"])}
+
+def run(sizes=(10, 100, 1000)):
+    with scratch_decks_dir():
+        print(f"{'slides':>7} {'size MB':>8} {'engine':>8} {'seconds':>9} {'peak RSS MB':>12} {'over baseline':>14}")
+        for count in sizes:
+            output = build_deck(f"bench_{count}", count)
+            size_mb = output.stat().st_size / 1e6
+            runs = {
+                "object": run_isolated(validate_pptx, output),
+                "stream": run_isolated(stream_validate_pptx, output),
+            }
+            for engine, outcome in runs.items():
+                print(f"{count:>7} {size_mb:>8.1f} {engine:>8} {outcome['seconds']:>9.3f} "
+                      f"{outcome['peak_rss_mb']:>12.1f} {outcome['peak_rss_mb'] - outcome['baseline_rss_mb']:>14.1f}")
+            if _comparable(runs["object"]["result"]) != _comparable(runs["stream"]["result"]):
+                print(f"   WARNING: engines disagree on the {count}-slide deck")
+
+if __name__ == "__main__":
+    run(tuple(int(a) for a in sys.argv[1:]) or (10, 100, 1000))
@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+from pathlib import Path
+import multiprocessing
+import queue as queue_module
+import shutil
+import tempfile
+import time
+import traceback
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from backend import deck_manager
+
+# How often the parent checks that an isolated run is still alive
+POLL_SECONDS = 1.0
+
+class IsolatedRunError(RuntimeError):
+    """Raised by run_isolated when the benchmarked call failed or its process died."""
+
+@contextmanager
+def scratch_decks_dir():
+    """Points the backend at a temporary decks directory for the duration of a benchmark."""
+    original = deck_manager.DECKS_DIR
+    tmp = Path(tempfile.mkdtemp(prefix="fsp_bench_"))
+    deck_manager.DECKS_DIR = tmp
+    try:
+        yield tmp
+    finally:
+        deck_manager.DECKS_DIR = original
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def text_slides(count: int) -> list:
+    """Synthetic title-and-bullets slide specs."""
+    return [
+        {
+            "title": f"Slide {i + 1}",
+            "bullet_points": [f"Point {j + 1} of slide {i + 1}" for j in range(4)],
+        }
+        for i in range(count)
+    ]
+
+def timed(fn, *args, **kwargs):
+    """Runs fn once and returns (seconds, result)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def _max_rss_mb():
+    """Peak RSS of this process in MB, or None when the platform offers no way to read it."""
+    # VmHWM resets on exec; ru_maxrss is inherited from the parent on Linux
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    # peak_wset is the Windows peak working set; elsewhere only the current RSS is known
+    return getattr(info, "peak_wset", info.rss) / 1048576
+
+def _isolated_child(queue, fn, args):
+    try:
+        baseline = _max_rss_mb()
+        if baseline is None:
+            # No RSS source: report the peak of Python allocations instead
+            tracemalloc.start()
+        seconds, result = timed(fn, *args)
+        if baseline is None:
+            baseline, peak = 0.0, tracemalloc.get_traced_memory()[1] / 1048576
+        else:
+            peak = _max_rss_mb()
+        queue.put({"seconds": seconds, "peak_rss_mb": peak, "baseline_rss_mb": baseline, "result": result})
+    except BaseException as e:
+        queue.put({"error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()})
+
+def run_isolated(fn, *args) -> dict:
+    """
+    Runs fn(*args) in a fresh interpreter so its peak RSS is not polluted by
+    earlier runs. fn must be importable and its result picklable. Raises
+    IsolatedRunError if fn raises or the process dies without reporting.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_isolated_child, args=(queue, fn, args))
+    proc.start()
+    outcome = None
+    try:
+        while outcome is None:
+            # Checked before waiting, so a result queued just before the process exited is still read
+            alive = proc.is_alive()
+            try:
+                outcome = queue.get(timeout=POLL_SECONDS)
+            except queue_module.Empty:
+                if not alive:
+                    raise IsolatedRunError(f"benchmark process exited with code {proc.exitcode}") from None
+    finally:
+        proc.join()
+    if "error" in outcome:
+        raise IsolatedRunError(f"{outcome['error']}\n{outcome['traceback']}")
+    return outcome
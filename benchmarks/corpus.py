@@ -0,0 +1,77 @@
+"""
+Synthetic slide specs for benchmarking, in four flavours that stress
+different parts of the backend: text, tables, charts and images.
+Content is deterministic for a given kind and size.
+"""
+from pathlib import Path
+import random
+
+from PIL import Image
+
+from .common import text_slides
+
+KINDS = ("text", "table", "chart", "image")
+SIZES = (10, 100, 1000)
+TABLE_SHAPE = (12, 6)
+CHART_CATEGORIES = 12
+CHART_SERIES = 3
+IMAGE_SIZE = (640, 480)
+# Distinct images per image deck; slides cycle through them like a real deck reusing branding
+IMAGE_POOL = 20
+
+def _table_slides(count: int, rng: random.Random) -> list:
+    rows, cols = TABLE_SHAPE
+    return [
+        {
+            "title": f"Table {i + 1}",
+            "table_data": [[f"Column {c + 1}" for c in range(cols)]]
+                          + [[rng.randint(0, 10_000) for _ in range(cols)] for _ in range(rows - 1)],
+        }
+        for i in range(count)
+    ]
+
+def _chart_slides(count: int, rng: random.Random) -> list:
+    return [
+        {
+            "title": f"Chart {i + 1}",
+            "chart_data": {
+                "categories": [f"Q{c + 1}" for c in range(CHART_CATEGORIES)],
+                "series": {
+                    f"Series {s + 1}": [round(rng.uniform(0, 100), 2) for _ in range(CHART_CATEGORIES)]
+                    for s in range(CHART_SERIES)
+                },
+            },
+        }
+        for i in range(count)
+    ]
+
+def _write_images(assets_dir: Path, rng: random.Random) -> list:
+    """Photo-like gradients with noise, saved as JPEG so they behave like real assets."""
+    names = []
+    width, height = IMAGE_SIZE
+    for n in range(IMAGE_POOL):
+        base = Image.linear_gradient("L").resize(IMAGE_SIZE).convert("RGB")
+        noise = Image.frombytes("RGB", IMAGE_SIZE, rng.randbytes(width * height * 3))
+        name = f"synthetic_{n}.jpg"
+        Image.blend(base, noise, 0.3).save(assets_dir / name, quality=90)
+        names.append(name)
+    return names
+
+def _image_slides(count: int, rng: random.Random, assets_dir: Path) -> list:
+    names = _write_images(assets_dir, rng)
+    return [{"title": f"Image {i + 1}", "image": names[i % len(names)]} for i in range(count)]
+
+def deck_specs(kind: str, count: int, assets_dir: Path = None) -> list:
+    """Slide specs for a synthetic deck. Image decks write their assets into assets_dir."""
+    rng = random.Random(f"{kind}:{count}")
+    if kind == "text":
+        return text_slides(count)
+    if kind == "table":
+        return _table_slides(count, rng)
+    if kind == "chart":
+        return _chart_slides(count, rng)
+    if kind == "image":
+        if assets_dir is None:
+            raise ValueError("Image decks need an assets directory.")
+        return _image_slides(count, rng, assets_dir)
+    raise ValueError(f"Unknown deck kind '{kind}'. Use one of {', '.join(KINDS)}.")
@@ -0,0 +1,167 @@
+"""
+Benchmark suite over the synthetic deck corpus.
+
+Times create_enhanced_deck, an add_slide_to_deck loop, validate_pptx,
+clone_deck and package_assets for each deck kind and size, every case in a
+fresh interpreter so peak RSS is comparable, and writes the results as
+JSON. Cases that read a built deck get one built outside the timed run when
+no earlier case produced it. A case that raises is reported with its error
+and makes the run exit with status 1. With --baseline, results are compared against an earlier run and
+regressions beyond the threshold are flagged (exit status 1).
+
+Run from the project root:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --sizes 10 100 --baseline results.json
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import json
+import os
+import platform
+import sys
+
+import pptx
+
+from backend import deck_manager
+from backend.distributor import package_assets
+from backend.generator import add_slide_to_deck, create_enhanced_deck
+from backend.validator import validate_pptx
+
+from .common import IsolatedRunError, run_isolated, scratch_decks_dir
+from .corpus import KINDS, SIZES, deck_specs
+
+CASES = ("create_enhanced_deck", "add_slide_loop", "validate_pptx", "clone_deck", "package_assets")
+# Cases that read the deck create_enhanced_deck writes
+NEEDS_OUTPUT = {"validate_pptx", "clone_deck", "package_assets"}
+# add_slide_to_deck reloads and saves the whole deck per call; longer loops only measure that cost again
+ADD_LOOP_MAX = 100
+DEFAULT_THRESHOLD = 0.2
+# Differences below these are treated as noise whatever the ratio
+MIN_SECONDS_DELTA = 0.02
+MIN_RSS_DELTA_MB = 5.0
+
+def run_case(decks_dir: str, case: str, deck_name: str, specs: list):
+    """Runs one case against decks_dir; executed inside the isolated child process."""
+    deck_manager.DECKS_DIR = Path(decks_dir)
+    if case == "create_enhanced_deck":
+        create_enhanced_deck(deck_name, specs)
+    elif case == "add_slide_loop":
+        loop_deck = f"{deck_name}_loop"
+        deck_manager.initialize_deck_dir(loop_deck)
+        for slide_data in specs[:ADD_LOOP_MAX]:
+            add_slide_to_deck(loop_deck, {k: v for k, v in slide_data.items() if k != "image"})
+    elif case == "validate_pptx":
+        validate_pptx(deck_manager.get_deck_path(deck_name) / "output" / f"{deck_name}.pptx")
+    elif case == "clone_deck":
+        deck_manager.clone_deck(deck_name, f"{deck_name}_clone")
+    elif case == "package_assets":
+        package_assets(deck_name, Path(decks_dir) / "_dist")
+    return None
+
+def _metadata() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "python_pptx": pptx.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def run_suite(kinds=KINDS, sizes=SIZES, cases=CASES, repeat: int = 1, log=print) -> dict:
+    results = []
+    with scratch_decks_dir() as decks_dir:
+        for kind in kinds:
+            for size in sizes:
+                deck_name = f"{kind}_{size}"
+                deck_path = deck_manager.initialize_deck_dir(deck_name)
+                specs = deck_specs(kind, size, deck_path / "assets")
+                output = deck_path / "output" / f"{deck_name}.pptx"
+                for case in cases:
+                    if case in NEEDS_OUTPUT and not output.exists():
+                        # Untimed setup, so the case never measures a missing deck
+                        create_enhanced_deck(deck_name, specs)
+                    runs = []
+                    try:
+                        for _ in range(repeat):
+                            # Cases that create decks must start from a clean slate on every repeat
+                            for leftover in (f"{deck_name}_loop", f"{deck_name}_clone"):
+                                if (decks_dir / leftover).exists():
+                                    deck_manager.delete_deck(leftover)
+                            runs.append(run_isolated(run_case, str(decks_dir), case, deck_name, specs))
+                    except IsolatedRunError as e:
+                        error = str(e).splitlines()[0]
+                        results.append({"kind": kind, "slides": size, "case": case, "error": str(e)})
+                        log(f"{kind:>6} {size:>5} {case:>22}    FAILED {error}")
+                        continue
+                    best = min(runs, key=lambda r: r["seconds"])
+                    entry = {
+                        "kind": kind,
+                        "slides": size,
+                        "case": case,
+                        "seconds": round(best["seconds"], 4),
+                        "peak_rss_mb": round(max(r["peak_rss_mb"] for r in runs), 1),
+                        "rss_over_baseline_mb": round(max(r["peak_rss_mb"] - r["baseline_rss_mb"] for r in runs), 1),
+                    }
+                    if case == "add_slide_loop":
+                        entry["iterations"] = min(size, ADD_LOOP_MAX)
+                    results.append(entry)
+                    log(f"{kind:>6} {size:>5} {case:>22} {entry['seconds']:>9.3f}s {entry['peak_rss_mb']:>8.1f} MB")
+    return {"meta": _metadata(), "results": results}
+
+def _key(entry: dict) -> tuple:
+    return entry["kind"], entry["slides"], entry["case"]
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Returns the cases that got slower or bigger than baseline by more than threshold."""
+    previous = {_key(e): e for e in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        old = previous.get(_key(entry))
+        if old is None or "error" in entry or "error" in old:
+            continue
+        for metric, min_delta in (("seconds", MIN_SECONDS_DELTA), ("peak_rss_mb", MIN_RSS_DELTA_MB)):
+            before, after = old[metric], entry[metric]
+            if after - before > min_delta and after > before * (1 + threshold):
+                regressions.append({
+                    "kind": entry["kind"], "slides": entry["slides"], "case": entry["case"],
+                    "metric": metric, "baseline": before, "current": after,
+                    "change": f"{(after / before - 1) * 100:+.0f}%" if before else "new",
+                })
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the deck backend on synthetic decks.")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case; the fastest is kept")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown or memory growth that counts as a regression")
+    args = parser.parse_args(argv)
+
+    # Progress goes to stderr so stdout stays machine-readable
+    results = run_suite(args.kinds, args.sizes, args.cases, args.repeat,
+                        log=lambda line: print(line, file=sys.stderr))
+    failures = [e for e in results["results"] if "error" in e]
+    status = 1 if failures else 0
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        results["regressions"] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['kind']} {r['slides']} {r['case']} {r['metric']}: "
+                  f"{r['baseline']} -> {r['current']} ({r['change']})", file=sys.stderr)
+        status = 1 if regressions or failures else 0
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
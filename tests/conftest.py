@@ -0,0 +1,36 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend import deck_manager, session  # noqa: E402
+
+@pytest.fixture
+def decks_dir(tmp_path, monkeypatch):
+    """Points the backend at an empty decks directory, with no open sessions, for one test."""
+    monkeypatch.setattr(deck_manager, "DECKS_DIR", tmp_path)
+    monkeypatch.setattr(session, "_SESSIONS", {})
+    return tmp_path
+
+@pytest.fixture
+def deck(decks_dir):
+    """Returns a function that creates a deck with one text slide per title."""
+    from backend.generator import create_enhanced_deck
+
+    def make(name: str, titles: list) -> str:
+        deck_manager.initialize_deck_dir(name)
+        create_enhanced_deck(name, [{"title": t, "content": f"Body of {t}"} for t in titles])
+        return name
+    return make
+
+@pytest.fixture
+def titles():
+    """Returns a function that reads the slide titles of a deck's saved output."""
+    from pptx import Presentation
+    from backend.generator import _output_path
+
+    def read(deck_name: str) -> list:
+        return [slide.shapes.title.text for slide in Presentation(_output_path(deck_name)).slides]
+    return read
@@ -0,0 +1,67 @@
+import io
+
+from PIL import Image, PngImagePlugin
+
+from backend.assets import prepare_image
+
+GPS_IFD = 0x8825
+ORIENTATION = 0x0112
+
+def _noisy(size=(256, 192)) -> Image.Image:
+    img = Image.new("RGB", size)
+    img.putdata([((x * 37) % 256, (y * 91) % 256, (x * y) % 256) for y in range(size[1]) for x in range(size[0])])
+    return img
+
+def _jpeg(orientation: int = 1, quality: int = 20) -> bytes:
+    exif = Image.Exif()
+    exif[ORIENTATION] = orientation
+    exif[0x010F] = "PhoneMaker"
+    exif.get_ifd(GPS_IFD).update({1: "N", 2: (52.0, 31.0, 12.0)})
+    buf = io.BytesIO()
+    # At low quality the pipeline's re-encode comes out larger and the original encoding is kept
+    _noisy().save(buf, format="JPEG", quality=quality, exif=exif, comment=b"private note")
+    return buf.getvalue()
+
+def test_jpeg_loses_exif_gps_and_comments(tmp_path):
+    for quality in (20, 100):
+        source = tmp_path / f"photo_{quality}.jpg"
+        source.write_bytes(_jpeg(quality=quality))
+        derived = prepare_image(tmp_path, source)
+        data = derived.read_bytes()
+        assert b"PhoneMaker" not in data and b"private note" not in data
+        # quality 20 keeps the original encoded pixels, quality 100 is re-encoded smaller
+        assert (data[-1000:] == source.read_bytes()[-1000:]) == (quality == 20)
+        with Image.open(derived) as img:
+            assert not img.getexif()
+            assert img.size == (256, 192)
+            img.load()
+
+def test_rotated_jpeg_is_reencoded_upright(tmp_path):
+    source = tmp_path / "rotated.jpg"
+    source.write_bytes(_jpeg(orientation=6))
+    with Image.open(prepare_image(tmp_path, source)) as img:
+        assert img.size == (192, 256)
+        assert not img.getexif()
+
+def test_kept_png_loses_text_chunks(tmp_path):
+    info = PngImagePlugin.PngInfo()
+    info.add_text("Author", "Someone Private")
+    img = Image.new("P", (8, 8))
+    source = tmp_path / "logo.png"
+    img.save(source, format="PNG", pnginfo=info)
+    data = prepare_image(tmp_path, source).read_bytes()
+    assert b"Someone Private" not in data
+    with Image.open(io.BytesIO(data)) as derived:
+        derived.load()
+
+def test_animated_gif_loses_comments(tmp_path):
+    frames = [Image.new("P", (8, 8)) for _ in range(3)]
+    for i, frame in enumerate(frames):
+        frame.putpixel((i, i), 1)
+    source = tmp_path / "anim.gif"
+    frames[0].save(source, save_all=True, append_images=frames[1:], loop=0, comment=b"private note")
+    data = prepare_image(tmp_path, source).read_bytes()
+    assert b"private note" not in data
+    with Image.open(io.BytesIO(data)) as derived:
+        assert derived.n_frames == 3
+        assert derived.info.get("loop") == 0
@@ -0,0 +1,20 @@
+from backend.batch import group_jobs, run_batch
+
+def test_group_jobs_keeps_one_group_per_deck_in_order():
+    jobs = ["A", {"deck_name": "B", "slides": []}, {"deck_name": "A", "slides": []}, {"slides": []}, {}]
+    assert group_jobs(jobs) == [["A", {"deck_name": "A", "slides": []}], [{"deck_name": "B", "slides": []}],
+                                [{"slides": []}], [{}]]
+
+def test_jobs_for_the_same_deck_run_in_order(decks_dir, titles):
+    jobs = [
+        {"deck_name": "Twice", "slides": [{"title": f"First {i}"} for i in range(6)]},
+        {"deck_name": "Other", "slides": [{"title": "Only"}]},
+        {"deck_name": "Twice", "slides": [{"title": "Second"}]},
+        "Twice",
+    ]
+    results = run_batch(jobs, workers=2)
+    twice = [r for r in results if r["deck_name"] == "Twice"]
+    assert len(results) == 4 and all(r["ok"] for r in results), results
+    assert [r["validation"]["slide_count"] for r in twice] == [6, 1, 1]
+    assert [r["build"] is not None for r in twice] == [True, True, False]
+    assert titles("Twice") == ["Second"]
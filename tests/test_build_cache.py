@@ -0,0 +1,33 @@
+import warnings
+import zipfile
+
+from backend import deck_manager
+from backend.build_cache import build_deck
+from backend.generator import _output_path
+from backend.opc import slide_part_names
+
+def _slides(deck_name: str) -> list:
+    with zipfile.ZipFile(_output_path(deck_name)) as zf:
+        return [(name, zf.read(name)) for name in slide_part_names(zf)]
+
+def _specs(titles: list) -> list:
+    return [{"title": t, "bullet_points": [f"{t} point {i}" for i in range(3)]} for t in titles]
+
+def test_patched_build_matches_full_build(decks_dir):
+    old = _specs([f"S{i}" for i in range(10)])
+    chart = {"title": "Chart", "chart_data": {"categories": ["a", "b"], "series": {"s": [1, 2]}}}
+    table = {"title": "Table", "table_data": [["h1", "h2"], ["1", "2"]]}
+    new = old[:3] + _specs(["Changed"]) + old[4:6] + [chart, table]
+    for name in ("Patched", "Full"):
+        deck_manager.initialize_deck_dir(name)
+    build_deck("Patched", old)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = build_deck("Patched", new)
+    assert result["mode"] == "patched"
+    build_deck("Full", new, use_cache=False)
+
+    patched, full = _slides("Patched"), _slides("Full")
+    assert [name for name, _ in patched] == [name for name, _ in full]
+    for (name, patched_xml), (_, full_xml) in zip(patched, full):
+        assert patched_xml == full_xml, name
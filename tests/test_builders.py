@@ -0,0 +1,94 @@
+import io
+import zipfile
+
+from lxml import etree
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.util import Inches
+
+from backend.builders import (
+    FastCategoryChartData, add_table_fast, iter_slide_specs, paginate_slide_specs, table_page_count,
+)
+
+SHEET_NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+def _blank_slide():
+    prs = Presentation()
+    return prs.slides.add_slide(prs.slide_layouts[6])
+
+def test_add_table_fast_matches_python_pptx_markup():
+    data = [["Name", "Notes"], ["Ada", "line one\nline two"], ["Bob & Co", "tab\there\x07bell"]]
+    geometry = (Inches(1), Inches(1), Inches(6), Inches(3))
+
+    fast_slide = _blank_slide()
+    fast = add_table_fast(fast_slide, data, *geometry)
+
+    slow_slide = _blank_slide()
+    slow = slow_slide.shapes.add_table(len(data), len(data[0]), *geometry)
+    for r, row in enumerate(data):
+        for c, value in enumerate(row):
+            slow.table.cell(r, c).text = value
+
+    assert etree.tostring(fast) == etree.tostring(slow._element)
+
+def test_tables_paginate_with_repeated_header():
+    table = [["h"]] + [[str(i)] for i in range(7)]
+    spec = {"title": "T", "table_data": table, "table_max_rows": 4}
+    assert table_page_count(spec) == 3
+    assert table_page_count({"title": "T", "table_data": table}) == 1
+    pages = paginate_slide_specs([{"title": "Intro"}, spec])
+    assert [p["title"] for p in pages] == ["Intro", "T", "T (cont.)", "T (cont.)"]
+    assert [p["table_data"] for p in pages[1:]] == [table[:4], table[:1] + table[4:7], table[:1] + table[7:]]
+    assert next(iter_slide_specs(iter([spec])))["table_data"] == table[:4]
+
+def _sheet(chart_data) -> etree._Element:
+    with zipfile.ZipFile(io.BytesIO(chart_data._workbook_writer.xlsx_blob)) as zf:
+        return etree.fromstring(zf.read("xl/worksheets/sheet1.xml"))
+
+def _cells(sheet) -> dict:
+    return {
+        c.get("r"): c.findtext("x:v", namespaces=SHEET_NS) or c.findtext("x:is/x:t", namespaces=SHEET_NS)
+        for c in sheet.iterfind(".//x:c", SHEET_NS)
+    }
+
+def test_fast_workbook_holds_the_chart_values():
+    chart_data = FastCategoryChartData()
+    chart_data.categories = ["North", "South"]
+    chart_data.add_series("Revenue", [1.5, 2])
+    chart_data.add_series("Cost", [1, None])
+    assert _cells(_sheet(chart_data)) == {
+        "B1": "Revenue", "C1": "Cost", "A2": "North", "B2": "1.5", "C2": "1", "A3": "South", "B3": "2",
+    }
+    again = FastCategoryChartData()
+    again.categories = ["North", "South"]
+    again.add_series("Revenue", [1.5, 2])
+    again.add_series("Cost", [1, None])
+    assert again._workbook_writer.xlsx_blob is chart_data._workbook_writer.xlsx_blob
+
+def test_fast_workbook_drops_xml_illegal_characters():
+    chart_data = FastCategoryChartData()
+    chart_data.categories = ["A\x01B", "tab\tkept"]
+    chart_data.add_series("Bell\x07\ufffe", [1, 2])
+    cells = _cells(_sheet(chart_data))
+    assert cells["A2"] == "AB" and cells["A3"] == "tab\tkept" and cells["B1"] == "Bell"
+
+def test_non_general_formats_fall_back_to_xlsxwriter():
+    chart_data = FastCategoryChartData(number_format="0.0%")
+    chart_data.categories = ["A"]
+    chart_data.add_series("S", [0.5])
+    reference = CategoryChartData(number_format="0.0%")
+    reference.categories = ["A"]
+    reference.add_series("S", [0.5])
+    with zipfile.ZipFile(io.BytesIO(chart_data._workbook_writer.xlsx_blob)) as fast, \
+            zipfile.ZipFile(io.BytesIO(reference._workbook_writer.xlsx_blob)) as slow:
+        assert fast.namelist() == slow.namelist()
+
+def test_chart_slides_with_control_characters_build(deck):
+    from backend.generator import _output_path, create_enhanced_deck
+    deck("Ctrl", ["Intro"])
+    create_enhanced_deck("Ctrl", [{"title": "Chart", "chart_data": {
+        "categories": ["North\x01", "South"], "series": {"Revenue\x07": [1, 2]},
+    }}])
+    chart = Presentation(_output_path("Ctrl")).slides[0].shapes[-1].chart
+    assert list(chart.plots[0].categories) == ["North", "South"]
+    assert chart.series[0].name == "Revenue"
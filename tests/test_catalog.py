@@ -0,0 +1,36 @@
+import sqlite3
+
+from backend import deck_manager
+from backend.catalog import (
+    catalog_path, deck_names, query_decks, rebuild_catalog, remove_deck, set_build_hash, sync_deck,
+)
+
+def test_first_sync_indexes_existing_decks(decks_dir):
+    for name in ("Existing", "Other"):
+        (decks_dir / name).mkdir()
+    deck_manager.initialize_deck_dir("New")
+    sync_deck("New")
+    assert catalog_path().exists()
+    assert deck_names() == ["Existing", "New", "Other"]
+
+def test_every_call_closes_its_connection(decks_dir, monkeypatch):
+    opened = []
+
+    class Tracked(sqlite3.Connection):
+        closed = False
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args, **kwargs: opened.append(
+        connect(*args, factory=Tracked, **kwargs)) or opened[-1])
+    deck_manager.initialize_deck_dir("Deck")
+    sync_deck("Deck")
+    set_build_hash("Deck", ["abc"])
+    query_decks()
+    deck_names()
+    rebuild_catalog()
+    remove_deck("Deck")
+    assert opened and all(conn.closed for conn in opened)
@@ -0,0 +1,49 @@
+import math
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend import chart_ingest
+
+ENGINES = ["python"] + (["numpy"] if chart_ingest._numpy() is not None else [])
+
+@pytest.fixture(params=ENGINES)
+def engine(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(chart_ingest, "_numpy", lambda: None)
+    return request.param
+
+def _spec(points: int, series: int, max_points: int) -> dict:
+    rng = random.Random(3)
+    return {
+        "categories": list(range(points)),
+        "series": {f"S{s}": [math.sin(i / 50 + s) * 10 ** s + rng.gauss(0, 1) for i in range(points)]
+                   for s in range(series)},
+        "max_points": max_points,
+    }
+
+@pytest.mark.parametrize("series", [1, 3, 7])
+@pytest.mark.parametrize("max_points", [2, 10, 100])
+def test_downsampling_stays_within_budget(engine, series, max_points):
+    result = chart_ingest.ingest_chart_data(_spec(2000, series, max_points))
+    assert len(result["categories"]) == max_points
+    assert result["reduction"]["engine"] == engine
+    assert all(len(values) == max_points for values in result["series"].values())
+    assert result["categories"][0] == 0 and result["categories"][-1] == 1999
+
+def test_engines_pick_the_same_points(monkeypatch):
+    if "numpy" not in ENGINES:
+        pytest.skip("NumPy is not installed")
+    spec = _spec(5000, 3, 200)
+    vectorized = chart_ingest.ingest_chart_data(spec)["categories"]
+    monkeypatch.setattr(chart_ingest, "_numpy", lambda: None)
+    assert chart_ingest.ingest_chart_data(spec)["categories"] == vectorized
+
+def test_generator_import_does_not_load_numpy():
+    code = "import sys, backend.generator, backend.builders; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parent.parent,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
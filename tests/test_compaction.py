@@ -0,0 +1,65 @@
+import re
+import zipfile
+
+from PIL import Image
+from pptx import Presentation
+
+from backend import deck_manager
+from backend.compaction import compact_deck
+from backend.generator import _output_path, create_enhanced_deck
+from backend.opc import slide_part_names
+
+def _rewrite(path, edits: dict):
+    """Rewrites zip members of path through edits (member name -> fn(bytes) -> bytes, or bytes to add)."""
+    with zipfile.ZipFile(path) as zf:
+        members = {info.filename: zf.read(info) for info in zf.infolist()}
+    for name, edit in edits.items():
+        members[name] = edit(members[name]) if callable(edit) else edit
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+
+def _slides(path) -> list:
+    with zipfile.ZipFile(path) as zf:
+        return [zf.read(name) for name in slide_part_names(zf)]
+
+def test_compaction_drops_dead_slides_and_duplicate_media(deck):
+    deck("Pack", ["Intro"])
+    Image.new("RGB", (64, 48), "teal").save(deck_manager.get_deck_path("Pack") / "assets" / "logo.png")
+    create_enhanced_deck("Pack", [
+        {"title": "Intro"},
+        {"title": "Logo", "image": "logo.png"},
+        {"title": "Logo again", "image": "logo.png"},
+        {"title": "Outro"},
+    ])
+    output = _output_path("Pack")
+    with zipfile.ZipFile(output) as zf:
+        media = [n for n in zf.namelist() if n.startswith("ppt/media/")]
+        assert len(media) == 1
+        image = zf.read(media[0])
+        slide4_rid = re.search(rb'Id="(rId\d+)"[^>]*Target="slides/slide4.xml"', zf.read("ppt/_rels/presentation.xml.rels"))
+    # Second image slide points at a byte-identical copy; the last slide leaves the slide list but keeps its part
+    _rewrite(output, {
+        "ppt/media/copy.png": image,
+        "ppt/slides/_rels/slide3.xml.rels": lambda b: b.replace(media[0].split("/")[-1].encode(), b"copy.png"),
+        "ppt/presentation.xml": lambda b: re.sub(rb'<p:sldId [^>]*r:id="%s"/>' % slide4_rid.group(1), b"", b),
+    })
+    before = _slides(output)
+    assert len(before) == 3
+
+    stats = compact_deck("Pack")
+    assert stats["duplicate_media_removed"] == 1
+    assert stats["orphaned_slide_relationships_removed"] == 1
+    assert stats["unreachable_parts_removed"] >= 1
+    assert stats["bytes_after"] < stats["bytes_before"]
+    with zipfile.ZipFile(output) as zf:
+        names = zf.namelist()
+        assert zf.testzip() is None
+    assert "ppt/slides/slide4.xml" not in names
+    assert len([n for n in names if n.startswith("ppt/media/")]) == 1
+    assert _slides(output) == before
+
+    prs = Presentation(output)
+    assert [s.shapes.title.text if s.shapes.title else None for s in prs.slides] == ["Intro", None, None]
+    pictures = [shape.image.blob for slide in list(prs.slides)[1:] for shape in slide.shapes if shape.shape_type == 13]
+    assert pictures == [image, image]
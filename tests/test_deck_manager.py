@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from backend import deck_manager
+from backend.mcp_tools import SlideDeckMCPTools
+
+def test_cow_clone_leaves_source_writable_and_writes_break_the_link(decks_dir, tmp_path):
+    deck_manager.initialize_deck_dir("Source")
+    source_asset = deck_manager.write_asset("Source", "logo.png", b"original")
+    mode = source_asset.stat().st_mode
+    deck_manager.clone_deck("Source", "Clone", mode="cow")
+    assert source_asset.stat().st_mode == mode
+    assert os.access(source_asset, os.W_OK)
+
+    upload = tmp_path / "new_logo.png"
+    upload.write_bytes(b"replacement")
+    assert SlideDeckMCPTools.add_asset("Clone", str(upload), "logo.png").startswith("Success")
+    assert source_asset.read_bytes() == b"original"
+    assert (decks_dir / "Clone" / "assets" / "logo.png").read_bytes() == b"replacement"
+
+def test_write_asset_rejects_paths(decks_dir):
+    deck_manager.initialize_deck_dir("Deck")
+    for name in ("../config.json", "sub/x.png", ".."):
+        with pytest.raises(ValueError):
+            deck_manager.write_asset("Deck", name, b"")
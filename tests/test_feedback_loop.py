@@ -0,0 +1,39 @@
+from backend import feedback_loop
+
+RULES = (
+    "import pathlib, sys\n"
+    "with open('calls.log', 'a') as f:\n"
+    "    f.write(sys.argv[2] + '\\n')\n"
+    "if pathlib.Path('broken').exists():\n"
+    "    sys.exit(1)\n"
+    "print('ok ' + sys.argv[1])\n"
+)
+
+def _calls(root) -> int:
+    path = root / "calls.log"
+    return len(path.read_text().splitlines()) if path.exists() else 0
+
+def test_failed_runs_are_retried_and_rules_changes_invalidate(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "backend").mkdir()
+    (tmp_path / "backend" / "a.py").write_text("x = 1\n")
+    script = tmp_path / feedback_loop.MCP_SCRIPT
+    script.parent.mkdir(parents=True)
+    script.write_text(RULES)
+    analyses = len(feedback_loop.COMMANDS)
+
+    (tmp_path / "broken").touch()
+    feedback_loop.generate_ai_feedback_report(workers=1)
+    assert _calls(tmp_path) == analyses
+    assert "exited with status 1" in (tmp_path / feedback_loop.REPORT_FILE).read_text()
+
+    (tmp_path / "broken").unlink()
+    feedback_loop.generate_ai_feedback_report(workers=1)
+    assert _calls(tmp_path) == 2 * analyses
+    feedback_loop.generate_ai_feedback_report(workers=1)
+    assert _calls(tmp_path) == 2 * analyses
+    assert "ok review" in (tmp_path / feedback_loop.REPORT_FILE).read_text()
+
+    script.write_text(RULES + "# rules updated\n")
+    feedback_loop.generate_ai_feedback_report(workers=1)
+    assert _calls(tmp_path) == 3 * analyses
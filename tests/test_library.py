@@ -0,0 +1,82 @@
+import zipfile
+
+from PIL import Image
+from pptx import Presentation
+import pytest
+
+from backend import deck_manager, library
+from backend.generator import _output_path, create_enhanced_deck
+from backend.library import import_slides
+from backend.session import close_session, open_session
+
+@pytest.fixture
+def source(deck):
+    deck("Source", ["Intro"])
+    Image.new("RGB", (64, 48), "navy").save(deck_manager.get_deck_path("Source") / "assets" / "logo.png")
+    create_enhanced_deck("Source", [
+        {"title": "Intro"},
+        {"title": "Logo", "image": "logo.png"},
+        {"title": "Sales", "chart_data": {"categories": ["Q1", "Q2"], "series": {"Revenue": [1, 2]}}},
+    ])
+    return "Source"
+
+def _headings(deck_name: str) -> list:
+    # Image slides carry their title in a text box rather than a title placeholder
+    return [
+        next(shape.text_frame.text for shape in slide.shapes if shape.has_text_frame)
+        for slide in Presentation(_output_path(deck_name)).slides
+    ]
+
+def _media(deck_name: str) -> list:
+    with zipfile.ZipFile(_output_path(deck_name)) as zf:
+        return [name for name in zf.namelist() if name.startswith("ppt/media/")]
+
+def test_imports_slides_across_decks_and_reuses_media(source, deck):
+    deck("Target", ["T0", "T1"])
+    result = import_slides("Target", [
+        {"source_deck": source, "slide_index": 1},
+        {"source_deck": source, "slide_index": 2, "index": 0},
+        {"source_deck": source, "slide_index": 1},
+    ])
+    assert _headings("Target") == ["Sales", "T0", "T1", "Logo", "Logo"]
+    assert [r["index"] for r in result["results"]] == [2, 0, 4]
+    assert result["media_reused"] == 1 and len(_media("Target")) == 1
+    with zipfile.ZipFile(_output_path("Target")) as zf:
+        assert any(name.startswith("ppt/embeddings/") for name in zf.namelist())
+
+def test_invalid_entries_reject_the_whole_batch(source, deck):
+    deck("Target", ["T0"])
+    before = _output_path("Target").read_bytes()
+    with pytest.raises(ValueError) as error:
+        import_slides("Target", [
+            {"source_deck": source, "slide_index": 0},
+            {"source_deck": source, "slide_index": 9},
+            {"source_deck": "Missing", "slide_index": 0},
+            {"slide_index": 0},
+        ])
+    message = str(error.value)
+    assert "Import 1" in message and "Import 2" in message and "Import 3" in message
+    assert _output_path("Target").read_bytes() == before
+
+def test_failed_copy_rolls_session_back(source, deck, titles, monkeypatch):
+    deck("Target", ["T0", "T1"])
+    session = open_session("Target")
+    add = library._SlideCopier.add
+    calls = []
+
+    def flaky(self, *args):
+        calls.append(args)
+        if len(calls) == 2:
+            raise OSError("disk gone")
+        return add(self, *args)
+
+    monkeypatch.setattr(library._SlideCopier, "add", flaky)
+    with pytest.raises(RuntimeError):
+        import_slides("Target", [{"source_deck": source, "slide_index": 1, "index": 0},
+                                 {"source_deck": source, "slide_index": 2}])
+    assert [slide.shapes.title.text for slide in session.prs.slides] == ["T0", "T1"]
+    assert not session.dirty
+    session.append_slide({"title": "T2"})
+    close_session("Target")
+    assert titles("Target") == ["T0", "T1", "T2"]
+    assert _media("Target") == []
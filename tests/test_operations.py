@@ -0,0 +1,36 @@
+import pytest
+
+from backend.operations import apply_operations
+from backend.session import close_session, open_session
+
+def test_delete_then_append(deck, titles):
+    deck("Ops", ["S0", "S1", "S2"])
+    apply_operations("Ops", [{"op": "delete", "index": 0}, {"op": "append", "slide": {"title": "N"}}])
+    assert titles("Ops") == ["S1", "S2", "N"]
+
+def test_failed_op_rolls_session_back(deck, titles, monkeypatch):
+    deck("Ops", ["S0", "S1", "S2"])
+    session = open_session("Ops")
+    monkeypatch.setattr("backend.operations._build_image_slide", lambda *args: 1 / 0)
+    (session.deck_path / "assets" / "logo.png").write_bytes(b"")
+    with pytest.raises(RuntimeError):
+        apply_operations("Ops", [
+            {"op": "delete", "index": 1},
+            {"op": "insert", "index": 0, "slide": {"title": "N"}},
+            {"op": "add_image", "image": "logo.png"},
+        ])
+    assert [slide.shapes.title.text for slide in session.prs.slides] == ["S0", "S1", "S2"]
+    assert not session.dirty
+    session.append_slide({"title": "S3"})
+    close_session("Ops")
+    assert titles("Ops") == ["S0", "S1", "S2", "S3"]
+
+def test_table_max_rows_paginates(deck, titles):
+    deck("Ops", ["S0", "S1"])
+    table = [["h"]] + [[str(i)] for i in range(5)]
+    result = apply_operations("Ops", [
+        {"op": "add_table", "title": "T", "table_data": table, "table_max_rows": 3, "index": 1},
+        {"op": "replace", "index": 4, "slide": {"title": "R", "table_data": table, "table_max_rows": 4}},
+    ])
+    assert [r["slides"] for r in result["results"]] == [3, 2]
+    assert titles("Ops") == ["S0", "T", "T (cont.)", "T (cont.)", "R", "R (cont.)"]
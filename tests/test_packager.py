@@ -0,0 +1,68 @@
+import os
+import tarfile
+import zipfile
+
+from PIL import Image
+import pytest
+
+from backend import deck_manager, packager
+from backend.packager import package_archive
+
+@pytest.fixture
+def packed_deck(deck):
+    deck("Pack", ["Intro", "Close"])
+    assets = deck_manager.get_deck_path("Pack") / "assets"
+    Image.new("RGB", (64, 48), "olive").save(assets / "logo.png")
+    (assets / "notes").mkdir()
+    (assets / "notes" / "speaker.txt").write_text("Speak slowly. " * 500)
+    return "Pack"
+
+def _sources(deck_name: str) -> dict:
+    return {arcname: path.read_bytes() for arcname, path in packager._archive_members(deck_name)}
+
+def _zip_contents(archive) -> dict:
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.testzip() is None
+        return {name: zf.read(name) for name in zf.namelist()}
+
+def test_zip_round_trip_and_reuse(packed_deck, tmp_path):
+    target = tmp_path / "dist"
+    stats = package_archive("Pack", target, "zip", workers=2)
+    assert stats["reused"] == 0 and stats["members"] == 3
+    assert _zip_contents(stats["archive"]) == _sources("Pack")
+
+    notes = deck_manager.get_deck_path("Pack") / "assets" / "notes" / "speaker.txt"
+    notes.write_text("Speak quickly. " * 500)
+    os.utime(notes, ns=(notes.stat().st_atime_ns, notes.stat().st_mtime_ns + 10**9))
+    stats = package_archive("Pack", target, "zip", workers=2)
+    # Only the edited note is compressed again
+    assert stats["reused"] == 2 and stats["deflated"] == 1
+    assert _zip_contents(stats["archive"]) == _sources("Pack")
+
+def test_zip_streams_large_members(packed_deck, tmp_path, monkeypatch):
+    monkeypatch.setattr(packager, "MAX_INLINE_BYTES", 100)
+    stats = package_archive("Pack", tmp_path / "dist", "zip")
+    assert _zip_contents(stats["archive"]) == _sources("Pack")
+
+def test_zip_falls_back_without_zipfile_internals(packed_deck, tmp_path, monkeypatch):
+    target = tmp_path / "dist"
+    package_archive("Pack", target, "zip")
+    monkeypatch.delattr(zipfile, "_strip_extra")
+    stats = package_archive("Pack", target, "zip")
+    assert stats["reused"] == 0 and stats["deflated"] + stats["stored"] == 3
+    assert _zip_contents(stats["archive"]) == _sources("Pack")
+
+def test_tar_gz_round_trip(packed_deck, tmp_path):
+    stats = package_archive("Pack", tmp_path / "dist", "tar.gz", workers=2)
+    extract = tmp_path / "extract"
+    with tarfile.open(stats["archive"], "r:gz") as tar:
+        tar.extractall(extract, filter="data")
+    extracted = {
+        path.relative_to(extract).as_posix(): path.read_bytes()
+        for path in extract.rglob("*") if path.is_file()
+    }
+    assert extracted == _sources("Pack")
+
+def test_unknown_format(packed_deck, tmp_path):
+    with pytest.raises(ValueError):
+        package_archive("Pack", tmp_path, "rar")
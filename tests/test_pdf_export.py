@@ -0,0 +1,46 @@
+import sys
+import time
+
+import pytest
+
+from backend import pdf_export
+
+FAKE_SOFFICE = """#!{python}
+import pathlib, sys, time
+args = sys.argv[1:]
+if pathlib.Path(args[-1]).stem == "Slow":
+    time.sleep(60)
+outdir = pathlib.Path(args[args.index("--outdir") + 1])
+(outdir / (pathlib.Path(args[-1]).stem + ".pdf")).write_bytes(b"%PDF-1.4 fake")
+"""
+
+@pytest.fixture
+def fake_soffice(tmp_path, monkeypatch):
+    script = tmp_path / "soffice"
+    script.write_text(FAKE_SOFFICE.format(python=sys.executable))
+    script.chmod(0o755)
+    monkeypatch.setenv(pdf_export.CONVERTER_ENV, str(script))
+    monkeypatch.setattr(pdf_export, "_uno", lambda: None)
+    return script
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake converter is a shebang script")
+def test_one_shot_export_uses_private_profiles(deck, fake_soffice):
+    deck("Fast", ["S0"])
+    first, second = pdf_export.ConverterPool(workers=1), pdf_export.ConverterPool(workers=1)
+    assert first.profile_root != second.profile_root
+    result = first.export_deck("Fast")
+    assert result["attempts"] == 1 and not result["skipped"]
+    assert first.export_deck("Fast")["skipped"]
+    for pool in (first, second):
+        pool.close()
+        assert not pool.profile_root.exists()
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake converter is a shebang script")
+def test_timeout_kills_converter(deck, fake_soffice):
+    deck("Slow", ["S0"])
+    pool = pdf_export.ConverterPool(workers=1, timeout=0.5, retries=0)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.export_deck("Slow")
+    assert time.monotonic() - start < 10
+    pool.close()
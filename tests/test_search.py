@@ -0,0 +1,18 @@
+from backend.search import search_path, search_slides
+
+def test_first_save_backfills_existing_decks(deck, decks_dir):
+    deck("Existing", ["Quarterly revenue"])
+    for path in decks_dir.glob("search.sqlite3*"):
+        path.unlink()
+    deck("New", ["Hiring plan"])
+    assert search_path().exists()
+    assert [r["deck"] for r in search_slides("revenue")["results"]] == ["Existing"]
+    assert [r["deck"] for r in search_slides("hiring")["results"]] == ["New"]
+
+def test_deck_filter_applies_to_deck_matches(deck):
+    deck("Revenue_North", ["Revenue by region"])
+    deck("Revenue_South", ["Revenue by region"])
+    result = search_slides("revenue", deck_name="Revenue_North")
+    assert {r["deck"] for r in result["results"]} == {"Revenue_North"}
+    assert [d["deck"] for d in result["decks"]] == ["Revenue_North"]
+    assert {d["deck"] for d in search_slides("revenue")["decks"]} == {"Revenue_North", "Revenue_South"}
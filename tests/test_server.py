@@ -0,0 +1,26 @@
+import asyncio
+
+from backend.server import DeckServer
+
+async def _call(server, method, **params):
+    response = await server.handle({"id": 1, "method": method, "params": params, "wait": True})
+    assert "error" not in response, response
+    assert response["result"].startswith("Success"), response["result"]
+    return response["result"]
+
+def test_generate_reloads_open_session(deck, titles):
+    deck("Talk", ["S0", "S1"])
+    server = DeckServer(workers=1)
+
+    async def run():
+        await _call(server, "open_deck_session", deck_name="Talk")
+        await _call(server, "generate_slides", deck_name="Talk", slides=[{"title": "A"}, {"title": "B"}, {"title": "C"}])
+        assert titles("Talk") == ["A", "B", "C"]
+        await _call(server, "append_slide", deck_name="Talk", title="D")
+        await _call(server, "commit_deck_session", deck_name="Talk")
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.close()
+    assert titles("Talk") == ["A", "B", "C", "D"]
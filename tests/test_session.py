@@ -0,0 +1,34 @@
+import warnings
+
+from backend import generator
+from backend.build_cache import build_deck
+from backend.session import close_session, open_session
+
+def test_delete_then_append_keeps_slide_parts_distinct(deck, titles):
+    deck("Talk", ["S0", "S1", "S2"])
+    session = open_session("Talk")
+    session.delete_slide(1)
+    session.append_slide({"title": "NEW"})
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        close_session("Talk")
+    assert titles("Talk") == ["S0", "S2", "NEW"]
+
+def test_direct_writes_go_through_open_session(deck, titles):
+    deck("Talk", ["S0", "S1", "S2"])
+    session = open_session("Talk")
+    generator.delete_slide_from_deck("Talk", 0)
+    generator.add_slide_to_deck("Talk", {"title": "NEW"})
+    assert titles("Talk") == ["S0", "S1", "S2"]
+    assert session.slide_count == 3
+    close_session("Talk")
+    assert titles("Talk") == ["S1", "S2", "NEW"]
+
+def test_rebuild_reloads_open_session(deck, titles):
+    deck("Talk", ["S0", "S1"])
+    session = open_session("Talk")
+    session.append_slide({"title": "Pending"})
+    build_deck("Talk", [{"title": "A"}, {"title": "B"}, {"title": "C"}])
+    session.append_slide({"title": "D"})
+    close_session("Talk")
+    assert titles("Talk") == ["A", "B", "C", "D"]
@@ -0,0 +1,64 @@
+import pytest
+
+from backend import snapshots
+from backend.generator import add_slide_to_deck
+from backend.session import close_session, open_session
+from backend.snapshots import diff_snapshots, gc_snapshots, list_snapshots, restore_snapshot, snapshot_deck
+
+def test_build_records_and_unchanged_deck_is_a_no_op(deck):
+    deck("Snap", ["S0", "S1"])
+    assert [v["version"] for v in list_snapshots("Snap")] == [1]
+    result = snapshot_deck("Snap")
+    assert result["unchanged"] and result["version"] == 1 and result["new_objects"] == 0
+    assert len(list_snapshots("Snap")) == 1
+
+def test_single_slide_edits_are_not_recorded_until_commit(deck):
+    deck("Snap", ["S0"])
+    add_slide_to_deck("Snap", {"title": "S1"})
+    assert len(list_snapshots("Snap")) == 1
+    session = open_session("Snap", max_dirty_slides=1)
+    session.append_slide({"title": "S2"})
+    assert session.commits == 1 and len(list_snapshots("Snap")) == 1
+    close_session("Snap")
+    assert [v["slide_count"] for v in list_snapshots("Snap")] == [1, 3]
+
+def test_restore_and_diff(deck, titles):
+    deck("Snap", ["S0", "S1"])
+    add_slide_to_deck("Snap", {"title": "S2"})
+    snapshot_deck("Snap", "three slides")
+    diff = diff_snapshots("Snap", 1)
+    assert diff["slides"]["inserted"] == [2] and diff["slides"]["changed"] == []
+    assert any(p["name"] == "ppt/slides/slide3.xml" for p in diff["added"])
+
+    result = restore_snapshot("Snap", 1)
+    assert result["version"] == 3 and titles("Snap") == ["S0", "S1"]
+    restore_snapshot("Snap", 2)
+    assert titles("Snap") == ["S0", "S1", "S2"]
+
+def test_restore_refused_while_session_open(deck, titles):
+    deck("Snap", ["S0"])
+    add_slide_to_deck("Snap", {"title": "S1"})
+    snapshot_deck("Snap")
+    open_session("Snap")
+    with pytest.raises(RuntimeError):
+        restore_snapshot("Snap", 1)
+    assert titles("Snap") == ["S0", "S1"]
+
+def test_gc_keeps_newest_versions_and_their_objects(deck, titles, monkeypatch):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_GC_SLACK", 2)
+    deck("Snap", ["S0"])
+    (snapshots._snapshot_dir("Snap").parent / "config.json").write_text('{"snapshot_keep": 2}')
+    for i in range(1, 4):
+        add_slide_to_deck("Snap", {"title": f"S{i}"})
+        snapshot_deck("Snap")
+    # Four versions reached keep + slack, so the automatic gc left two
+    assert [v["version"] for v in list_snapshots("Snap")] == [3, 4]
+    add_slide_to_deck("Snap", {"title": "S4"})
+    snapshot_deck("Snap")
+    assert len(list_snapshots("Snap")) == 3
+
+    result = gc_snapshots("Snap", keep=1)
+    assert result["versions_removed"] == 2 and result["objects_removed"] > 0
+    assert [v["version"] for v in list_snapshots("Snap")] == [5]
+    restore_snapshot("Snap", 5)
+    assert titles("Snap") == ["S0", "S1", "S2", "S3", "S4"]
@@ -0,0 +1,54 @@
+import zipfile
+
+from PIL import Image
+from pptx import Presentation
+
+from backend import deck_manager
+from backend.build_cache import build_deck
+from backend.generator import _output_path
+from backend.opc import read_rels, slide_part_names
+from backend.streaming import stream_enhanced_deck
+
+SPECS = [
+    {"title": "Intro", "content": "Opening remarks"},
+    {"title": "Logo", "image": "logo.png"},
+    {"title": "Sales", "chart_data": {"categories": ["Q1", "Q2", "Q3"], "series": {"Revenue": [1, 2, 3]}}},
+    {"title": "Logo again", "image": "logo.png"},
+    {"title": "Close", "content": "Questions?"},
+]
+
+def _slides(deck_name: str) -> list:
+    """Per slide: its XML, and its related parts' names and bytes by relationship id."""
+    with zipfile.ZipFile(_output_path(deck_name)) as zf:
+        return [
+            (zf.read(name), {
+                rId: (reltype, target, zf.read(target))
+                for rId, (reltype, target, external) in read_rels(zf, name).items() if not external
+            })
+            for name in slide_part_names(zf)
+        ]
+
+def test_streamed_deck_matches_built_deck(decks_dir):
+    for name in ("Built", "Streamed"):
+        deck_manager.initialize_deck_dir(name)
+        Image.new("RGB", (64, 48), "maroon").save(deck_manager.get_deck_path(name) / "assets" / "logo.png")
+
+    build_deck("Built", SPECS, use_cache=False)
+    result = stream_enhanced_deck("Streamed", (spec for spec in SPECS))
+    assert result["slide_count"] == len(SPECS)
+
+    assert _slides("Streamed") == _slides("Built")
+    with zipfile.ZipFile(_output_path("Streamed")) as zf:
+        assert zf.testzip() is None
+        # Both image slides share one stored copy of the logo
+        assert len([n for n in zf.namelist() if n.startswith("ppt/media/")]) == 1
+
+    streamed = Presentation(_output_path("Streamed"))
+    built = Presentation(_output_path("Built"))
+    assert len(streamed.slides) == len(built.slides) == len(SPECS)
+    for ours, theirs in zip(streamed.slides, built.slides):
+        assert [s.shape_type for s in ours.shapes] == [s.shape_type for s in theirs.shapes]
+        assert ours.slide_layout.name == theirs.slide_layout.name
+    chart = next(s for s in streamed.slides[2].shapes if s.has_chart).chart
+    assert list(chart.plots[0].categories) == ["Q1", "Q2", "Q3"]
+    assert list(chart.series[0].values) == [1, 2, 3]
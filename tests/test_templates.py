@@ -0,0 +1,78 @@
+from collections import OrderedDict
+import os
+import zipfile
+
+from pptx import Presentation
+import pytest
+
+from backend import templates
+from backend.generator import _output_path, create_enhanced_deck
+from backend.templates import (
+    CT_PRESENTATION_MAIN, CT_TEMPLATE_MAIN, get_template, layout_index, new_presentation, set_deck_template,
+)
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(templates, "_templates", OrderedDict())
+
+def _save_template(path, layout_name="Title Only", sample_slide=False):
+    """Saves the default template with layout 5 renamed, optionally holding one sample slide."""
+    prs = Presentation()
+    prs.slide_layouts[5].name = layout_name
+    if sample_slide:
+        prs.slides.add_slide(prs.slide_layouts[0]).shapes.title.text = "Sample"
+    prs.save(path)
+    return path
+
+def _as_potx(pptx_path, potx_path):
+    with zipfile.ZipFile(pptx_path) as src, zipfile.ZipFile(potx_path, "w") as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename == "[Content_Types].xml":
+                data = data.replace(CT_PRESENTATION_MAIN, CT_TEMPLATE_MAIN)
+            dst.writestr(info, data)
+    return potx_path
+
+def test_template_cache_invalidated_on_change(tmp_path):
+    path = _save_template(tmp_path / "brand.pptx", "Headline")
+    first = get_template(path)
+    assert get_template(path) is first
+    assert "Headline" in first.layout_names
+
+    st = path.stat()
+    _save_template(path, "Banner")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    second = get_template(path)
+    assert second is not first and second.identity != first.identity
+    assert "Banner" in second.layout_names and "Headline" not in second.layout_names
+
+def test_potx_template_drops_sample_slides(tmp_path):
+    potx = _as_potx(_save_template(tmp_path / "brand.pptx", "Headline", sample_slide=True), tmp_path / "brand.potx")
+    template = get_template(potx)
+    prs = template.clone()
+    assert len(prs.slides) == 0
+    assert prs.slide_layouts[5].name == "Headline"
+    # Clones are independent of the kept template and of each other
+    prs.slides.add_slide(prs.slide_layouts[0])
+    assert len(template.clone().slides) == 0
+
+def test_template_rejects_other_extensions(tmp_path):
+    path = tmp_path / "brand.ppt"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        get_template(path)
+    with pytest.raises(FileNotFoundError):
+        get_template(tmp_path / "missing.pptx")
+
+def test_layout_by_name(deck, tmp_path):
+    deck("Branded", ["Intro"])
+    set_deck_template("Branded", str(_save_template(tmp_path / "brand.pptx", "Headline")))
+    prs = new_presentation("Branded")
+    assert layout_index(prs, "Headline") == 5
+    assert layout_index(prs, 2) == 2
+    with pytest.raises(ValueError, match="Unknown layout"):
+        layout_index(prs, "Nope")
+
+    create_enhanced_deck("Branded", [{"title": "Big", "layout": "Headline"}, {"title": "Body"}])
+    saved = Presentation(_output_path("Branded"))
+    assert [s.slide_layout.name for s in saved.slides] == ["Headline", "Title and Content"]
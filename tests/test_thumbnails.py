@@ -0,0 +1,49 @@
+from PIL import Image
+
+from backend import deck_manager
+from backend.generator import create_enhanced_deck
+from backend.thumbnails import contact_sheet, render_thumbnails
+
+def _specs(titles):
+    return [{"title": t, "content": f"Body of {t}"} for t in titles]
+
+def test_only_edited_slides_are_redrawn(deck):
+    deck("Thumbs", ["One", "Two", "Three"])
+    first = render_thumbnails("Thumbs", width=160)
+    assert (first["rendered"], first["cached"]) == (3, 0)
+    assert all(Image.open(path).width == 160 for path in first["slides"])
+
+    again = render_thumbnails("Thumbs", width=160)
+    assert (again["rendered"], again["cached"]) == (0, 3)
+
+    create_enhanced_deck("Thumbs", _specs(["One", "Two (edited)", "Three"]))
+    edited = render_thumbnails("Thumbs", width=160)
+    assert (edited["rendered"], edited["cached"]) == (1, 2)
+    assert edited["slides"][0] == first["slides"][0] and edited["slides"][2] == first["slides"][2]
+    assert edited["slides"][1] != first["slides"][1]
+    # The old thumbnail of the edited slide is dropped
+    cache_dir = deck_manager.get_deck_path("Thumbs") / "cache" / "thumbnails"
+    assert sorted(p.name for p in cache_dir.glob("*.png")) == sorted(p.rsplit("/", 1)[-1] for p in edited["slides"])
+
+def test_image_change_redraws_its_slide(deck):
+    deck("Pictures", ["Intro"])
+    logo = deck_manager.get_deck_path("Pictures") / "assets" / "logo.png"
+    Image.new("RGB", (64, 48), "navy").save(logo)
+    specs = [{"title": "Intro", "content": "Hello"}, {"title": "Logo", "image": "logo.png"}]
+    create_enhanced_deck("Pictures", specs)
+    assert render_thumbnails("Pictures")["rendered"] == 2
+
+    Image.new("RGB", (64, 48), "gold").save(logo)
+    create_enhanced_deck("Pictures", specs)
+    result = render_thumbnails("Pictures")
+    assert (result["rendered"], result["cached"]) == (1, 1)
+
+def test_contact_sheet_rebuilt_only_on_change(deck):
+    deck("Sheet", ["One", "Two"])
+    sheet = contact_sheet("Sheet", width=120, columns=2)
+    stamp, height = sheet.stat().st_mtime_ns, Image.open(sheet).height
+    assert contact_sheet("Sheet", width=120, columns=2).stat().st_mtime_ns == stamp
+
+    # A third slide starts a second row
+    create_enhanced_deck("Sheet", _specs(["One", "Two", "Three"]))
+    assert Image.open(contact_sheet("Sheet", width=120, columns=2)).height > height
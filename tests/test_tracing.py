@@ -0,0 +1,20 @@
+import builtins
+
+from backend import tracing
+
+def test_trace_falls_back_to_tracemalloc_without_rss(monkeypatch):
+    real_open = builtins.open
+
+    def no_proc(path, *args, **kwargs):
+        if str(path).startswith("/proc/"):
+            raise OSError("no /proc")
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", no_proc)
+    monkeypatch.setattr(tracing, "resource", None)
+    monkeypatch.setattr(tracing, "_psutil", lambda: None)
+    with tracing.trace("alloc") as current:
+        block = bytearray(8 * 1048576)
+    del block
+    assert current.peak_rss_mb >= 8
+    assert not tracing.tracemalloc.is_tracing()
@@ -0,0 +1,30 @@
+from backend.generator import _output_path, create_enhanced_deck
+from backend.operations import apply_operations
+from backend.validator import incremental_validate_pptx, stream_validate_pptx, validate_pptx
+
+SLIDES = [
+    {"title": "Intro", "bullet_points": ["One", "Two"]},
+    {"title": "", "content": "Untitled slide"},
+    {"title": "Table", "table_data": [["h1", "h2"], ["a", "b"]]},
+    {"title": "Chart", "chart_data": {"categories": ["Q1", "Q2"], "series": {"Revenue": [1, 2]}}},
+]
+
+def _without_recheck(result: dict) -> dict:
+    return {k: v for k, v in result.items() if k != "slides_rechecked"}
+
+def test_incremental_matches_full_validation_and_rechecks_only_edits(deck, decks_dir):
+    deck("Check", ["Intro"])
+    create_enhanced_deck("Check", SLIDES)
+    output = _output_path("Check")
+    cache = decks_dir / "Check" / "validation_cache.json"
+
+    first = incremental_validate_pptx(output, cache)
+    expected = validate_pptx(output)
+    assert expected["issues"] and _without_recheck(first) == expected == stream_validate_pptx(output)
+    assert first["slides_rechecked"] == len(SLIDES)
+    assert incremental_validate_pptx(output, cache)["slides_rechecked"] == 0
+
+    apply_operations("Check", [{"op": "replace", "index": 2, "slide": {"title": "Table", "content": "Now text"}}])
+    edited = incremental_validate_pptx(output, cache)
+    assert edited["slides_rechecked"] == 1
+    assert _without_recheck(edited) == validate_pptx(output)
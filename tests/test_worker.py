@@ -0,0 +1,67 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from backend import worker
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"),
+                                reason="warm workers need Unix sockets and os.fork")
+
+@pytest.fixture
+def listener(tmp_path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(tmp_path / "worker.sock"))
+    sock.listen(worker.LISTEN_BACKLOG)
+    yield sock
+    sock.close()
+
+def _request(stream, method, **params):
+    stream.write(json.dumps({"id": 1, "method": method, "params": params}).encode("utf-8") + b"\n")
+    stream.flush()
+    return json.loads(stream.readline())
+
+def test_max_requests_counts_calls_on_one_connection(decks_dir, listener):
+    loop = threading.Thread(target=worker._worker_loop, args=(listener, 2), daemon=True)
+    loop.start()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(10)
+        sock.connect(listener.getsockname())
+        with sock.makefile("rwb") as stream:
+            assert "result" in _request(stream, "list_all_decks")
+            assert "Unknown tool" in _request(stream, "no_such_tool")["error"]
+            # The limit is reached mid-connection: the worker hangs up and exits
+            assert stream.readline() == b""
+    loop.join(5)
+    assert not loop.is_alive()
+
+def test_session_tools_are_refused():
+    response = worker._handle(json.dumps({"id": 7, "method": "open_deck_session", "params": {}}).encode("utf-8"))
+    assert response["id"] == 7 and "backend.server" in response["error"]
+    assert "Invalid params" in worker._handle(b'{"method": "list_all_decks", "params": {"bogus": 1}}')["error"]
+    assert worker._handle(b"not json")["error"] == "Invalid JSON request."
+
+def test_recycled_workers_keep_serving(decks_dir, tmp_path):
+    path = str(tmp_path / "serve.sock")
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "backend.worker", "serve", "--socket", path, "--workers", "1",
+         "--max-requests", "2", "--decks-dir", str(decks_dir)],
+        env=env, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(path):
+            assert proc.poll() is None and time.monotonic() < deadline
+            time.sleep(0.05)
+        # Five calls need three generations of the single worker
+        for _ in range(5):
+            assert worker.call("list_all_decks", path=path, timeout=30) is not None
+    finally:
+        proc.terminate()
+        proc.wait(30)